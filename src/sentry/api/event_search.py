@@ -1,18 +1,21 @@
 from __future__ import annotations
 
 import re
+import threading
 from collections import namedtuple
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from functools import reduce
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
+from cachetools import LRUCache
 from django.utils.functional import cached_property
 from parsimonious.exceptions import IncompleteParseError
 from parsimonious.expressions import Optional
 from parsimonious.grammar import Grammar
 from parsimonious.nodes import Node, NodeVisitor
 
+from sentry import options
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.events.constants import (
     DURATION_UNITS,
@@ -37,6 +40,7 @@ from sentry.search.utils import (
     parse_size,
 )
 from sentry.snuba.dataset import Dataset
+from sentry.utils import metrics
 from sentry.utils.snuba import is_duration_measurement, is_measurement, is_span_op_breakdown
 from sentry.utils.validators import is_event_id, is_span_id
 
@@ -527,6 +531,9 @@ class SearchVisitor(NodeVisitor):
         else:
             self.builder = builder
 
+        # Set when the result depends on the current time (relative dates)
+        self.is_time_dependent = False
+
     @cached_property
     def key_mappings_lookup(self):
         lookup = {}
@@ -672,6 +679,7 @@ class SearchVisitor(NodeVisitor):
         (search_key, _, value) = children
 
         if self.is_date_key(search_key.name):
+            self.is_time_dependent = True
             try:
                 from_val, to_val = parse_datetime_range(value.text)
             except InvalidQuery as exc:
@@ -881,6 +889,7 @@ class SearchVisitor(NodeVisitor):
         operator = handle_negation(negation, operator)
         is_date_aggregate = any(key in search_key.name for key in self.config.date_keys)
         if is_date_aggregate:
+            self.is_time_dependent = True
             try:
                 from_val, to_val = parse_datetime_range(search_value.text)
             except InvalidQuery as exc:
@@ -1167,11 +1176,62 @@ default_config = SearchConfig(
 )
 
 
-def parse_search_query(
-    query, config=None, params=None, builder=None, config_overrides=None
-) -> list[SearchFilter]:
-    if config is None:
-        config = default_config
+class ParseCache:
+    """
+    A bounded LRU of parse results for ``parse_search_query``, since the same
+    saved searches, alert rule and dashboard widget queries are parsed over
+    and over.
+
+    Two kinds of results are cached:
+
+    * Parse trees, which only depend on the query string.
+    * ``SearchFilter`` lists, keyed on the query string and the identity of
+      the ``SearchConfig``. Those are only cached when the result does not
+      depend on ``params``, a custom ``builder`` or the current time.
+
+    The size is controlled by the ``search.parse-cache.size`` option, ``0``
+    disables the cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cache: LRUCache[Any, Any] | None = None
+
+    def _get_cache(self) -> LRUCache[Any, Any] | None:
+        maxsize = options.get("search.parse-cache.size")
+        if maxsize <= 0:
+            self._cache = None
+        elif self._cache is None or self._cache.maxsize != maxsize:
+            self._cache = LRUCache(maxsize=maxsize)
+        return self._cache
+
+    def get(self, key: Any, kind: str) -> Any:
+        with self._lock:
+            cache = self._get_cache()
+            rv = cache.get(key) if cache is not None else None
+
+        if cache is not None:
+            metrics.incr("search.parse_cache.get", tags={"kind": kind, "hit": rv is not None})
+        return rv
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            cache = self._get_cache()
+            if cache is not None:
+                cache[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache = None
+
+
+parse_cache = ParseCache()
+
+
+def _parse_search_tree(query: str) -> Node:
+    tree = parse_cache.get(("tree", query), "tree")
+    if tree is not None:
+        return tree
 
     try:
         tree = event_search_grammar.parse(query)
@@ -1186,6 +1246,31 @@ def parse_search_query(
             )
         )
 
+    parse_cache.set(("tree", query), tree)
+    return tree
+
+
+def parse_search_query(
+    query, config=None, params=None, builder=None, config_overrides=None
+) -> list[SearchFilter]:
+    if config is None:
+        config = default_config
+
+    # Only results which are a function of the query and config are cached
+    cacheable = not params and builder is None and not config_overrides
+    if cacheable:
+        cached = parse_cache.get(("filters", query, id(config)), "filters")
+        # The config is part of the value so its id can't be reused while cached
+        if cached is not None and cached[0] is config:
+            return list(cached[1])
+
+    tree = _parse_search_tree(query)
+
     if config_overrides:
         config = SearchConfig.create_from(config, **config_overrides)
-    return SearchVisitor(config, params=params, builder=builder).visit(tree)
+    visitor = SearchVisitor(config, params=params, builder=builder)
+    search_filters = visitor.visit(tree)
+
+    if cacheable and not visitor.is_time_dependent:
+        parse_cache.set(("filters", query, id(config)), (config, tuple(search_filters)))
+    return search_filters
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import io
-from typing import BinaryIO
+import tempfile
+from contextlib import nullcontext
+from typing import IO, BinaryIO, ContextManager
 
 import click
 
@@ -11,7 +12,12 @@ from sentry.backup.dependencies import (
     get_model_name,
     sorted_dependencies,
 )
-from sentry.backup.helpers import Encryptor, Filter, create_encrypted_export_tarball
+from sentry.backup.helpers import (
+    EXPORT_SPOOL_MAX_SIZE,
+    Encryptor,
+    Filter,
+    write_encrypted_export_tarball,
+)
 from sentry.backup.scopes import ExportScope
 from sentry.services.hybrid_cloud.import_export.model import (
     RpcExportError,
@@ -24,7 +30,6 @@ from sentry.services.hybrid_cloud.import_export.service import (
     import_export_service,
 )
 from sentry.silo.base import SiloMode
-from sentry.utils import json
 
 __all__ = (
     "ExportingError",
@@ -40,6 +45,18 @@ class ExportingError(Exception):
         self.context = context
 
 
+def _get_json_array_elements(json_data: str) -> str:
+    """
+    Returns the elements of a serialized JSON array, without the surrounding brackets, so that the
+    arrays returned by each exporter can be concatenated into a single array without parsing them.
+    """
+
+    elements = json_data.strip()
+    if not elements.startswith("[") or not elements.endswith("]"):
+        raise ValueError("Exported model data must be a JSON array")
+    return elements[1:-1].strip()
+
+
 def _export(
     dest: BinaryIO,
     scope: ExportScope,
@@ -52,6 +69,11 @@ def _export(
     """
     Exports core data for the Sentry installation.
 
+    Each model is written to `dest` as soon as it has been exported, so memory usage is bounded by
+    the largest single model rather than the size of the entire export. Encrypted exports are
+    spooled to a temporary file first, since the tarball can only be written once the size of the
+    encrypted data is known.
+
     It is generally preferable to avoid calling this function directly, as there are certain
     combinations of input parameters that should not be used together. Instead, use one of the other
     wrapper functions in this file, named `export_in_XXX_scope()`.
@@ -67,7 +89,6 @@ def _export(
         printer(errText, err=True)
         raise RuntimeError(errText)
 
-    json_export = []
     pk_map = PrimaryKeyMap()
     allowed_relocation_scopes = scope.value
     filters = []
@@ -94,55 +115,67 @@ def _export(
         else:
             raise ValueError("Filter arguments must only apply to `Organization` or `User` models")
 
-    # TODO(getsentry/team-ospo#190): Another optimization opportunity to use a generator with ijson # to print the JSON objects in a streaming manner.
-    for model in sorted_dependencies():
-        from sentry.db.models.base import BaseModel
-
-        if not issubclass(model, BaseModel):
-            continue
-
-        possible_relocation_scopes = model.get_possible_relocation_scopes()
-        includable = possible_relocation_scopes & allowed_relocation_scopes
-        if not includable or model._meta.proxy:
-            continue
-
-        model_name = get_model_name(model)
-        model_relations = dependencies().get(model_name)
-        if not model_relations:
-            continue
-
-        dep_models = {get_model_name(d) for d in model_relations.get_dependencies_for_relocation()}
-        export_by_model = ImportExportService.get_exporter_for_model(model)
-        result = export_by_model(
-            model_name=str(model_name),
-            scope=RpcExportScope.into_rpc(scope),
-            from_pk=0,
-            filter_by=[RpcFilter.into_rpc(f) for f in filters],
-            pk_map=RpcPrimaryKeyMap.into_rpc(pk_map.partition(dep_models)),
-            indent=indent,
-        )
-
-        if isinstance(result, RpcExportError):
-            printer(result.pretty(), err=True)
-            raise ExportingError(result)
-
-        pk_map.extend(result.mapped_pks.from_rpc())
-
-        # TODO(getsentry/team-ospo#190): Since the structure of this data is very predictable (an
-        # array of serialized model objects), we could probably avoid re-ingesting the JSON string
-        # as a future optimization.
-        for json_model in json.loads(result.json_data):
-            json_export.append(json_model)
-
-    # If no `encryptor` argument was passed in, this is an unencrypted export, so we can just dump
-    # the JSON into the `dest` file and exit early.
+    # If no `encryptor` argument was passed in, this is an unencrypted export, so we can just write
+    # the JSON straight into the `dest` file.
+    out_context: ContextManager[IO[bytes]]
     if encryptor is None:
-        dest_wrapper = io.TextIOWrapper(dest, encoding="utf-8", newline="")
-        json.dump(json_export, dest_wrapper)
-        dest_wrapper.detach()
-        return
+        out_context = nullcontext(dest)
+    else:
+        out_context = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+
+    with out_context as out:
+        out.write(b"[")
+        wrote_any = False
+        for model in sorted_dependencies():
+            from sentry.db.models.base import BaseModel
+
+            if not issubclass(model, BaseModel):
+                continue
+
+            possible_relocation_scopes = model.get_possible_relocation_scopes()
+            includable = possible_relocation_scopes & allowed_relocation_scopes
+            if not includable or model._meta.proxy:
+                continue
+
+            model_name = get_model_name(model)
+            model_relations = dependencies().get(model_name)
+            if not model_relations:
+                continue
+
+            dep_models = {
+                get_model_name(d) for d in model_relations.get_dependencies_for_relocation()
+            }
+            export_by_model = ImportExportService.get_exporter_for_model(model)
+            result = export_by_model(
+                model_name=str(model_name),
+                scope=RpcExportScope.into_rpc(scope),
+                from_pk=0,
+                filter_by=[RpcFilter.into_rpc(f) for f in filters],
+                pk_map=RpcPrimaryKeyMap.into_rpc(pk_map.partition(dep_models)),
+                indent=indent,
+            )
+
+            if isinstance(result, RpcExportError):
+                printer(result.pretty(), err=True)
+                raise ExportingError(result)
+
+            pk_map.extend(result.mapped_pks.from_rpc())
+
+            # The structure of this data is very predictable (an array of serialized model
+            # objects), so rather than re-ingesting the JSON string we splice its elements into
+            # the output array as-is.
+            elements = _get_json_array_elements(result.json_data)
+            if elements:
+                if wrote_any:
+                    out.write(b",")
+                out.write(elements.encode("utf-8"))
+                wrote_any = True
+
+        out.write(b"]")
 
-    dest.write(create_encrypted_export_tarball(json_export, encryptor).getvalue())
+        if encryptor is not None:
+            out.seek(0)
+            write_encrypted_export_tarball(out, encryptor, dest)
 
 
 def export_in_user_scope(
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import base64
+import binascii
 import io
+import os
+import struct
 import tarfile
+import tempfile
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from functools import lru_cache
-from typing import BinaryIO, Generic, NamedTuple, Type, TypeVar
+from typing import IO, BinaryIO, Generator, Generic, Iterator, NamedTuple, Type, TypeVar
 
-from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidSignature
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.hmac import HMAC
+from cryptography.hazmat.primitives.padding import PKCS7
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from google.cloud.kms import KeyManagementServiceClient as KeyManagementServiceClient
@@ -26,6 +36,12 @@ EXCLUDED_APPS = frozenset(("auth", "contenttypes", "fixtures"))
 
 UTC_0 = timezone(timedelta(hours=0))
 
+# Size of the chunks in which exports are read when encrypting them.
+EXPORT_CHUNK_SIZE = 1024 * 1024
+
+# Size up to which temporary export files are kept in memory before being written to disk.
+EXPORT_SPOOL_MAX_SIZE = 32 * 1024 * 1024
+
 
 class DatetimeSafeDjangoJSONEncoder(DjangoJSONEncoder):
     """A wrapper around the default `DjangoJSONEncoder` that always retains milliseconds, even when
@@ -152,11 +168,23 @@ def create_encrypted_export_tarball(json_export: json.JSONData, encryptor: Encry
     risks breaking assumptions that the decryption side will make on the other end!
     """
 
+    tar_buffer = io.BytesIO()
+    write_encrypted_export_tarball(
+        io.BytesIO(json.dumps(json_export).encode("utf-8")), encryptor, tar_buffer
+    )
+    return tar_buffer
+
+
+def write_encrypted_export_tarball(json_export: IO[bytes], encryptor: Encryptor, dest: IO[bytes]):
+    """
+    Same as `create_encrypted_export_tarball`, but reads the already serialized JSON export from a
+    file and writes the tarball to `dest`. The encrypted JSON is spooled to a temporary file, so
+    neither the plaintext nor the ciphertext needs to fit in memory.
+    """
+
     # Generate a new DEK (data encryption key), and use that DEK to encrypt the JSON being exported.
     pem = encryptor.get_public_key_pem()
     data_encryption_key = Fernet.generate_key()
-    backup_encryptor = Fernet(data_encryption_key)
-    encrypted_json_export = backup_encryptor.encrypt(json.dumps(json_export).encode("utf-8"))
 
     # Encrypt the newly minted DEK using asymmetric public key encryption.
     dek_encryption_key = serialization.load_pem_public_key(pem, default_backend())
@@ -165,20 +193,149 @@ def create_encrypted_export_tarball(json_export: json.JSONData, encryptor: Encry
     oaep_padding = padding.OAEP(mgf=mgf, algorithm=sha256, label=None)
     encrypted_dek = dek_encryption_key.encrypt(data_encryption_key, oaep_padding)  # type: ignore
 
-    # Generate the tarball and write it to to a new output stream.
-    tar_buffer = io.BytesIO()
-    with tarfile.open(fileobj=tar_buffer, mode="w") as tar:
-        json_info = tarfile.TarInfo("export.json")
-        json_info.size = len(encrypted_json_export)
-        tar.addfile(json_info, fileobj=io.BytesIO(encrypted_json_export))
-        key_info = tarfile.TarInfo("data.key")
-        key_info.size = len(encrypted_dek)
-        tar.addfile(key_info, fileobj=io.BytesIO(encrypted_dek))
-        pub_info = tarfile.TarInfo("key.pub")
-        pub_info.size = len(pem)
-        tar.addfile(pub_info, fileobj=io.BytesIO(pem))
+    # Generate the tarball and write it to the output stream.
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE) as encrypted_json_export:
+        fernet_encrypt_stream(data_encryption_key, json_export, encrypted_json_export)
+        json_size = encrypted_json_export.tell()
+        encrypted_json_export.seek(0)
+
+        with tarfile.open(fileobj=dest, mode="w") as tar:
+            json_info = tarfile.TarInfo("export.json")
+            json_info.size = json_size
+            tar.addfile(json_info, fileobj=encrypted_json_export)
+            key_info = tarfile.TarInfo("data.key")
+            key_info.size = len(encrypted_dek)
+            tar.addfile(key_info, fileobj=io.BytesIO(encrypted_dek))
+            pub_info = tarfile.TarInfo("key.pub")
+            pub_info.size = len(pem)
+            tar.addfile(pub_info, fileobj=io.BytesIO(pem))
+
+
+def fernet_encrypt_stream(
+    key: bytes, src: IO[bytes], dest: IO[bytes], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> None:
+    """
+    Writes the same token as `Fernet(key).encrypt(src.read())` to `dest`, without holding the
+    plaintext or the token in memory. The token is a plain Fernet token, so it can be decrypted with
+    `Fernet.decrypt` as usual.
 
-    return tar_buffer
+    See https://github.com/fernet/spec/blob/master/Spec.md for the token layout.
+    """
+
+    decoded_key = base64.urlsafe_b64decode(key)
+    signing_key, encryption_key = decoded_key[:16], decoded_key[16:]
+
+    iv = os.urandom(16)
+    encryptor = Cipher(algorithms.AES(encryption_key), modes.CBC(iv), default_backend()).encryptor()
+    padder = PKCS7(algorithms.AES.block_size).padder()
+    signer = HMAC(signing_key, hashes.SHA256(), default_backend())
+
+    # The token is base64 encoded as a whole, so only encode multiples of 3 bytes at a time to
+    # avoid padding in the middle of the output.
+    pending = b""
+
+    def write(raw: bytes, *, sign: bool = True) -> None:
+        nonlocal pending
+        if sign:
+            signer.update(raw)
+        pending += raw
+        cutoff = len(pending) - len(pending) % 3
+        dest.write(base64.urlsafe_b64encode(pending[:cutoff]))
+        pending = pending[cutoff:]
+
+    write(b"\x80" + struct.pack(">Q", int(time.time())) + iv)
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        write(encryptor.update(padder.update(chunk)))
+    write(encryptor.update(padder.finalize()) + encryptor.finalize())
+    write(signer.finalize(), sign=False)
+    dest.write(base64.urlsafe_b64encode(pending))
+
+
+def _iter_urlsafe_b64decode(src: IO[bytes], chunk_size: int) -> Iterator[bytes]:
+    pending = b""
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+        cutoff = len(pending) - len(pending) % 4
+        yield base64.urlsafe_b64decode(pending[:cutoff])
+        pending = pending[cutoff:]
+    if pending:
+        yield base64.urlsafe_b64decode(pending)
+
+
+def _iter_fernet_ciphertext(src: IO[bytes], chunk_size: int) -> Generator[bytes, None, bytes]:
+    """
+    Yields the decoded Fernet token read from `src` in chunks, holding back the trailing HMAC so
+    that it is never part of a chunk. The HMAC is returned as the value of the generator.
+    """
+
+    tail = b""
+    for raw in _iter_urlsafe_b64decode(src, chunk_size):
+        data = tail + raw
+        tail = data[-32:]
+        if len(data) > 32:
+            yield data[:-32]
+    return tail
+
+
+def fernet_decrypt_stream(
+    key: bytes, src: IO[bytes], dest: IO[bytes], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> None:
+    """
+    Writes the same plaintext as `Fernet(key).decrypt(src.read())` to `dest`, without holding the
+    token or the plaintext in memory. `src` must be seekable, since the token is read twice: once to
+    verify its HMAC, and once more to decrypt it, so that nothing is written to `dest` unless the
+    token is authentic.
+    """
+
+    decoded_key = base64.urlsafe_b64decode(key)
+    signing_key, encryption_key = decoded_key[:16], decoded_key[16:]
+    start = src.tell()
+
+    try:
+        signer = HMAC(signing_key, hashes.SHA256(), default_backend())
+        header = b""
+        size = 0
+        chunks = _iter_fernet_ciphertext(src, chunk_size)
+        while True:
+            try:
+                chunk = next(chunks)
+            except StopIteration as e:
+                signature = e.value
+                break
+            if len(header) < 25:
+                header += chunk[: 25 - len(header)]
+            size += len(chunk)
+            signer.update(chunk)
+
+        if size < 25 or header[0] != 0x80 or (size - 25) % 16 or len(signature) != 32:
+            raise InvalidToken
+        signer.verify(signature)
+    except (binascii.Error, InvalidSignature):
+        raise InvalidToken
+
+    decryptor = Cipher(
+        algorithms.AES(encryption_key), modes.CBC(header[9:25]), default_backend()
+    ).decryptor()
+    unpadder = PKCS7(algorithms.AES.block_size).unpadder()
+
+    src.seek(start)
+    skip = 25
+    for chunk in _iter_fernet_ciphertext(src, chunk_size):
+        if skip:
+            skipped = chunk[:skip]
+            chunk = chunk[skip:]
+            skip -= len(skipped)
+        dest.write(unpadder.update(decryptor.update(chunk)))
+    try:
+        dest.write(unpadder.update(decryptor.finalize()) + unpadder.finalize())
+    except ValueError:
+        raise InvalidToken
 
 
 class UnwrappedEncryptedExportTarball(NamedTuple):
@@ -197,7 +354,15 @@ class UnwrappedEncryptedExportTarball(NamedTuple):
     encrypted_json_blob: str
 
 
-def unwrap_encrypted_export_tarball(tarball: BinaryIO) -> UnwrappedEncryptedExportTarball:
+def unwrap_encrypted_export_tarball(
+    tarball: BinaryIO, *, export_dest: IO[bytes] | None = None
+) -> UnwrappedEncryptedExportTarball:
+    """
+    Reads the three elements of an encrypted export tarball. If `export_dest` is set, the encrypted
+    JSON data is copied into it instead of being read into memory, and `encrypted_json_blob` is left
+    empty.
+    """
+
     export = None
     encrypted_dek = None
     public_key_pem = None
@@ -208,6 +373,12 @@ def unwrap_encrypted_export_tarball(tarball: BinaryIO) -> UnwrappedEncryptedExpo
                 if file is None:
                     raise ValueError(f"Could not extract file for {member.name}")
 
+                if member.name == "export.json" and export_dest is not None:
+                    for chunk in iter(lambda: file.read(EXPORT_CHUNK_SIZE), b""):
+                        export_dest.write(chunk)
+                    export = ""
+                    continue
+
                 content = file.read()
                 if member.name == "export.json":
                     export = content.decode("utf-8")
@@ -368,6 +539,21 @@ def decrypt_encrypted_tarball(tarball: BinaryIO, decryptor: Decryptor) -> bytes:
     return fernet.decrypt(unwrapped.encrypted_json_blob)
 
 
+def decrypt_encrypted_tarball_to_file(
+    tarball: BinaryIO, decryptor: Decryptor, dest: IO[bytes]
+) -> None:
+    """
+    Same as `decrypt_encrypted_tarball`, but writes the decrypted JSON to `dest`. The encrypted JSON
+    is spooled to a temporary file, so neither it nor the decrypted JSON needs to fit in memory.
+    """
+
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE) as encrypted_json_export:
+        unwrapped = unwrap_encrypted_export_tarball(tarball, export_dest=encrypted_json_export)
+        decrypted_dek = decryptor.decrypt_data_encryption_key(unwrapped)
+        encrypted_json_export.seek(0)
+        fernet_decrypt_stream(decrypted_dek, encrypted_json_export, dest)
+
+
 def get_final_derivations_of(model: Type) -> set[Type]:
     """A "final" derivation of the given `model` base class is any non-abstract class for the
     "sentry" app with `BaseModel` as an ancestor. Top-level calls to this class should pass in
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import tempfile
 from dataclasses import dataclass
-from typing import BinaryIO, Iterator, Optional, Tuple, Type
+from typing import IO, BinaryIO, Iterator, Optional, Tuple, Type
 from uuid import uuid4
 
 import click
@@ -17,7 +18,14 @@ from sentry.backup.dependencies import (
     dependencies,
     get_model_name,
 )
-from sentry.backup.helpers import Decryptor, Filter, ImportFlags, decrypt_encrypted_tarball
+from sentry.backup.helpers import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_SPOOL_MAX_SIZE,
+    Decryptor,
+    Filter,
+    ImportFlags,
+    decrypt_encrypted_tarball_to_file,
+)
 from sentry.backup.scopes import ImportScope
 from sentry.models.importchunk import ControlImportChunkReplica
 from sentry.models.orgauthtoken import OrgAuthToken
@@ -49,6 +57,16 @@ class ImportingError(Exception):
         self.context = context
 
 
+def _iter_import_models(content: IO[bytes]) -> Iterator[json.JSONData]:
+    """
+    Incrementally parses the JSON array of serialized models in `content`, starting from the top,
+    so that only one model instance is held in memory at a time.
+    """
+
+    content.seek(0)
+    return json.iterload_array(content, EXPORT_CHUNK_SIZE)
+
+
 def _import(
     src: BinaryIO,
     scope: ImportScope,
@@ -61,11 +79,36 @@ def _import(
     """
     Imports core data for a Sentry installation.
 
+    The (decrypted) JSON export is spooled to a temporary file and parsed incrementally, so only the
+    instances of a single model are held in memory at a time, regardless of the size of the export.
+
     It is generally preferable to avoid calling this function directly, as there are certain
     combinations of input parameters that should not be used together. Instead, use one of the other
     wrapper functions in this file, named `import_in_XXX_scope()`.
     """
 
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE) as content:
+        if decryptor is not None:
+            decrypt_encrypted_tarball_to_file(src, decryptor, content)
+        else:
+            for chunk in iter(lambda: src.read(EXPORT_CHUNK_SIZE), b""):
+                content.write(chunk)
+
+        _import_content(content, scope, flags=flags, filter_by=filter_by, printer=printer)
+
+
+def _import_content(
+    content: IO[bytes],
+    scope: ImportScope,
+    *,
+    flags: ImportFlags | None = None,
+    filter_by: Filter | None = None,
+    printer=click.echo,
+):
+    """
+    Imports the JSON export in `content`, see `_import`.
+    """
+
     # Import here to prevent circular module resolutions.
     from sentry.models.email import Email
     from sentry.models.organization import Organization
@@ -106,14 +149,6 @@ def _import(
     # workaround for now to enable forward progress.
     deferred_org_auth_tokens = None
 
-    # TODO(getsentry#team-ospo/190): Reading the entire export into memory as a string is quite
-    # wasteful - in the future, we should explore chunking strategies to enable a smaller memory
-    # footprint when processing super large (>100MB) exports.
-    content = (
-        decrypt_encrypted_tarball(src, decryptor)
-        if decryptor is not None
-        else src.read().decode("utf-8")
-    )
     filters = []
     if filter_by is not None:
         filters.append(filter_by)
@@ -133,11 +168,9 @@ def _import(
             user_filter: Filter[int] = Filter(model=User, field="pk")
             filters.append(user_filter)
 
-            # TODO(getsentry#team-ospo/190): It turns out that Django's "streaming" JSON
-            # deserializer does no such thing, and actually loads the entire JSON into memory! If we
-            # don't want to choke on large imports, we'll need use a truly "chunkable" JSON
-            # importing library like ijson for this.
-            for obj in serializers.deserialize("json", content):
+            # Django's JSON deserializer loads the entire JSON into memory, so parse the export
+            # incrementally ourselves and only use Django to deserialize individual models.
+            for obj in serializers.deserialize("python", _iter_import_models(content)):
                 o = obj.object
                 model_name = get_model_name(o)
                 if model_name == user_model_name:
@@ -162,7 +195,7 @@ def _import(
                     break
         elif filter_by.model == User:
             seen_first_user_model = False
-            for obj in serializers.deserialize("json", content):
+            for obj in serializers.deserialize("python", _iter_import_models(content)):
                 o = obj.object
                 model_name = get_model_name(o)
                 if model_name == user_model_name:
@@ -189,7 +222,7 @@ def _import(
     # with N model kinds into N json blobs with 1 model kind each.
     def yield_json_models(content) -> Iterator[Tuple[NormalizedModelName, str]]:
         # TODO(getsentry#team-ospo/190): Better error handling for unparsable JSON.
-        models = json.loads(content)
+        models = _iter_import_models(content)
         last_seen_model_name: Optional[NormalizedModelName] = None
         batch: list[Type[Model]] = []
         for model in models:
@@ -0,0 +1,7 @@
+from sentry.bgtasks.api import bgtask
+from sentry.models.files.abstractfile import blob_cache
+
+
+@bgtask()
+def clean_blobcache():
+    blob_cache.clear_old_entries()
@@ -1,9 +1,20 @@
-from django.db.models import F
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Mapping, Sequence, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections, router
+from django.db.models import F, Model
+from django.db.models.signals import post_save
 
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils.services import Service
 
+# (model, columns, filters, extra, signal_only), as passed to ``Buffer.process``
+BufferUpdate = Tuple[Any, Mapping[str, int], Mapping[str, Any], Mapping[str, Any], Any]
+
 
 class Buffer(Service):
     """
@@ -93,3 +104,149 @@ class Buffer(Service):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, updates: Sequence[BufferUpdate]) -> None:
+        """
+        Applies many buffered updates at once.
+
+        Updates of rows that are identified by their primary key alone are grouped per
+        model and set of columns, and every group is written with a single
+        ``UPDATE ... FROM (VALUES ...)`` statement. Everything else, and updates of
+        rows that turn out not to exist, is handed to ``process`` one by one.
+        """
+        from sentry.models.group import Group
+
+        grouped: dict[tuple[Any, tuple[str, ...], tuple[str, ...]], dict[Any, BufferUpdate]]
+        grouped = defaultdict(dict)
+        for update in updates:
+            model, columns, filters, extra, signal_only = update
+            pk = _get_bulk_update_pk(model, columns, filters, extra, signal_only)
+            shape = (model, tuple(sorted(columns)), tuple(sorted(extra or ())))
+            if pk is None or pk in grouped[shape]:
+                # Subclasses override ``process`` with a different signature.
+                Buffer.process(self, model, columns, filters, extra, signal_only)
+                continue
+            grouped[shape][pk] = update
+
+        for (model, column_names, extra_names), rows in grouped.items():
+            if not rows:
+                continue
+            updated = _bulk_update(model, column_names, extra_names, rows)
+
+            if model is Group:
+                # Keep the group cache up to date, as ``process`` does through ``update``.
+                for group in Group.objects.filter(id__in=list(rows)):
+                    post_save.send(sender=Group, instance=group, created=False)
+            else:
+                # The bulk statement only updates, ``process`` creates the rows that don't
+                # exist yet. Missing groups are skipped, as they are by ``process``.
+                for pk in rows.keys() - updated:
+                    Buffer.process(self, *rows.pop(pk))
+
+            for _, columns, filters, extra, _ in rows.values():
+                buffer_incr_complete.send_robust(
+                    model=model,
+                    columns=columns,
+                    filters=filters,
+                    extra=extra,
+                    created=False,
+                    sender=model,
+                )
+
+
+def _get_bulk_update_pk(
+    model: Any,
+    columns: Mapping[str, int],
+    filters: Mapping[str, Any],
+    extra: Mapping[str, Any] | None,
+    signal_only: Any,
+) -> Any:
+    """
+    Returns the primary key of the row targeted by an update if it can be applied
+    with ``_bulk_update``, otherwise ``None``.
+    """
+    from sentry.models.group import Group
+
+    if signal_only or len(filters) != 1 or not (columns or extra):
+        return None
+    key, pk = next(iter(filters.items()))
+    if key not in ("id", "pk") or isinstance(pk, Model):
+        return None
+    try:
+        # Normalized, so it can be matched against the primary keys ``_bulk_update`` returns.
+        pk = model._meta.pk.to_python(pk)
+    except ValidationError:
+        return None
+
+    names = set(columns) | set(extra or ())
+    opts = model._meta
+    for name in names:
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many or field.is_relation or field.primary_key:
+            return None
+
+    if model is Group and {"times_seen", "last_seen"} <= names:
+        # ``process`` recomputes the score in this case, which we only replicate for
+        # the shape that ingestion writes.
+        if "times_seen" not in columns or "last_seen" not in (extra or ()):
+            return None
+
+    return pk
+
+
+def _bulk_update(
+    model: Any,
+    column_names: Sequence[str],
+    extra_names: Sequence[str],
+    rows: Mapping[Any, BufferUpdate],
+) -> set[Any]:
+    """
+    Applies ``rows`` with a single statement, and returns the primary keys of the rows
+    that were updated.
+    """
+    from sentry.models.group import Group
+
+    using = router.db_for_write(model)
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    opts = model._meta
+
+    pk_field = opts.pk
+    counter_fields = [opts.get_field(name) for name in column_names]
+    extra_fields = [opts.get_field(name) for name in extra_names]
+    value_fields = [pk_field] + counter_fields + extra_fields
+
+    assignments = [
+        f"{qn(f.column)} = COALESCE(t.{qn(f.column)}, 0) + v.{qn(f.column)}" for f in counter_fields
+    ]
+    assignments += [f"{qn(f.column)} = v.{qn(f.column)}" for f in extra_fields]
+    if model is Group and "times_seen" in column_names and "last_seen" in extra_names:
+        # Mirrors ``ScoreClause``, which is evaluated against the pre-update row.
+        assignments.append(
+            '"score" = log(t."times_seen" + v."times_seen") * 600'
+            ' + floor(extract(epoch from v."last_seen"))'
+        )
+
+    # Primary keys are cast explicitly, auto fields report ``serial`` as their type.
+    placeholder = "(%s)" % ", ".join(
+        ["%s::bigint"] + [f"%s::{f.cast_db_type(connection)}" for f in value_fields[1:]]
+    )
+    params: list[Any] = []
+    for pk, (_, columns, _, extra, _) in rows.items():
+        params.append(pk)
+        params.extend(columns[f.name] for f in counter_fields)
+        params.extend(f.get_db_prep_save(extra[f.name], connection) for f in extra_fields)
+
+    sql = (
+        f"UPDATE {qn(opts.db_table)} AS t SET {', '.join(assignments)} "
+        f"FROM (VALUES {', '.join([placeholder] * len(rows))}) "
+        f"AS v ({', '.join(qn(f.column) for f in value_fields)}) "
+        f"WHERE t.{qn(pk_field.column)} = v.{qn(pk_field.column)} "
+        f"RETURNING t.{qn(pk_field.column)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {row[0] for row in cursor.fetchall()}
@@ -73,12 +73,15 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(self, pending_partitions=1, incr_batch_size=2, pipelined_flush=False, **options):
         self.is_redis_cluster, self.cluster, options = get_dynamic_cluster_from_options(
             "SENTRY_BUFFER_OPTIONS", options
         )
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
+        # When enabled, each ``process_incr`` task drains its whole batch of keys
+        # with pipelined Redis reads and bulk database updates.
+        self.pipelined_flush = pipelined_flush
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
 
@@ -277,47 +280,63 @@ class RedisBuffer(Buffer):
         try:
             keycount = 0
             if self.is_redis_cluster:
-                keys = self.cluster.zrange(pending_key, 0, -1)
-                keycount += len(keys)
+                pending = self.cluster.zrange(pending_key, 0, -1, withscores=True)
+                keycount += len(pending)
 
-                for key in keys:
-                    pending_buffer.append(key)
+                for key, score in pending:
+                    pending_buffer.append((key, score))
                     if pending_buffer.full():
-                        process_incr.apply_async(kwargs={"batch_keys": pending_buffer.flush()})
+                        self._queue_process_incr(pending_buffer.flush())
 
-                self.cluster.zrem(pending_key, *keys)
+                self.cluster.zrem(pending_key, *(key for key, _ in pending))
             else:
                 with self.cluster.all() as conn:
-                    results = conn.zrange(pending_key, 0, -1)
+                    results = conn.zrange(pending_key, 0, -1, withscores=True)
 
                 with self.cluster.all() as conn:
-                    for host_id, keys in results.value.items():
-                        if not keys:
+                    for host_id, pending in results.value.items():
+                        if not pending:
                             continue
-                        keycount += len(keys)
-                        for key in keys:
-                            pending_buffer.append(key.decode("utf-8"))
+                        keycount += len(pending)
+                        for key, score in pending:
+                            pending_buffer.append((key.decode("utf-8"), score))
                             if pending_buffer.full():
-                                process_incr.apply_async(
-                                    kwargs={"batch_keys": pending_buffer.flush()}
-                                )
-                        conn.target([host_id]).zrem(pending_key, *keys)
+                                self._queue_process_incr(pending_buffer.flush())
+                        conn.target([host_id]).zrem(pending_key, *(key for key, _ in pending))
 
             # queue up remainder of pending keys
             if not pending_buffer.empty():
-                process_incr.apply_async(kwargs={"batch_keys": pending_buffer.flush()})
+                self._queue_process_incr(pending_buffer.flush())
 
             metrics.timing("buffer.pending-size", keycount)
         finally:
             client.delete(lock_key)
 
-    def process(self, key=None, batch_keys=None):
+    def _queue_process_incr(self, pending):
+        """
+        Queues a ``process_incr`` task for a batch of ``(key, pending since)`` pairs.
+        """
+        kwargs = {"batch_keys": [key for key, _ in pending]}
+        if self.pipelined_flush:
+            # The keys are removed from the pending set before the task runs, so pass along
+            # when the oldest one was last marked pending for the flush lag.
+            kwargs["pending_since"] = min(score for _, score in pending)
+        process_incr.apply_async(kwargs=kwargs)
+
+    def process(self, key=None, batch_keys=None, pending_since=None):
         assert not (key is None and batch_keys is None)
         assert not (key is not None and batch_keys is not None)
 
         if key is not None:
             batch_keys = [key]
 
+        if pending_since is not None:
+            metrics.timing("buffer.flush-lag", time() - pending_since)
+
+        if self.pipelined_flush and len(batch_keys) > 1:
+            self._process_batch_incr(batch_keys)
+            return
+
         for key in batch_keys:
             self._process_single_incr(key)
 
@@ -362,29 +381,98 @@ class RedisBuffer(Buffer):
                 logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            model = import_string(force_str(values.pop("m")))
-
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+            self._process(*self._load_update(values))
         finally:
             client.delete(lock_key)
+
+    def _load_update(self, values):
+        """
+        Turns the contents of a buffer hash into the arguments of ``Buffer.process``.
+        """
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
+
+    def _execute_per_key(self, keys, commands):
+        """
+        Issues ``commands(client, key)`` for every key in one pipelined round trip
+        per host. ``commands`` must issue the same number of commands for every key
+        and return them, the results are returned grouped by key.
+        """
+        if not keys:
+            return []
+
+        if self.is_redis_cluster:
+            pipe = self.cluster.pipeline(transaction=False)
+            for key in keys:
+                commands(pipe, key)
+            results = pipe.execute()
+            size = len(results) // len(keys)
+            return [results[i * size : (i + 1) * size] for i in range(len(keys))]
+
+        with self.cluster.map() as client:
+            promises = [commands(client, key) for key in keys]
+        return [[promise.value for promise in key_promises] for key_promises in promises]
+
+    def _process_batch_incr(self, keys):
+        metrics.timing("buffer.batch-size", len(keys))
+
+        # prevent a stampede due to the way we use celery etas + duplicate
+        # tasks, see ``_process_single_incr``
+        locked = self._execute_per_key(
+            keys, lambda client, key: [client.set(self._make_lock_key(key), "1", nx=True, ex=10)]
+        )
+        acquired = [key for key, (lock,) in zip(keys, locked) if lock]
+        if len(acquired) < len(keys):
+            metrics.incr(
+                "buffer.revoked",
+                amount=len(keys) - len(acquired),
+                tags={"reason": "locked"},
+                skip_internal=False,
+            )
+
+        try:
+            results = self._execute_per_key(
+                acquired,
+                lambda client, key: [
+                    client.hgetall(key),
+                    client.zrem(self._make_pending_key_from_key(key), key),
+                    client.delete(key),
+                ],
+            )
+
+            updates = []
+            for key, (values, _, _) in zip(acquired, results):
+                values = {force_str(k): v for k, v in (values or {}).items()}
+                if not values:
+                    metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+                    logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+                    continue
+                updates.append(self._load_update(values))
+
+            self.process_batch(updates)
+        finally:
+            self._execute_per_key(
+                acquired, lambda client, key: [client.delete(self._make_lock_key(key))]
+            )
@@ -1252,6 +1252,7 @@ BGTASKS = {
         "interval": 5 * 60,
         "roles": ["worker"],
     },
+    "sentry.bgtasks.clean_blobcache:clean_blobcache": {"interval": 5 * 60, "roles": ["worker"]},
 }
 
 # Sentry logs to two major places: stdout, and it's internal project.
@@ -2129,7 +2130,8 @@ SENTRY_ATTACHMENTS_OPTIONS: dict[str, str] = {}
 SENTRY_REPLAYS_CACHE: str = "sentry.replays.cache.default"
 SENTRY_REPLAYS_CACHE_OPTIONS: Dict[str, Any] = {}
 
-# Events blobs processing backend
+# Events blobs processing backend. The Redis backend accepts a `codec` option,
+# `zstd` stores events compressed instead of as plain JSON.
 SENTRY_EVENT_PROCESSING_STORE = (
     "sentry.eventstore.processing.redis.RedisClusterEventProcessingStore"
 )
@@ -2186,6 +2188,10 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS: dict[str, Any] = {}
 
+# zstd dictionaries used to compress node payloads, mapping platforms to the
+# path of a dictionary created with `sentry.nodestore.compression.train_dictionary`
+SENTRY_NODESTORE_ZSTD_DICTIONARIES: dict[str, str] = {}
+
 # Node storage backend used for ArtifactBundle indexing (aka FlatFileIndex aka BundleIndex)
 SENTRY_INDEXSTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_INDEXSTORE_OPTIONS: dict[str, Any] = {}
@@ -2604,6 +2610,11 @@ SENTRY_OPTIONS: dict[str, Any] = {}
 SENTRY_DEFAULT_OPTIONS: dict[str, Any] = {}
 # Raise an error in dev on failed lookups
 SENTRY_OPTIONS_COMPLAIN_ON_ERRORS = True
+# Keep options in memory until a change is published for them, instead of
+# refetching them from the cache when their ttl expires. Processes check for
+# published changes at most every ``SENTRY_OPTIONS_VERSION_POLL_INTERVAL`` seconds.
+SENTRY_OPTIONS_PUSH_INVALIDATION = False
+SENTRY_OPTIONS_VERSION_POLL_INTERVAL = 1.0
 
 # You should not change this setting after your database has been created
 # unless you have altered all schemas first
@@ -61,6 +61,38 @@ def ingest_replay_recordings_options() -> List[click.Option]:
     return options
 
 
+def ingest_monitors_options() -> List[click.Option]:
+    """Return a list of ingest-monitors options."""
+    options = [
+        click.Option(
+            ["--mode", "mode"],
+            type=click.Choice(["serial", "parallel"]),
+            default="serial",
+            help="The mode to process check-ins in. Parallel processes the check-ins of different monitors concurrently.",
+        ),
+        click.Option(
+            ["--max-batch-size", "max_batch_size"],
+            type=int,
+            default=500,
+            help="Maximum number of check-ins to batch before processing them in parallel.",
+        ),
+        click.Option(
+            ["--max-batch-time-ms", "max_batch_time"],
+            type=int,
+            default=1000,
+            callback=convert_max_batch_time,
+            help="Maximum time (in milliseconds) to wait before processing a batch in parallel.",
+        ),
+        click.Option(
+            ["--max-workers", "max_workers"],
+            type=int,
+            default=None,
+            help="The maximum number of threads to process check-ins with in parallel mode.",
+        ),
+    ]
+    return options
+
+
 _METRICS_INDEXER_OPTIONS = [
     click.Option(["--input-block-size"], type=int, default=DEFAULT_BLOCK_SIZE),
     click.Option(["--output-block-size"], type=int, default=DEFAULT_BLOCK_SIZE),
@@ -127,6 +159,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "ingest-monitors": {
         "topic": settings.KAFKA_INGEST_MONITORS,
         "strategy_factory": "sentry.monitors.consumers.monitor_consumer.StoreMonitorCheckInStrategyFactory",
+        "click_options": ingest_monitors_options(),
     },
     "billing-metrics-consumer": {
         "topic": settings.KAFKA_SNUBA_GENERIC_METRICS,
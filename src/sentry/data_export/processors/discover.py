@@ -1,18 +1,23 @@
 import logging
+from datetime import timedelta
 
+from django.utils.dateparse import parse_datetime
 from sentry_relay.consts import SPAN_STATUS_CODE_TO_NAME
 
 from sentry.api.utils import get_date_range_from_params
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.project import Project
-from sentry.search.events.fields import get_function_alias
+from sentry.search.events.fields import get_function_alias, is_function
 from sentry.snuba import discover
 
 from ..base import ExportError
 
 logger = logging.getLogger(__name__)
 
+# The sorts supported by keyset pagination, mapped to whether they are descending.
+KEYSET_SORTS = {"timestamp": False, "-timestamp": True}
+
 
 class DiscoverProcessor:
     """
@@ -46,6 +51,16 @@ class DiscoverProcessor:
             params=self.params,
             sort=discover_query.get("sort"),
         )
+        self.keyset_sort = self.get_keyset_sort(discover_query)
+        self.supports_keyset_pagination = self.keyset_sort is not None
+        if self.supports_keyset_pagination:
+            self.keyset_data_fn = self.get_data_fn(
+                fields=self.get_keyset_fields(discover_query["field"]),
+                equations=equations,
+                query=discover_query["query"],
+                params=self.params,
+                sort=self.keyset_sort,
+            )
 
     @staticmethod
     def get_projects(organization_id, query):
@@ -75,9 +90,32 @@ class DiscoverProcessor:
 
         return environment_names
 
+    @staticmethod
+    def get_keyset_sort(query):
+        """
+        Returns the sort to use for keyset pagination, or `None` if the query cannot be paginated
+        with a keyset. Only queries for individual events sorted by timestamp are supported, as
+        the timestamp can be used to narrow down the time range of the following pages.
+        """
+        sort = query.get("sort") or "-timestamp"
+        if isinstance(sort, list):
+            if len(sort) != 1:
+                return None
+            sort = sort[0]
+        if sort not in KEYSET_SORTS:
+            return None
+        if query.get("equations") or any(is_function(field) for field in query["field"]):
+            return None
+        return sort
+
+    @staticmethod
+    def get_keyset_fields(fields):
+        # The keyset is made of the timestamp and the ids of the events seen at that timestamp.
+        return fields + [field for field in ("id", "timestamp") if field not in fields]
+
     @staticmethod
     def get_data_fn(fields, equations, query, params, sort):
-        def data_fn(offset, limit):
+        def data_fn(offset, limit, params=params):
             return discover.query(
                 selected_columns=fields,
                 equations=equations,
@@ -127,3 +165,35 @@ class DiscoverProcessor:
                     result[equation] = result.get(equation_alias)
 
         return new_result_list
+
+    def get_keyset_data(self, limit, cursor=None):
+        """
+        Returns the next `limit` rows after `cursor` along with the cursor for the page after that,
+        which is `None` once there are no more rows.
+
+        Events are paginated by narrowing down the time range of the query to the timestamp of the
+        last event of the previous page, so the query never has to skip over rows. Events sharing
+        that timestamp are filtered out by their id, which is why the query fetches one additional
+        row for each of them.
+        """
+        params = self.params
+        seen_ids = set()
+        if cursor is not None:
+            params = dict(self.params)
+            timestamp = parse_datetime(cursor["timestamp"])
+            if KEYSET_SORTS[self.keyset_sort]:
+                params["end"] = min(self.end, timestamp + timedelta(seconds=1))
+            else:
+                params["start"] = max(self.start, timestamp)
+            seen_ids.update(cursor["ids"])
+
+        result = self.keyset_data_fn(offset=0, limit=limit + len(seen_ids), params=params)
+        rows = [row for row in result["data"] if row["id"] not in seen_ids][:limit]
+        if not rows:
+            return [], None
+
+        last_timestamp = rows[-1]["timestamp"]
+        ids = [row["id"] for row in rows if row["timestamp"] == last_timestamp]
+        if cursor is not None and cursor["timestamp"] == last_timestamp:
+            ids.extend(cursor["ids"])
+        return self.handle_fields(rows), {"timestamp": last_timestamp, "ids": ids}
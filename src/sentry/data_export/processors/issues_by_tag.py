@@ -36,6 +36,7 @@ class IssuesByTagProcessor:
         except tagstore.TagKeyNotFound:
             raise ExportError("Requested key does not exist")
         self.callbacks = self.get_callbacks(self.key, self.group.project_id)
+        self.supports_keyset_pagination = True
 
     @staticmethod
     def get_project(project_id):
@@ -110,7 +111,7 @@ class IssuesByTagProcessor:
             result["ip_address"] = euser.ip_address if euser else ""
         return result
 
-    def get_raw_data(self, limit=1000, offset=0):
+    def get_raw_data(self, limit=1000, offset=0, **kwargs):
         """
         Returns list of GroupTagValues
         """
@@ -122,6 +123,7 @@ class IssuesByTagProcessor:
             limit=limit,
             offset=offset,
             tenant_ids={"organization_id": self.project.organization_id},
+            **kwargs,
         )
 
     def get_serialized_data(self, limit=1000, offset=0):
@@ -130,3 +132,13 @@ class IssuesByTagProcessor:
         """
         raw_data = self.get_raw_data(limit=limit, offset=offset)
         return [self.serialize_row(item, self.key) for item in raw_data]
+
+    def get_keyset_data(self, limit=1000, cursor=None):
+        """
+        Returns list of serialized GroupTagValue dictionaries following the value `cursor`, ordered
+        by value, along with the cursor for the next page
+        """
+        raw_data = self.get_raw_data(limit=limit, order_by="value", after_value=cursor)
+        if not raw_data:
+            return [], None
+        return [self.serialize_row(item, self.key) for item in raw_data], raw_data[-1].value
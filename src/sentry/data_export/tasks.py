@@ -2,6 +2,9 @@ import codecs
 import csv
 import logging
 import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha1
 
 import celery
@@ -17,9 +20,10 @@ else:
 
 from celery.exceptions import MaxRetriesExceededError
 from django.core.files.base import ContentFile
-from django.db import IntegrityError, router
+from django.db import IntegrityError, connections, router
 from django.utils import timezone
 
+from sentry import options
 from sentry.models.files.file import File
 from sentry.models.files.fileblob import FileBlob
 from sentry.models.files.fileblobindex import FileBlobIndex
@@ -62,6 +66,8 @@ def assemble_download(
     environment_id=None,
     export_retries=3,
     countdown=60,
+    keyset=None,
+    cursor=None,
     **kwargs,
 ):
     with sentry_sdk.start_span(op="assemble"):
@@ -91,6 +97,7 @@ def assemble_download(
             scope.set_extra("export.query", data_export.query_info)
 
         base_bytes_written = bytes_written
+        base_cursor = cursor
 
         try:
             # ensure that the export limit is set and capped at EXPORTED_ROWS_LIMIT
@@ -101,6 +108,13 @@ def assemble_download(
 
             processor = get_processor(data_export, environment_id)
 
+            # The pagination mode is picked when the export starts and kept for all of its batches.
+            if keyset is None:
+                keyset = first_page and (
+                    options.get("data-export.keyset-pagination")
+                    and getattr(processor, "supports_keyset_pagination", False)
+                )
+
             with tempfile.TemporaryFile(mode="w+b") as tf:
                 # XXX(python3):
                 #
@@ -126,23 +140,25 @@ def assemble_download(
 
                 rows = []
 
-                for _ in range(MAX_FRAGMENTS_PER_BATCH):
-                    # the number of rows to export in the next batch fragment
-                    fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
-
-                    rows = process_rows(processor, data_export, fragment_row_count, next_offset)
-                    writer.writerows(rows)
-
-                    fragment_offset += len(rows)
-                    next_offset = offset + fragment_offset
-
-                    if (
-                        not rows
-                        or len(rows) < batch_size
-                        # the batch may exceed MAX_BATCH_SIZE but immediately stops
-                        or tf.tell() - starting_pos >= MAX_BATCH_SIZE
-                    ):
-                        break
+                fragments = iter_fragments(
+                    processor, data_export, export_limit, batch_size, offset, keyset, cursor
+                )
+                try:
+                    for _, (rows, cursor) in zip(range(MAX_FRAGMENTS_PER_BATCH), fragments):
+                        writer.writerows(rows)
+
+                        fragment_offset += len(rows)
+                        next_offset = offset + fragment_offset
+
+                        if (
+                            not rows
+                            or len(rows) < batch_size
+                            # the batch may exceed MAX_BATCH_SIZE but immediately stops
+                            or tf.tell() - starting_pos >= MAX_BATCH_SIZE
+                        ):
+                            break
+                finally:
+                    fragments.close()
 
                 tf.seek(0)
                 new_bytes_written = store_export_chunk_as_blob(data_export, bytes_written, tf)
@@ -158,6 +174,8 @@ def assemble_download(
                         "bytes_written": base_bytes_written,
                         "environment_id": environment_id,
                         "export_retries": export_retries - 1,
+                        "keyset": keyset,
+                        "cursor": base_cursor,
                     },
                     countdown=countdown,
                 )
@@ -197,6 +215,8 @@ def assemble_download(
                         "bytes_written": bytes_written,
                         "environment_id": environment_id,
                         "export_retries": export_retries,
+                        "keyset": keyset,
+                        "cursor": cursor,
                     },
                     countdown=3,
                 )
@@ -232,6 +252,102 @@ def get_processor(data_export, environment_id):
         raise
 
 
+def iter_fragments(processor, data_export, export_limit, batch_size, offset, keyset, cursor):
+    """
+    Yields the rows of the consecutive fragments of an export starting at `offset`, along with the
+    keyset cursor pointing past each fragment (`None` for offset pagination).
+
+    With keyset pagination every fragment depends on the previous one, so they are fetched one by
+    one. With offset pagination up to `data-export.fetch-concurrency` fragments are fetched ahead of
+    time, which is wasted on the fragments that are never consumed when the batch ends.
+    """
+    if keyset:
+        while True:
+            fragment_row_count = min(batch_size, max(export_limit - offset, 1))
+            rows, cursor = fetch_fragment(
+                process_keyset_rows, processor, data_export, fragment_row_count, offset, cursor
+            )
+            yield rows, cursor
+            offset += len(rows)
+
+    concurrency = options.get("data-export.fetch-concurrency")
+    if concurrency <= 1:
+        while True:
+            fragment_row_count = min(batch_size, max(export_limit - offset, 1))
+            rows = fetch_fragment(
+                process_rows, processor, data_export, fragment_row_count, offset, offset
+            )
+            yield rows, None
+            offset += len(rows)
+
+    def fetch_fragment_in_thread(*args):
+        try:
+            return fetch_fragment(*args)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: deque = deque()
+        next_offset = offset
+        last_submitted = False
+        try:
+            while True:
+                while not last_submitted and len(pending) < concurrency:
+                    fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
+                    pending.append(
+                        executor.submit(
+                            fetch_fragment_in_thread,
+                            process_rows,
+                            processor,
+                            data_export,
+                            fragment_row_count,
+                            next_offset,
+                            next_offset,
+                        )
+                    )
+                    next_offset += fragment_row_count
+                    # A partial fragment is always the last one of the export
+                    last_submitted = fragment_row_count < batch_size
+                if not pending:
+                    return
+                yield pending.popleft().result(), None
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def fetch_fragment(process, processor, data_export, batch_size, offset, position):
+    """
+    Fetches a fragment with `process` and records how long it took, so it can be compared across
+    the offsets of an export.
+    """
+    pagination = "offset" if process is process_rows else "keyset"
+    start = time.monotonic()
+    result = process(processor, data_export, batch_size, position)
+    duration = time.monotonic() - start
+
+    metrics.timing(
+        "dataexport.fragment.duration",
+        duration,
+        tags={
+            "pagination": pagination,
+            "export.type": ExportQueryType.as_str(data_export.query_type),
+        },
+        sample_rate=1.0,
+    )
+    logger.info(
+        "dataexport.fragment",
+        extra={
+            "data_export_id": data_export.id,
+            "pagination": pagination,
+            "offset": offset,
+            "batch_size": batch_size,
+            "duration": duration,
+        },
+    )
+    return result
+
+
 def process_rows(processor, data_export, batch_size, offset):
     try:
         if data_export.query_type == ExportQueryType.ISSUES_BY_TAG:
@@ -249,6 +365,22 @@ def process_rows(processor, data_export, batch_size, offset):
         raise
 
 
+def process_keyset_rows(processor, data_export, batch_size, cursor):
+    try:
+        return process_keyset_page(processor, batch_size, cursor)
+    except ExportError as error:
+        error_str = str(error)
+        metrics.incr("dataexport.error", tags={"error": error_str}, sample_rate=1.0)
+        logger.info(f"dataexport.error: {error_str}")
+        capture_exception(error)
+        raise
+
+
+@handle_snuba_errors(logger)
+def process_keyset_page(processor, limit, cursor):
+    return processor.get_keyset_data(limit=limit, cursor=cursor)
+
+
 @handle_snuba_errors(logger)
 def process_issues_by_tag(processor, limit, offset):
     return processor.get_serialized_data(limit=limit, offset=offset)
@@ -11,6 +11,8 @@ import sentry_sdk
 from django.db import DatabaseError, router
 from django.utils import timezone
 
+from sentry import options
+from sentry.debug_files import binary_flat_file_index
 from sentry.debug_files.artifact_bundles import get_redis_cluster_for_artifact_bundles
 from sentry.models.artifactbundle import (
     NULL_STRING,
@@ -402,38 +404,59 @@ def update_artifact_bundle_index(
         except DatabaseError:
             return False
 
-        index = FlatFileIndex()
-        # Load the index from the file if it exists
-        if existing_index := flat_file_index.load_flat_file_index():
-            index.from_json(existing_index)
+        use_binary_index = options.get("sourcemaps.artifact_bundles.binary_flat_file_index")
 
-        for bundle in bundles_to_add or []:
-            # Before merging new data into the index, we will clear any existing
-            # data from the index related to this bundle.
-            # This is related to an edge-case in which the same `bundle_id` could be
-            # re-used but with different file contents.
-            index.remove(bundle.meta.id)
-
-            # We merge the index based on the identifier type.
-            if identifier.is_indexing_by_release():
-                index.merge_urls(bundle.meta, bundle.urls)
-            else:
-                index.merge_debug_ids(bundle.meta, bundle.debug_ids)
-
-        for bundle_id in bundles_to_remove or []:
-            index.remove(bundle_id)
-
-        bundles_removed = index.enforce_size_limits()
-        if bundles_removed > 0:
+        binary_index = None
+        if use_binary_index and not bundles_to_remove:
+            binary_index = _merge_into_binary_index(
+                flat_file_index, identifier, bundles_to_add or []
+            )
             metrics.incr(
-                "artifact_bundle_flat_file_indexing.bundles_removed",
-                amount=bundles_removed,
-                tags={"reason": "size_limits"},
+                "artifact_bundle_flat_file_indexing.binary_index.merge",
+                tags={"incremental": binary_index is not None},
             )
 
+        if binary_index is not None:
+            new_json_index = FlatFileIndex.json_from_binary(binary_index)
+        else:
+            index = FlatFileIndex()
+            # Load the index from the file if it exists
+            if existing_index := flat_file_index.load_flat_file_index():
+                index.from_json(existing_index)
+
+            for bundle in bundles_to_add or []:
+                # Before merging new data into the index, we will clear any existing
+                # data from the index related to this bundle.
+                # This is related to an edge-case in which the same `bundle_id` could be
+                # re-used but with different file contents.
+                index.remove(bundle.meta.id)
+
+                # We merge the index based on the identifier type.
+                if identifier.is_indexing_by_release():
+                    index.merge_urls(bundle.meta, bundle.urls)
+                else:
+                    index.merge_debug_ids(bundle.meta, bundle.debug_ids)
+
+            for bundle_id in bundles_to_remove or []:
+                index.remove(bundle_id)
+
+            bundles_removed = index.enforce_size_limits()
+            if bundles_removed > 0:
+                metrics.incr(
+                    "artifact_bundle_flat_file_indexing.bundles_removed",
+                    amount=bundles_removed,
+                    tags={"reason": "size_limits"},
+                )
+
+            # An index at its size limits keeps hitting them, so new bundles could never be
+            # merged into its binary index.
+            if use_binary_index and bundles_removed == 0:
+                binary_index = index.to_binary()
+
+            new_json_index = index.to_json()
+
         # Store the updated index file
-        new_json_index = index.to_json()
-        flat_file_index.update_flat_file_index(new_json_index)
+        flat_file_index.update_flat_file_index(new_json_index, binary_index)
 
         # And then mark the bundles as indexed
         for bundle in bundles_to_add or []:
@@ -454,6 +477,58 @@ def update_artifact_bundle_index(
         return True
 
 
+def _merge_into_binary_index(
+    flat_file_index: ArtifactBundleFlatFileIndex,
+    identifier: FlatFileIdentifier,
+    bundles_to_add: List[BundleManifest],
+) -> Optional[bytes]:
+    """
+    Merges new bundles into the stored binary index without decoding it.
+
+    Returns `None` if there is no usable binary index, or if the update needs to go through
+    `FlatFileIndex` because it replaces an existing bundle or exceeds the size limits.
+    """
+    binary_index = flat_file_index.load_binary_flat_file_index()
+    if binary_index is None:
+        return None
+
+    if identifier.is_indexing_by_release():
+        table_name = binary_flat_file_index.TABLE_URLS
+    else:
+        table_name = binary_flat_file_index.TABLE_DEBUG_IDS
+
+    try:
+        existing = binary_flat_file_index.BinaryFlatFileIndex(binary_index)
+        if existing.bundle_count + len(bundles_to_add) > MAX_BUNDLES_PER_INDEX:
+            return None
+
+        for bundle in bundles_to_add:
+            binary_index = binary_flat_file_index.merge_bundle(
+                binary_index,
+                (bundle.meta.id, bundle.meta.timestamp),
+                table_name,
+                bundle.urls if identifier.is_indexing_by_release() else bundle.debug_ids,
+                max_entries=MAX_BUNDLES_PER_ENTRY,
+                incomplete_above=MAX_BUNDLES_PER_ENTRY,
+            )
+            if binary_index is None:
+                return None
+
+        merged = binary_flat_file_index.BinaryFlatFileIndex(binary_index)
+    except binary_flat_file_index.InvalidBinaryIndex:
+        metrics.incr("artifact_bundle_flat_file_indexing.binary_index.invalid")
+        return None
+
+    if (
+        merged.bundle_count > MAX_BUNDLES_PER_INDEX
+        or merged.debug_ids.count > MAX_DEBUGIDS_PER_INDEX
+        or merged.urls.count > MAX_URLS_PER_INDEX
+    ):
+        return None
+
+    return binary_index
+
+
 # We have seen customers with up to 5_000 bundles per *release*.
 MAX_BUNDLES_PER_INDEX = 7_500
 # Older `sentry-cli` used to generate fully random DebugIds, and uploads can end up
@@ -496,8 +571,9 @@ class FlatFileIndex:
         self._files_by_url = json_idx.get("files_by_url", {})
         self._files_by_debug_id = json_idx.get("files_by_debug_id", {})
 
-    def to_json(self) -> str:
-        bundles = [
+    @staticmethod
+    def _bundles_to_json(bundles: Bundles) -> List[Dict[str, Any]]:
+        return [
             {
                 # NOTE: Symbolicator is using the `bundle_id` as the `?download=...`
                 # parameter it passes to the artifact-lookup API to download the
@@ -506,17 +582,56 @@ class FlatFileIndex:
                 "bundle_id": f"artifact_bundle/{bundle.id}",
                 "timestamp": datetime.isoformat(bundle.timestamp),
             }
-            for bundle in self._bundles
+            for bundle in bundles
         ]
+
+    def to_json(self) -> str:
         json_idx: Dict[str, Any] = {
             "is_complete": self._is_complete,
-            "bundles": bundles,
+            "bundles": self._bundles_to_json(self._bundles),
             "files_by_url": self._files_by_url,
             "files_by_debug_id": self._files_by_debug_id,
         }
 
         return json.dumps(json_idx)
 
+    @classmethod
+    def json_from_binary(cls, data: bytes) -> str:
+        """
+        Encodes a binary index as JSON, like `from_binary` followed by `to_json` would, but
+        without decoding the files into dicts first.
+        """
+        binary_index = binary_flat_file_index.BinaryFlatFileIndex(data)
+        bundles = [
+            BundleMeta(bundle_id, timestamp) for bundle_id, timestamp in binary_index.bundles()
+        ]
+        return "{%s}" % ",".join(
+            [
+                f'"is_complete":{json.dumps(binary_index.is_complete)}',
+                f'"bundles":{json.dumps(cls._bundles_to_json(bundles))}',
+                f'"files_by_url":{binary_index.urls.to_json()}',
+                f'"files_by_debug_id":{binary_index.debug_ids.to_json()}',
+            ]
+        )
+
+    def from_binary(self, data: bytes) -> None:
+        binary_index = binary_flat_file_index.BinaryFlatFileIndex(data)
+
+        self._is_complete = binary_index.is_complete
+        self._bundles = [
+            BundleMeta(bundle_id, timestamp) for bundle_id, timestamp in binary_index.bundles()
+        ]
+        self._files_by_url = dict(binary_index.urls.items())
+        self._files_by_debug_id = dict(binary_index.debug_ids.items())
+
+    def to_binary(self) -> bytes:
+        return binary_flat_file_index.encode(
+            self._is_complete,
+            [(bundle.id, bundle.timestamp) for bundle in self._bundles],
+            self._files_by_url,
+            self._files_by_debug_id,
+        )
+
     def enforce_size_limits(self) -> int:
         """
         This enforced reasonable limits on the data we put into the `FlatFileIndex` by removing
@@ -0,0 +1,433 @@
+"""
+A compact binary encoding of the flat file index of artifact bundles.
+
+The index maps urls and debug ids to the bundles containing them. Both maps are
+stored as a sorted string table, so a single entry can be found with a binary
+search directly on the encoded buffer (which may be an ``mmap``) without
+parsing the whole index::
+
+    header      magic, version, flags, number of bundles, urls and debug ids,
+                and the size of the bundles section
+    bundles     the ids of the bundles (i64), followed by ``n + 1`` offsets into
+                the timestamps (u32) and the ISO 8601 timestamps themselves
+    urls        sorted string table
+    debug ids   sorted string table
+
+A sorted string table with ``n`` keys consists of ``n + 1`` offsets into the
+key data (u32), ``n + 1`` offsets into the entries (u32), the UTF-8 encoded keys
+in byte order, and the entries themselves, which are indexes into the bundles
+(u16). All integers are little endian.
+
+New bundles can be merged into an encoded index with ``merge_bundle``, which
+copies the unchanged parts of the tables in bulk instead of decoding them, and
+tables can be encoded as JSON with ``SortedStringTable.to_json`` without building
+a dict first.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sentry.utils import json
+
+MAGIC = b"SFFI"
+VERSION = 1
+
+FLAG_IS_COMPLETE = 0x01
+
+# magic, version, flags, reserved, bundle count, url count, debug id count, bundles size
+HEADER = struct.Struct("<4sBBHIIII")
+BUNDLE_ID = struct.Struct("<q")
+OFFSET = struct.Struct("<I")
+ENTRY = struct.Struct("<H")
+
+MAX_BUNDLES = 0xFFFF
+
+TABLE_URLS = "urls"
+TABLE_DEBUG_IDS = "debug_ids"
+
+Bundle = Tuple[int, datetime]
+
+
+class InvalidBinaryIndex(Exception):
+    pass
+
+
+def _to_array(typecode: str, data: bytes | memoryview) -> array:
+    rv = array(typecode)
+    rv.frombytes(data)
+    if sys.byteorder != "little":
+        rv.byteswap()
+    return rv
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class SortedStringTable:
+    """
+    A read-only view of a sorted string table at `offset` of `buffer`.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int, count: int) -> None:
+        self.buffer = buffer
+        self.count = count
+        self.offset = offset
+        self._key_offsets = offset
+        self._entry_offsets = offset + OFFSET.size * (count + 1)
+        self._keys = offset + 2 * OFFSET.size * (count + 1)
+        self._keys_size = self._key_offset(count)
+        self._entries = self._keys + self._keys_size
+        self._entries_count = self._entry_offset(count)
+        self.end = self._entries + ENTRY.size * self._entries_count
+        if self.end > len(buffer):
+            raise InvalidBinaryIndex("Table exceeds the size of the index")
+
+    def _key_offset(self, idx: int) -> int:
+        return OFFSET.unpack_from(self.buffer, self._key_offsets + OFFSET.size * idx)[0]
+
+    def _entry_offset(self, idx: int) -> int:
+        return OFFSET.unpack_from(self.buffer, self._entry_offsets + OFFSET.size * idx)[0]
+
+    def key(self, idx: int) -> bytes:
+        start = self._keys + self._key_offset(idx)
+        end = self._keys + self._key_offset(idx + 1)
+        return bytes(self.buffer[start:end])
+
+    def entries(self, idx: int) -> List[int]:
+        start = self._entries + ENTRY.size * self._entry_offset(idx)
+        end = self._entries + ENTRY.size * self._entry_offset(idx + 1)
+        return list(_to_array("H", self.buffer[start:end]))
+
+    def bisect(self, key: bytes) -> int:
+        """
+        Returns the index at which `key` is or would be inserted.
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, key: str) -> Optional[List[int]]:
+        encoded = key.encode("utf-8")
+        idx = self.bisect(encoded)
+        if idx < self.count and self.key(idx) == encoded:
+            return self.entries(idx)
+        return None
+
+    def keys(self) -> List[str]:
+        key_offsets = self.key_offsets().tolist()
+        data = bytes(self.buffer[self._keys : self._entries])
+        if data.isascii():
+            # Byte offsets are character offsets, so all keys can be decoded at once.
+            text = data.decode("ascii")
+            return [text[start:end] for start, end in zip(key_offsets, key_offsets[1:])]
+        return [data[start:end].decode("utf-8") for start, end in zip(key_offsets, key_offsets[1:])]
+
+    def items(self) -> Iterator[Tuple[str, List[int]]]:
+        entry_offsets = self.entry_offsets().tolist()
+        entries = _to_array("H", self.buffer[self._entries : self.end]).tolist()
+        for key, start, end in zip(self.keys(), entry_offsets, entry_offsets[1:]):
+            yield key, entries[start:end]
+
+    def to_json(self) -> str:
+        """
+        Encodes the table as a JSON object of keys to their entries, in key order.
+        """
+        keys = self.keys()
+        if not keys:
+            return "{}"
+
+        if b'"' in bytes(self.buffer[self._keys : self._entries]):
+            encoded_keys = [json.dumps(key)[1:-1] for key in keys]
+        else:
+            # Escape all keys with a single call. Without quotes in the keys, the encoded array can
+            # be split into the encoded keys again.
+            encoded_keys = json.dumps(keys)[2:-2].split('","')
+        entries = _to_array("H", self.buffer[self._entries : self.end])
+        entry_names = [str(entry) for entry in range(max(entries, default=-1) + 1)]
+        encoded_entries = list(map(entry_names.__getitem__, entries))
+        entry_offsets = self.entry_offsets().tolist()
+        return "{%s}" % ",".join(
+            [
+                f'"{key}":[{",".join(encoded_entries[start:end])}]'
+                for key, start, end in zip(encoded_keys, entry_offsets, entry_offsets[1:])
+            ]
+        )
+
+    def key_offsets(self) -> array:
+        return _to_array("I", self.buffer[self._key_offsets : self._entry_offsets])
+
+    def entry_offsets(self) -> array:
+        return _to_array("I", self.buffer[self._entry_offsets : self._keys])
+
+    def key_data(self, start: int, end: int) -> memoryview:
+        return self.buffer[self._keys + start : self._keys + end]
+
+    def entry_data(self, start: int, end: int) -> memoryview:
+        return self.buffer[self._entries + ENTRY.size * start : self._entries + ENTRY.size * end]
+
+
+class BinaryFlatFileIndex:
+    """
+    A read-only view of an encoded flat file index. `buffer` can be any object supporting the
+    buffer protocol, like `bytes` or an `mmap.mmap`.
+    """
+
+    def __init__(self, buffer) -> None:
+        self.buffer = memoryview(buffer)
+        if len(self.buffer) < HEADER.size:
+            raise InvalidBinaryIndex("Index is too small")
+
+        (
+            magic,
+            version,
+            flags,
+            _reserved,
+            self.bundle_count,
+            url_count,
+            debug_id_count,
+            bundles_size,
+        ) = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or version != VERSION:
+            raise InvalidBinaryIndex("Unsupported index format")
+
+        self.is_complete = bool(flags & FLAG_IS_COMPLETE)
+        self._bundles_offset = HEADER.size
+        self._bundles_size = bundles_size
+        self.urls = SortedStringTable(self.buffer, HEADER.size + bundles_size, url_count)
+        self.debug_ids = SortedStringTable(self.buffer, self.urls.end, debug_id_count)
+
+    def table(self, name: str) -> SortedStringTable:
+        return self.urls if name == TABLE_URLS else self.debug_ids
+
+    def bundles_data(self) -> memoryview:
+        return self.buffer[self._bundles_offset : self._bundles_offset + self._bundles_size]
+
+    def bundle_id(self, idx: int) -> int:
+        return BUNDLE_ID.unpack_from(self.buffer, self._bundles_offset + BUNDLE_ID.size * idx)[0]
+
+    def bundles(self) -> List[Bundle]:
+        ids_end = self._bundles_offset + BUNDLE_ID.size * self.bundle_count
+        offsets_end = ids_end + OFFSET.size * (self.bundle_count + 1)
+        ids = _to_array("q", self.buffer[self._bundles_offset : ids_end])
+        offsets = _to_array("I", self.buffer[ids_end:offsets_end])
+        timestamps = bytes(self.buffer[offsets_end : self._bundles_offset + self._bundles_size])
+        return [
+            (
+                ids[idx],
+                datetime.fromisoformat(timestamps[offsets[idx] : offsets[idx + 1]].decode("ascii")),
+            )
+            for idx in range(self.bundle_count)
+        ]
+
+    def lookup_url(self, url: str) -> List[int]:
+        """
+        Returns the ids of the bundles containing `url`, newest last.
+        """
+        return self._lookup(self.urls, url)
+
+    def lookup_debug_id(self, debug_id: str) -> List[int]:
+        """
+        Returns the ids of the bundles containing `debug_id`, newest last.
+        """
+        return self._lookup(self.debug_ids, debug_id)
+
+    def _lookup(self, table: SortedStringTable, key: str) -> List[int]:
+        return [self.bundle_id(entry) for entry in table.get(key) or ()]
+
+
+def _encode_bundles(bundles: Sequence[Bundle]) -> bytes:
+    if len(bundles) > MAX_BUNDLES:
+        raise InvalidBinaryIndex("Too many bundles")
+    ids = array("q", [bundle_id for bundle_id, _ in bundles])
+    timestamps = [timestamp.isoformat().encode("ascii") for _, timestamp in bundles]
+    offsets = array("I", [0])
+    for timestamp in timestamps:
+        offsets.append(offsets[-1] + len(timestamp))
+    return b"".join([_to_bytes(ids), _to_bytes(offsets), *timestamps])
+
+
+def _encode_table(collection: Dict[str, List[int]]) -> bytes:
+    items = sorted((key.encode("utf-8"), entries) for key, entries in collection.items())
+    key_offsets = array("I", [0])
+    entry_offsets = array("I", [0])
+    entries = array("H")
+    for key, key_entries in items:
+        key_offsets.append(key_offsets[-1] + len(key))
+        entries.extend(key_entries)
+        entry_offsets.append(len(entries))
+
+    return b"".join(
+        [
+            _to_bytes(key_offsets),
+            _to_bytes(entry_offsets),
+            b"".join(key for key, _ in items),
+            _to_bytes(entries),
+        ]
+    )
+
+
+def _encode_header(
+    is_complete: bool, bundle_count: int, url_count: int, debug_id_count: int, bundles_size: int
+) -> bytes:
+    return HEADER.pack(
+        MAGIC,
+        VERSION,
+        FLAG_IS_COMPLETE if is_complete else 0,
+        0,
+        bundle_count,
+        url_count,
+        debug_id_count,
+        bundles_size,
+    )
+
+
+def encode(
+    is_complete: bool,
+    bundles: Sequence[Bundle],
+    files_by_url: Dict[str, List[int]],
+    files_by_debug_id: Dict[str, List[int]],
+) -> bytes:
+    encoded_bundles = _encode_bundles(bundles)
+    return b"".join(
+        [
+            _encode_header(
+                is_complete,
+                len(bundles),
+                len(files_by_url),
+                len(files_by_debug_id),
+                len(encoded_bundles),
+            ),
+            encoded_bundles,
+            _encode_table(files_by_url),
+            _encode_table(files_by_debug_id),
+        ]
+    )
+
+
+def _merge_table(
+    table: SortedStringTable,
+    keys: Iterable[str],
+    merge_entries: "MergeEntries",
+) -> Tuple[int, bytes]:
+    """
+    Merges `keys` into `table`, returning the new number of keys and the encoded table. Runs of
+    keys between the merged keys are copied as they are, only their offsets are shifted.
+    """
+    delta = sorted({key.encode("utf-8") for key in keys})
+    old_key_offsets = table.key_offsets()
+    old_entry_offsets = table.entry_offsets()
+
+    key_offsets = array("I", [0])
+    entry_offsets = array("I", [0])
+    key_parts: List[bytes | memoryview] = []
+    entry_parts: List[bytes | memoryview] = []
+
+    def copy_run(start: int, end: int) -> None:
+        if start >= end:
+            return
+        key_shift = key_offsets[-1] - old_key_offsets[start]
+        entry_shift = entry_offsets[-1] - old_entry_offsets[start]
+        key_offsets.extend(o + key_shift for o in old_key_offsets[start + 1 : end + 1])
+        entry_offsets.extend(o + entry_shift for o in old_entry_offsets[start + 1 : end + 1])
+        key_parts.append(table.key_data(old_key_offsets[start], old_key_offsets[end]))
+        entry_parts.append(table.entry_data(old_entry_offsets[start], old_entry_offsets[end]))
+
+    def append(key: bytes, entries: List[int]) -> None:
+        key_offsets.append(key_offsets[-1] + len(key))
+        entry_offsets.append(entry_offsets[-1] + len(entries))
+        key_parts.append(key)
+        entry_parts.append(_to_bytes(array("H", entries)))
+
+    position = 0
+    for key in delta:
+        idx = table.bisect(key)
+        copy_run(position, idx)
+        if idx < table.count and table.key(idx) == key:
+            append(key, merge_entries(table.entries(idx)))
+            position = idx + 1
+        else:
+            append(key, merge_entries([]))
+            position = idx
+    copy_run(position, table.count)
+
+    encoded = b"".join([_to_bytes(key_offsets), _to_bytes(entry_offsets), *key_parts, *entry_parts])
+    return len(key_offsets) - 1, encoded
+
+
+class MergeEntries:
+    """
+    Adds a bundle to the entries of a key, the same way as `FlatFileIndex._add_sorted_entry`.
+    """
+
+    def __init__(self, bundles: Sequence[Bundle], bundle_index: int, max_entries: int) -> None:
+        self.bundles = bundles
+        self.bundle_index = bundle_index
+        self.max_entries = max_entries
+
+    def __call__(self, entries: List[int]) -> List[int]:
+        entries_set = set(entries[-self.max_entries :])
+        entries_set.add(self.bundle_index)
+        return sorted(entries_set, key=lambda idx: (self.bundles[idx][1], self.bundles[idx][0]))
+
+
+def merge_bundle(
+    buffer,
+    bundle: Bundle,
+    table_name: str,
+    keys: Iterable[str],
+    *,
+    max_entries: int,
+    incomplete_above: int,
+) -> Optional[bytes]:
+    """
+    Adds a new bundle containing `keys` to the `table_name` table of an encoded index, without
+    decoding the rest of the index.
+
+    Returns `None` if the bundle is already part of the index, in which case the index has to be
+    decoded and updated as a whole.
+    """
+    index = BinaryFlatFileIndex(buffer)
+    bundles = index.bundles()
+    if any(bundle_id == bundle[0] for bundle_id, _ in bundles):
+        return None
+
+    is_complete = index.is_complete and len(bundles) <= incomplete_above
+    bundles.append(bundle)
+    encoded_bundles = _encode_bundles(bundles)
+    merge_entries = MergeEntries(bundles, len(bundles) - 1, max_entries)
+
+    urls: bytes | memoryview
+    debug_ids: bytes | memoryview
+    if table_name == TABLE_URLS:
+        url_count, urls = _merge_table(index.urls, keys, merge_entries)
+        debug_id_count = index.debug_ids.count
+        debug_ids = index.buffer[index.debug_ids.offset : index.debug_ids.end]
+    else:
+        url_count = index.urls.count
+        urls = index.buffer[index.urls.offset : index.urls.end]
+        debug_id_count, debug_ids = _merge_table(index.debug_ids, keys, merge_entries)
+
+    return b"".join(
+        [
+            _encode_header(
+                is_complete, len(bundles), url_count, debug_id_count, len(encoded_bundles)
+            ),
+            encoded_bundles,
+            urls,
+            debug_ids,
+        ]
+    )
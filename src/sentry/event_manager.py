@@ -120,6 +120,7 @@ from sentry.tasks.integrations import kick_off_status_syncs
 from sentry.tasks.process_buffer import buffer_incr
 from sentry.tasks.relay import schedule_invalidate_project_config
 from sentry.tsdb.base import TSDBModel
+from sentry.tsdb.coalescing import coalescing_writer
 from sentry.types.activity import ActivityType
 from sentry.types.group import GroupSubStatus
 from sentry.utils import json, metrics
@@ -1292,6 +1293,11 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
     # XXX: validate whether anybody actually uses those metrics
 
+    if options.get("tsdb.coalescing-writer.enabled"):
+        writer = coalescing_writer
+    else:
+        writer = tsdb.backend
+
     for job in jobs:
         incrs = []
         frequencies = []
@@ -1331,12 +1337,10 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
             records.append((TSDBModel.users_affected_by_project, project_id, (user.tag_value,)))
 
         if incrs:
-            tsdb.backend.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
+            writer.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
 
         if records:
-            tsdb.backend.record_multi(
-                records, timestamp=event.datetime, environment_id=environment.id
-            )
+            writer.record_multi(records, timestamp=event.datetime, environment_id=environment.id)
 
         if frequencies:
             tsdb.backend.record_frequency_multi(frequencies, timestamp=event.datetime)
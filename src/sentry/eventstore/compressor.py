@@ -1,16 +1,17 @@
 """
 Eventstore compressor is responsible for pulling out repeating data across
 events such that they can be stored only once. For example SDK modules list, or
-debug_meta.
+debug_meta. Use ``Deduplicator`` to deduplicate across a batch of events.
 
 This is not used in production yet, we are still collecting metrics there.
 """
 from __future__ import annotations
 
 import hashlib
+from collections import Counter
 from typing import Any
 
-from sentry.utils import json
+from sentry.utils import json, metrics
 
 _INTERFACES = {}
 
@@ -53,24 +54,97 @@ class DebugMeta:
         return data
 
 
-def deduplicate(data):
-    patchsets = []
-    extra_keys = {}
+@_deduplicate_interface("modules", "sdk")
+class WholeInterface:
+    """
+    Interfaces which are usually identical across events of the same release
+    and are deduplicated as a whole.
+    """
 
-    for key, interface in _INTERFACES.items():
-        if key not in data:
-            continue
+    @staticmethod
+    def encode(data):
+        return data, None
 
-        to_deduplicate, to_inline = interface.encode(data.pop(key))
-        to_deduplicate_serialized = json.dumps(to_deduplicate).encode()
-        checksum = hashlib.md5(to_deduplicate_serialized).hexdigest()
-        extra_keys[checksum] = to_deduplicate
-        patchsets.append([key, checksum, to_inline])
+    @staticmethod
+    def decode(dedup, data):
+        return dedup
 
-    if patchsets:
-        data["__nodestore_patchsets"] = patchsets
 
-    return data, extra_keys
+@_deduplicate_interface("contexts")
+class Contexts:
+    """
+    Only contexts that describe the environment an event was captured in are
+    deduplicated, contexts like ``trace`` or ``device`` differ between events.
+    """
+
+    _DEDUP_CONTEXTS = ("runtime", "os", "browser", "app")
+
+    @staticmethod
+    def encode(data):
+        dedup = {}
+
+        if data:
+            for name in Contexts._DEDUP_CONTEXTS:
+                if name in data:
+                    dedup[name] = data.pop(name)
+
+        return dedup, data
+
+    @staticmethod
+    def decode(dedup, data):
+        if dedup:
+            data = data if data is not None else {}
+            data.update(dedup)
+
+        return data
+
+
+class Deduplicator:
+    """
+    Content-addressed deduplication of interfaces across many events.
+
+    Every deduplicated sub-document is keyed by the checksum of its contents,
+    so sub-documents repeated across the events passed to ``deduplicate`` are
+    only returned (and stored) once. ``refcounts`` holds the number of events
+    referencing each sub-document, and every lookup is counted as a hit or miss
+    per interface in metrics.
+    """
+
+    def __init__(self):
+        self.documents: dict[str, Any] = {}
+        self.refcounts: Counter[str] = Counter()
+
+    def deduplicate(self, data):
+        patchsets = []
+
+        for key, interface in _INTERFACES.items():
+            if key not in data:
+                continue
+
+            to_deduplicate, to_inline = interface.encode(data.pop(key))
+            to_deduplicate_serialized = json.dumps(to_deduplicate).encode()
+            checksum = hashlib.md5(to_deduplicate_serialized).hexdigest()
+
+            hit = checksum in self.documents
+            self.documents.setdefault(checksum, to_deduplicate)
+            self.refcounts[checksum] += 1
+            metrics.incr(
+                "eventstore.compressor.deduplicate",
+                tags={"interface": key, "result": "hit" if hit else "miss"},
+            )
+
+            patchsets.append([key, checksum, to_inline])
+
+        if patchsets:
+            data["__nodestore_patchsets"] = patchsets
+
+        return data
+
+
+def deduplicate(data):
+    deduplicator = Deduplicator()
+    data = deduplicator.deduplicate(data)
+    return data, deduplicator.documents
 
 
 def assemble(data, get_extra_keys):
@@ -1,20 +1,72 @@
-from sentry.utils.codecs import JSONCodec
+from sentry.utils import metrics
+from sentry.utils.codecs import Base64Codec, BytesCodec, Codec, JSONCodec, ZstdCodec
 from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
 from sentry.utils.kvstore.redis import RedisKVStorage
 from sentry.utils.redis import redis_clusters
 
-from .base import EventProcessingStore
+from .base import Event, EventProcessingStore
+
+# Marks values written in the compressed format. It can never start a JSON
+# document, so both formats can be told apart when reading. The version allows
+# changing the compressed format later on.
+ZSTD_PREFIX = "zstd1:"
+
+CODECS = ("json", "zstd")
+
+
+class EventCodec(Codec[Event, str]):
+    """
+    Encodes events as plain JSON or, if `compress` is set, as zstd compressed
+    JSON. The cluster client decodes responses as text, so the compressed
+    payload is stored base64 encoded.
+
+    Values in either format are decoded, so the format can be switched at any
+    time while events are in flight. Records the size of the encoded events
+    and the time spent encoding and decoding them.
+    """
+
+    def __init__(self, compress: bool = False) -> None:
+        self.compress = compress
+        self.json_codec = JSONCodec()
+        self.zstd_codec = JSONCodec() | BytesCodec() | ZstdCodec() | Base64Codec()
+
+    def encode(self, value: Event) -> str:
+        tags = {"compressed": self.compress}
+        with metrics.timer("eventstore.processing.encode", tags=tags):
+            if self.compress:
+                encoded = ZSTD_PREFIX + self.zstd_codec.encode(value)
+            else:
+                encoded = self.json_codec.encode(value)
+        metrics.distribution(
+            "eventstore.processing.encoded_size", len(encoded), tags=tags, unit="byte"
+        )
+        return encoded
+
+    def decode(self, value: str) -> Event:
+        compressed = value.startswith(ZSTD_PREFIX)
+        with metrics.timer("eventstore.processing.decode", tags={"compressed": compressed}):
+            if compressed:
+                return self.zstd_codec.decode(value[len(ZSTD_PREFIX) :])
+            return self.json_codec.decode(value)
 
 
 class RedisClusterEventProcessingStore(EventProcessingStore):
     """
     Creates an instance of the processing store which uses a Redis Cluster
     client as its backend.
+
+    The ``codec`` option selects the format events are written in, either
+    ``json`` (the default) or ``zstd``.
     """
 
     def __init__(self, **options):
+        codec = options.pop("codec", "json")
+        if codec not in CODECS:
+            raise ValueError(f"Unknown event processing store codec: {codec!r}")
+
         super().__init__(
             KVStorageCodecWrapper(
-                RedisKVStorage(redis_clusters.get(options.pop("cluster", "default"))), JSONCodec()
+                RedisKVStorage(redis_clusters.get(options.pop("cluster", "default"))),
+                EventCodec(compress=codec == "zstd"),
             )
         )
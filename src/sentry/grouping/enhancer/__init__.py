@@ -3,18 +3,20 @@ from __future__ import annotations
 import base64
 import logging
 import os
+import threading
 import zlib
 from hashlib import md5
-from typing import Any, Sequence
+from typing import Any, Iterator, Sequence
 
 import msgpack
 import sentry_sdk
+from cachetools import TTLCache
 from django.core.cache import cache
 from parsimonious.exceptions import ParseError
 from parsimonious.grammar import Grammar
 from parsimonious.nodes import NodeVisitor
 
-from sentry import projectoptions
+from sentry import options, projectoptions
 from sentry.grouping.component import GroupingComponent
 from sentry.stacktraces.functions import set_in_app
 from sentry.utils import metrics
@@ -23,6 +25,7 @@ from sentry.utils.safe import get_path, set_path
 from sentry.utils.strings import unescape_string
 
 from .actions import Action, FlagAction, VarAction
+from .compiled import CompiledRules
 from .exceptions import InvalidEnhancerConfig
 from .matchers import (
     CalleeMatch,
@@ -136,6 +139,43 @@ class Enhancements:
             if updater_rule := rule._as_updater_rule():
                 self._updater_rules.append(updater_rule)
 
+        self._compiled_modifier_rules: CompiledRules | None = None
+        self._compiled_updater_rules: CompiledRules | None = None
+
+    def _iter_modifier_rule_actions(
+        self,
+        match_frames: Sequence[dict[str, Any]],
+        platform: str,
+        exception_data: dict[str, Any],
+        in_memory_cache: dict[str, str],
+    ) -> Iterator[tuple[Rule, list[tuple[int, Action]]]]:
+        if options.get("grouping.enhancer.use-compiled-rules"):
+            if self._compiled_modifier_rules is None:
+                self._compiled_modifier_rules = CompiledRules(self._modifier_rules)
+            return self._compiled_modifier_rules.iter_matching_frame_actions(
+                match_frames, platform, exception_data, in_memory_cache
+            )
+        return _iter_rule_actions(
+            self._modifier_rules, match_frames, platform, exception_data, in_memory_cache
+        )
+
+    def _iter_updater_rule_actions(
+        self,
+        match_frames: Sequence[dict[str, Any]],
+        platform: str,
+        exception_data: dict[str, Any],
+        in_memory_cache: dict[str, str],
+    ) -> Iterator[tuple[Rule, list[tuple[int, Action]]]]:
+        if options.get("grouping.enhancer.use-compiled-rules"):
+            if self._compiled_updater_rules is None:
+                self._compiled_updater_rules = CompiledRules(self._updater_rules)
+            return self._compiled_updater_rules.iter_matching_frame_actions(
+                match_frames, platform, exception_data, in_memory_cache
+            )
+        return _iter_rule_actions(
+            self._updater_rules, match_frames, platform, exception_data, in_memory_cache
+        )
+
     def apply_modifications_to_frame(
         self,
         frames: Sequence[dict[str, Any]],
@@ -163,10 +203,10 @@ class Enhancements:
                 return
 
         with sentry_sdk.start_span(op="stacktrace_processing", description="apply_rules_to_frames"):
-            for rule in self._modifier_rules:
-                for idx, action in rule.get_matching_frame_actions(
-                    match_frames, platform, exception_data, in_memory_cache
-                ):
+            for rule, matching_actions in self._iter_modifier_rule_actions(
+                match_frames, platform, exception_data, in_memory_cache
+            ):
+                for idx, action in matching_actions:
                     # Both frames and match_frames are updated
                     action.apply_modifications_to_frame(frames, match_frames, idx, rule=rule)
 
@@ -180,11 +220,10 @@ class Enhancements:
 
         stacktrace_state = StacktraceState()
         # Apply direct frame actions and update the stack state alongside
-        for rule in self._updater_rules:
-
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, in_memory_cache
-            ):
+        for rule, matching_actions in self._iter_updater_rule_actions(
+            match_frames, platform, exception_data, in_memory_cache
+        ):
+            for idx, action in matching_actions:
                 action.update_frame_components_contributions(components, frames, idx, rule=rule)
                 action.modify_stacktrace_state(stacktrace_state, rule)
 
@@ -402,6 +441,23 @@ class Rule:
         )
 
 
+def _iter_rule_actions(
+    rules: Sequence[Rule],
+    match_frames: Sequence[dict[str, Any]],
+    platform: str,
+    exception_data: dict[str, Any],
+    in_memory_cache: dict[str, str],
+) -> Iterator[tuple[Rule, list[tuple[int, Action]]]]:
+    """Interprets every rule in turn. See ``CompiledRules`` for the indexed
+    equivalent."""
+    for rule in rules:
+        matching_actions = rule.get_matching_frame_actions(
+            match_frames, platform, exception_data, in_memory_cache
+        )
+        if matching_actions:
+            yield rule, matching_actions
+
+
 class EnhancementsVisitor(NodeVisitor):
     visit_comment = visit_empty = lambda *a: None
     unwrapped_exceptions = (InvalidEnhancerConfig,)
@@ -496,6 +552,70 @@ class EnhancementsVisitor(NodeVisitor):
         return node.match.groups()[0].lstrip("!")
 
 
+class LocalFrameValuesCache:
+    """A process-local, size- and TTL-bounded LRU in front of the Django cache
+    for the frame values stored by ``_cache_changed_frame_values``.
+
+    Hot stacktraces are seen many times per minute by the same ingest worker,
+    this tier saves both the round-trip to the remote cache and decoding the
+    cached payload.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cache: TTLCache[str, list[dict[str, Any]]] | None = None
+
+    def _get_cache(self) -> TTLCache[str, list[dict[str, Any]]] | None:
+        if not options.get("grouping.enhancer.local-frame-cache.enabled"):
+            self._cache = None
+            return None
+
+        maxsize = options.get("grouping.enhancer.local-frame-cache.size")
+        ttl = options.get("grouping.enhancer.local-frame-cache.ttl")
+        if self._cache is None or self._cache.maxsize != maxsize or self._cache.ttl != ttl:
+            self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        return self._cache
+
+    def get(self, cache_key: str, platform: str) -> list[dict[str, Any]] | None:
+        with self._lock:
+            local_cache = self._get_cache()
+            if local_cache is None:
+                return None
+            rv = local_cache.get(cache_key)
+
+        metrics.incr(
+            f"{DATADOG_KEY}.local_cache.get",
+            tags={"success": rv is not None, "platform": platform},
+        )
+        return rv
+
+    def set(self, cache_key: str, changed_frames_values: list[dict[str, Any]]) -> None:
+        with self._lock:
+            local_cache = self._get_cache()
+            if local_cache is not None:
+                local_cache[cache_key] = changed_frames_values
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache = None
+
+
+local_frame_values_cache = LocalFrameValuesCache()
+
+
+def _get_cached_frame_values(cache_key: str, platform: str) -> list[dict[str, Any]] | None:
+    """Looks up the changed frame values in the local tier first and falls back
+    to the Django cache, populating the local tier on a remote hit."""
+    changed_frames_values = local_frame_values_cache.get(cache_key, platform)
+    if changed_frames_values is not None:
+        return changed_frames_values
+
+    changed_frames_values = cache.get(cache_key)
+    if changed_frames_values:
+        local_frame_values_cache.set(cache_key, changed_frames_values)
+    return changed_frames_values
+
+
 def _update_frames_from_cached_values(
     frames: Sequence[dict[str, Any]], cache_key: str, platform: str
 ) -> bool:
@@ -504,7 +624,9 @@ def _update_frames_from_cached_values(
     Returns True if the merged has correctly happened.
     """
     frames_changed = False
-    changed_frames_values = cache.get(cache_key, {})
+    changed_frames_values: list[dict[str, Any]] = (
+        _get_cached_frame_values(cache_key, platform) or []
+    )
 
     # This helps tracking changes in the hit/miss ratio of the cache
     metrics.incr(
@@ -545,7 +667,7 @@ def _cache_changed_frame_values(
     """Store in the cache the values which have been modified for each frame."""
     caching_succeeded = False
     # Check that some other event has not already populated the cache
-    if cache.get(cache_key):
+    if _get_cached_frame_values(cache_key, platform):
         return
 
     try:
@@ -559,6 +681,7 @@ def _cache_changed_frame_values(
             for frame in frames
         ]
         cache.set(cache_key, changed_frames_values)
+        local_frame_values_cache.set(cache_key, changed_frames_values)
         caching_succeeded = True
     except Exception:
         logger.exception("Failed to store changed frames in cache", extra={"platform": platform})
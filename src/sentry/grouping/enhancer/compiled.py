@@ -0,0 +1,347 @@
+"""
+A compiled evaluation engine for enhancement rules.
+
+The interpreter in ``Rule.get_matching_frame_actions`` tests every matcher of
+every rule against every frame.  Large custom configs on top of the built-in
+bases make this O(rules * frames * matchers) per stacktrace.
+
+``CompiledRules`` instead indexes all frame matchers of a rule list by the
+frame field they look at.  For each stacktrace, every field is evaluated in a
+single pass over the distinct values of that field: exact patterns are
+resolved with a dict lookup and glob patterns are narrowed down with a prefix
+trie (and a literal suffix check) before running ``glob_match``.  The result
+is a bitmask of matching frames per matcher, so evaluating a rule is just a
+handful of integer ``&`` operations.
+
+Matchers on fields that are modified by actions (``app`` and ``category``) are
+not indexed and are evaluated whenever a rule needs them, which keeps the
+semantics of rules observing the effects of earlier rules.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, MutableMapping, Sequence, Set, Tuple
+
+from sentry.utils.functional import cached
+from sentry.utils.glob import glob_match
+
+from .actions import Action
+from .matchers import (
+    CalleeMatch,
+    CallerMatch,
+    ExceptionFieldMatch,
+    FamilyMatch,
+    FrameFieldMatch,
+    FrameMatch,
+    Match,
+    PathLikeMatch,
+    path_like_match,
+)
+
+# Characters which make a pattern a glob rather than a literal string.  This
+# is deliberately broader than what ``glob_match`` interprets so we never
+# take the literal fast path for something that is not a literal.
+GLOB_CHARS = frozenset(b"*?[]{}!\\")
+
+# Frame fields which are never changed by actions and can therefore be
+# evaluated once per stacktrace.
+INDEXED_FIELDS = ("family", "function", "module", "package", "path")
+
+
+def _split_pattern(pattern: bytes) -> Tuple[bytes, bytes, bool]:
+    """Returns the literal prefix and suffix of a glob pattern and whether the
+    pattern is a literal altogether."""
+    positions = [i for i, byte in enumerate(pattern) if byte in GLOB_CHARS]
+    if not positions:
+        return pattern, pattern, True
+    return pattern[: positions[0]], pattern[positions[-1] + 1 :], False
+
+
+class PrefixTrie:
+    """A minimal byte trie which yields all items whose prefix is a prefix of
+    a given value."""
+
+    __slots__ = ("children", "items")
+
+    def __init__(self) -> None:
+        self.children: Dict[int, PrefixTrie] = {}
+        self.items: List[Any] = []
+
+    def insert(self, prefix: bytes, item: Any) -> None:
+        node = self
+        for byte in prefix:
+            child = node.children.get(byte)
+            if child is None:
+                child = node.children[byte] = PrefixTrie()
+            node = child
+        node.items.append(item)
+
+    def iter_candidates(self, value: bytes) -> Iterator[Any]:
+        node = self
+        yield from node.items
+        for byte in value:
+            child = node.children.get(byte)
+            if child is None:
+                return
+            node = child
+            yield from node.items
+
+
+class FieldTest:
+    """A positive (non-negated) test of one pattern against one frame field.
+
+    Negated matchers share the test of their positive counterpart.
+    """
+
+    __slots__ = ("pattern", "suffix", "path_like")
+
+    def __init__(self, pattern: bytes, suffix: bytes, path_like: bool) -> None:
+        self.pattern = pattern
+        self.suffix = suffix
+        self.path_like = path_like
+
+    def matches(self, value: bytes, cache: MutableMapping[Any, Any]) -> bool:
+        if self.path_like:
+            # ``path_like_match`` also tries matching with a leading slash
+            if not value.endswith(self.suffix) and not (b"/" + value).endswith(self.suffix):
+                return False
+            return cached(cache, path_like_match, self.pattern, value)
+        if value == self.pattern:
+            return True
+        if not value.endswith(self.suffix):
+            return False
+        return cached(cache, glob_match, value, self.pattern)
+
+
+class FieldIndex:
+    """All tests against a single frame field."""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.path_like = False
+        self.tests: Dict[Tuple[bytes, ...], FieldTest] = {}
+        # Tests which match regardless of the value (``family:all``)
+        self.always: List[Tuple[bytes, ...]] = []
+        self.literals: Dict[bytes, List[Tuple[bytes, ...]]] = {}
+        self.globs = PrefixTrie()
+
+    def add(self, matcher: FrameMatch) -> Tuple[bytes, ...]:
+        pattern = matcher._encoded_pattern
+        if isinstance(matcher, FamilyMatch):
+            key = tuple(sorted(matcher._flags))
+        else:
+            key = (pattern,)
+        if key in self.tests:
+            return key
+
+        if isinstance(matcher, FamilyMatch):
+            self.tests[key] = FieldTest(pattern, b"", False)
+            if b"all" in matcher._flags:
+                self.always.append(key)
+            else:
+                for flag in matcher._flags:
+                    self.literals.setdefault(flag, []).append(key)
+            return key
+
+        self.path_like = isinstance(matcher, PathLikeMatch)
+        prefix, suffix, is_literal = _split_pattern(pattern)
+        self.tests[key] = FieldTest(pattern, suffix, self.path_like)
+        if is_literal:
+            self.literals.setdefault(pattern, []).append(key)
+        else:
+            self.globs.insert(prefix, key)
+        return key
+
+    def evaluate(
+        self, values: Sequence[bytes | None], full_mask: int, cache: MutableMapping[Any, Any]
+    ) -> Dict[Tuple[bytes, ...], int]:
+        """Returns a bitmask of matching frame indices for every test with at
+        least one match."""
+        positions: Dict[bytes, int] = {}
+        for idx, value in enumerate(values):
+            if value is not None:
+                positions[value] = positions.get(value, 0) | (1 << idx)
+
+        rv: Dict[Tuple[bytes, ...], int] = {}
+        for key in self.always:
+            rv[key] = full_mask
+
+        for value, mask in positions.items():
+            for key in self._iter_matching_tests(value, cache):
+                rv[key] = rv.get(key, 0) | mask
+
+        return rv
+
+    def _iter_matching_tests(
+        self, value: bytes, cache: MutableMapping[Any, Any]
+    ) -> Iterator[Tuple[bytes, ...]]:
+        if self.path_like and b"\\" in value:
+            # Path normalization happens inside of ``glob_match``, fall back
+            # to testing every pattern.
+            for key, test in self.tests.items():
+                if cached(cache, path_like_match, test.pattern, value):
+                    yield key
+            return
+
+        values = [value]
+        if self.path_like and not value.startswith(b"/"):
+            # ``path_like_match`` also tries matching with a leading slash
+            values.append(b"/" + value)
+
+        seen: Set[Tuple[bytes, ...]] = set()
+        for candidate in values:
+            for key in self.literals.get(candidate, ()):
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+        for candidate in values:
+            for key in self.globs.iter_candidates(candidate):
+                if key not in seen:
+                    seen.add(key)
+                    if self.tests[key].matches(value, cache):
+                        yield key
+
+
+class CompiledRules:
+    """Evaluates a list of rules against stacktraces, yielding the same
+    actions in the same order as calling ``Rule.get_matching_frame_actions``
+    for every rule in turn."""
+
+    def __init__(self, rules: Sequence[Any]) -> None:
+        self.rules = rules
+        self.indexes: Dict[str, FieldIndex] = {}
+        self._test_keys: Dict[FrameMatch, Tuple[str, Tuple[bytes, ...]]] = {}
+        self._rule_matchers: List[Tuple[Match, ...]] = []
+
+        for rule in rules:
+            matchers = list(rule._other_matchers)
+            for matcher in matchers:
+                self._compile_matcher(matcher)
+            # Evaluate indexed matchers first, they are cheapest to check and
+            # most likely to rule out a match.
+            matchers.sort(key=lambda m: not self._is_indexed(m))
+            self._rule_matchers.append(tuple(matchers))
+
+    def _is_indexed(self, matcher: Match) -> bool:
+        return matcher in self._test_keys
+
+    def _compile_matcher(self, matcher: Match) -> None:
+        if isinstance(matcher, (CallerMatch, CalleeMatch)):
+            self._compile_matcher(matcher.caller)
+            return
+        if isinstance(matcher, FamilyMatch):
+            field = "family"
+        elif isinstance(matcher, (FrameFieldMatch, PathLikeMatch)):
+            field = matcher.field
+        else:
+            return
+        if field in INDEXED_FIELDS:
+            index = self.indexes.get(field)
+            if index is None:
+                index = self.indexes[field] = FieldIndex(field)
+            self._test_keys[matcher] = (field, index.add(matcher))
+
+    def iter_matching_frame_actions(
+        self,
+        match_frames: Sequence[dict[str, Any]],
+        platform: str,
+        exception_data: dict[str, Any],
+        in_memory_cache: dict[str, str],
+    ) -> Iterator[Tuple[Any, List[Tuple[int, Action]]]]:
+        """Yields every rule along with its matching frame actions.
+
+        Rules are evaluated lazily, so actions applied to ``match_frames``
+        by the caller before advancing the iterator are visible to the
+        following rules.
+        """
+        state = _MatchState(self, match_frames, platform, exception_data, in_memory_cache)
+        for rule, matchers in zip(self.rules, self._rule_matchers):
+            rv = state.get_matching_frame_actions(rule, matchers)
+            if rv:
+                yield rule, rv
+
+
+class _MatchState:
+    """Per-stacktrace evaluation state of ``CompiledRules``."""
+
+    def __init__(
+        self,
+        compiled: CompiledRules,
+        match_frames: Sequence[dict[str, Any]],
+        platform: str,
+        exception_data: dict[str, Any],
+        in_memory_cache: dict[str, str],
+    ) -> None:
+        self.compiled = compiled
+        self.match_frames = match_frames
+        self.platform = platform
+        self.exception_data = exception_data
+        self.cache = in_memory_cache
+        self.full_mask = (1 << len(match_frames)) - 1
+        self.field_masks: Dict[str, Dict[Tuple[bytes, ...], int]] = {}
+        self.exception_results: Dict[Match, bool] = {}
+
+    def get_matching_frame_actions(
+        self, rule: Any, matchers: Tuple[Match, ...]
+    ) -> List[Tuple[int, Action]]:
+        if not rule.matchers:
+            return []
+
+        for m in rule._exception_matchers:
+            if not self._exception_matches(m):
+                return []
+
+        mask = self.full_mask
+        for m in matchers:
+            mask &= self._get_mask(m)
+            if not mask:
+                return []
+
+        rv = []
+        idx = 0
+        while mask:
+            if mask & 1:
+                for action in rule.actions:
+                    rv.append((idx, action))
+            mask >>= 1
+            idx += 1
+        return rv
+
+    def _exception_matches(self, matcher: Match) -> bool:
+        rv = self.exception_results.get(matcher)
+        if rv is None:
+            rv = self.exception_results[matcher] = matcher.matches_frame(
+                self.match_frames, None, self.platform, self.exception_data, self.cache
+            )
+        return rv
+
+    def _get_mask(self, matcher: Match) -> int:
+        if isinstance(matcher, CallerMatch):
+            return (self._get_mask(matcher.caller) << 1) & self.full_mask
+        if isinstance(matcher, CalleeMatch):
+            return self._get_mask(matcher.caller) >> 1
+        if isinstance(matcher, ExceptionFieldMatch):
+            return self.full_mask if self._exception_matches(matcher) else 0
+
+        test_key = self.compiled._test_keys.get(matcher)
+        if test_key is None:
+            # Fields which can be changed by actions are evaluated on demand
+            mask = 0
+            for idx in range(len(self.match_frames)):
+                if matcher.matches_frame(
+                    self.match_frames, idx, self.platform, self.exception_data, self.cache
+                ):
+                    mask |= 1 << idx
+            return mask
+
+        field, key = test_key
+        masks = self.field_masks.get(field)
+        if masks is None:
+            masks = self.field_masks[field] = self.compiled.indexes[field].evaluate(
+                [frame[field] for frame in self.match_frames], self.full_mask, self.cache
+            )
+        mask = masks.get(key, 0)
+        if matcher.negated:
+            mask = ~mask & self.full_mask
+        return mask
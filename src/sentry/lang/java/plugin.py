@@ -1,7 +1,9 @@
+from contextlib import ExitStack
+
 import sentry_sdk
-from symbolic.proguard import ProguardMapper
 
 from sentry.lang.java.processing import deobfuscate_exception_value
+from sentry.lang.java.proguard import proguard_mapper_cache
 from sentry.lang.java.utils import (
     deobfuscate_view_hierarchy,
     get_jvm_images,
@@ -23,6 +25,10 @@ class JavaStacktraceProcessor(StacktraceProcessor):
 
         self.images = get_proguard_images(self.data)
         self.available = len(self.images) > 0
+        self._mappers = ExitStack()
+
+    def close(self):
+        self._mappers.close()
 
     def handles_frame(self, frame, stacktrace_info):
         platform = frame.get("platform") or self.data.get("platform")
@@ -46,7 +52,9 @@ class JavaStacktraceProcessor(StacktraceProcessor):
                 error_type = EventError.PROGUARD_MISSING_MAPPING
             else:
                 with sentry_sdk.start_span(op="proguard.open"):
-                    view = ProguardMapper.open(dif_path)
+                    view = self._mappers.enter_context(
+                        proguard_mapper_cache.open(debug_id, dif_path)
+                    )
                     if not view.has_line_info:
                         error_type = EventError.PROGUARD_MISSING_LINENO
                     else:
@@ -145,6 +153,7 @@ class JavaSourceLookupStacktraceProcessor(StacktraceProcessor):
     def close(self):
         for archive in self._archives:
             archive.close()
+        self.proguard_processor.close()
 
     def handles_frame(self, frame, stacktrace_info):
         self._proguard_processor_handles_frame = self.proguard_processor.handles_frame(
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Generator, Tuple
+
+from symbolic.proguard import ProguardMapper
+
+from sentry import options
+from sentry.utils import metrics
+
+
+@dataclass
+class _CachedMapper:
+    mapper: ProguardMapper
+    size: int
+    refcount: int = 0
+
+
+def _open_mapper(path: str) -> ProguardMapper:
+    with metrics.timer("proguard.mapper_cache.open"):
+        return ProguardMapper.open(path)
+
+
+class ProguardMapperCache:
+    """
+    A process-wide LRU of opened ProGuard mappers, keyed by debug id and path.
+
+    Mapping files are large and the same few releases of an app account for
+    most events and profiles, so opening them once per process instead of once
+    per event saves a lot of work. The total size of the cached mapping files
+    is limited by the ``proguard.mapper-cache.max-bytes`` option, ``0``
+    disables the cache. Mappers which are in use are never evicted, the cache
+    may exceed its size until they are released.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Tuple[str, str], _CachedMapper] = OrderedDict()
+        self._size = 0
+
+    @contextmanager
+    def open(self, debug_id: str, path: str) -> Generator[ProguardMapper, None, None]:
+        """
+        Opens the mapping file at `path`, which was fetched for `debug_id`, or
+        returns the mapper opened for it before.
+        """
+        max_size = options.get("proguard.mapper-cache.max-bytes")
+        if max_size <= 0:
+            yield _open_mapper(path)
+            return
+
+        entry = self._acquire((debug_id, path), max_size)
+        try:
+            yield entry.mapper
+        finally:
+            with self._lock:
+                entry.refcount -= 1
+                self._evict(max_size)
+
+    def _acquire(self, key: Tuple[str, str], max_size: int) -> _CachedMapper:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.refcount += 1
+
+        metrics.incr("proguard.mapper_cache.get", tags={"hit": entry is not None})
+        if entry is not None:
+            return entry
+
+        # Opening the mapper takes a while, don't block other threads meanwhile.
+        entry = _CachedMapper(_open_mapper(key[1]), os.path.getsize(key[1]), refcount=1)
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                existing.refcount += 1
+                return existing
+
+            if entry.size <= max_size:
+                self._entries[key] = entry
+                self._size += entry.size
+                self._evict(max_size)
+
+        metrics.gauge("proguard.mapper_cache.size", self._size)
+        return entry
+
+    def _evict(self, max_size: int) -> None:
+        if self._size <= max_size:
+            return
+
+        for key, entry in list(self._entries.items()):
+            if self._size <= max_size:
+                break
+            if entry.refcount > 0:
+                continue
+            del self._entries[key]
+            self._size -= entry.size
+            metrics.incr("proguard.mapper_cache.evict")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+proguard_mapper_cache = ProguardMapperCache()
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import os
-from typing import Any
+from contextlib import ExitStack, contextmanager
+from typing import Any, Generator
 
 import sentry_sdk
 from symbolic.proguard import ProguardMapper
 
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.ingest.consumer.processors import CACHE_TIMEOUT
+from sentry.lang.java.proguard import proguard_mapper_cache
 from sentry.models.debugfile import ProjectDebugFile
 from sentry.models.project import Project
 from sentry.utils import json
@@ -47,11 +49,15 @@ def get_jvm_images(event: dict[str, Any]) -> set[str]:
     return images
 
 
-def get_proguard_mapper(uuid: str, project: Project):
+@contextmanager
+def get_proguard_mapper(
+    uuid: str, project: Project
+) -> Generator[ProguardMapper | None, None, None]:
     with sentry_sdk.start_span(op="proguard.fetch_debug_files") as span:
         dif_paths = ProjectDebugFile.difcache.fetch_difs(project, [uuid], features=["mapping"])
         debug_file_path = dif_paths.get(uuid)
         if debug_file_path is None:
+            yield None
             return
 
         try:
@@ -59,15 +65,14 @@ def get_proguard_mapper(uuid: str, project: Project):
             span.set_tag("proguard_file_size_in_mb", proguard_file_size_in_mb)
         except OSError as exc:
             sentry_sdk.capture_exception(exc)
+            yield None
             return
 
-    with sentry_sdk.start_span(op="proguard.open"):
-        mapper = ProguardMapper.open(debug_file_path)
+    with ExitStack() as stack:
+        with sentry_sdk.start_span(op="proguard.open"):
+            mapper = stack.enter_context(proguard_mapper_cache.open(uuid, debug_file_path))
 
-    if not mapper.has_line_info:
-        return
-
-    return mapper
+        yield mapper if mapper.has_line_info else None
 
 
 def _deobfuscate_view_hierarchy(event_data: dict[str, Any], project: Project, view_hierarchy):
@@ -83,16 +88,16 @@ def _deobfuscate_view_hierarchy(event_data: dict[str, Any], project: Project, vi
 
     with sentry_sdk.start_span(op="proguard.deobfuscate_view_hierarchy_data"):
         for proguard_uuid in proguard_uuids:
-            mapper = get_proguard_mapper(proguard_uuid, project)
-            if mapper is None:
-                return
-
-            windows_to_deobfuscate = [*view_hierarchy.get("windows")]
-            while windows_to_deobfuscate:
-                window = windows_to_deobfuscate.pop()
-                window["type"] = mapper.remap_class(window.get("type")) or window.get("type")
-                if children := window.get("children"):
-                    windows_to_deobfuscate.extend(children)
+            with get_proguard_mapper(proguard_uuid, project) as mapper:
+                if mapper is None:
+                    return
+
+                windows_to_deobfuscate = [*view_hierarchy.get("windows")]
+                while windows_to_deobfuscate:
+                    window = windows_to_deobfuscate.pop()
+                    window["type"] = mapper.remap_class(window.get("type")) or window.get("type")
+                    if children := window.get("children"):
+                        windows_to_deobfuscate.extend(children)
 
 
 def deobfuscation_template(data, map_type, deobfuscation_fn):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import struct
 import zipfile
 from enum import Enum
 from typing import IO, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
@@ -31,6 +32,9 @@ NULL_UUID = "00000000-00000000-00000000-00000000"
 NULL_STRING = ""
 # Number of bundles that have to be associated to a release/dist pair before indexing takes place.
 INDEXING_THRESHOLD = 1
+# Prefix of the stored binary flat file index, the `date_added` (in microseconds) of the index it
+# was written with.
+BINARY_INDEX_VERSION = struct.Struct("<q")
 
 
 class SourceFileType(Enum):
@@ -174,7 +178,13 @@ class ArtifactBundleFlatFileIndex(Model):
     def _indexstore_id(self) -> str:
         return f"bundle_index:{self.project_id}:{self.id}"
 
-    def update_flat_file_index(self, data: str):
+    def _binary_indexstore_id(self) -> str:
+        return f"bundle_index_binary:{self.project_id}:{self.id}"
+
+    def _binary_index_version(self) -> bytes:
+        return BINARY_INDEX_VERSION.pack(int(self.date_added.timestamp() * 1_000_000))
+
+    def update_flat_file_index(self, data: str, binary_data: Optional[bytes] = None):
         encoded_data = data.encode()
 
         metric_name = "debug_id_index" if self.release_name == NULL_STRING else "url_index"
@@ -184,11 +194,30 @@ class ArtifactBundleFlatFileIndex(Model):
         )
 
         indexstore.set_bytes(self._indexstore_id(), encoded_data)
+        # This also invalidates the binary index written with the previous JSON index.
         self.update(date_added=timezone.now())
 
+        if binary_data is not None:
+            metrics.timing(
+                f"artifact_bundle_flat_file_indexing.{metric_name}.binary_size_in_bytes",
+                value=len(binary_data),
+            )
+            indexstore.set_bytes(
+                self._binary_indexstore_id(), self._binary_index_version() + binary_data
+            )
+
     def load_flat_file_index(self) -> Optional[bytes]:
         return indexstore.get_bytes(self._indexstore_id())
 
+    def load_binary_flat_file_index(self) -> Optional[bytes]:
+        """
+        Returns the binary index, unless the JSON index has been updated without it since.
+        """
+        data = indexstore.get_bytes(self._binary_indexstore_id())
+        if data is None or not data.startswith(self._binary_index_version()):
+            return None
+        return data[BINARY_INDEX_VERSION.size :]
+
 
 @region_silo_only_model
 class FlatFileIndexState(Model):
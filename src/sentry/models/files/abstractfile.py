@@ -5,9 +5,11 @@ import logging
 import mmap
 import os
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from hashlib import sha1
-from typing import ClassVar, Type
+from typing import IO, ClassVar, Iterator, Optional, Type
 
 import sentry_sdk
 from django.core.files.base import ContentFile
@@ -15,17 +17,239 @@ from django.core.files.base import File as FileObj
 from django.db import IntegrityError, models, router, transaction
 from django.utils import timezone
 
+from sentry import options
 from sentry.backup.scopes import RelocationScope
 from sentry.celery import SentryTask
 from sentry.db.models import BoundedPositiveIntegerField, JSONField, Model
 from sentry.models.files.abstractfileblob import AbstractFileBlob
-from sentry.models.files.utils import DEFAULT_BLOB_SIZE, AssembleChecksumMismatch, nooplogger
+from sentry.models.files.utils import (
+    DEFAULT_BLOB_SIZE,
+    AssembleChecksumMismatch,
+    clear_cached_files,
+    nooplogger,
+)
 from sentry.utils import metrics
 from sentry.utils.db import atomic_transaction
 
 logger = logging.getLogger(__name__)
 
 
+class BlobCache:
+    """
+    A cache of file blobs on the local disk, keyed by their checksum.
+
+    Blobs are immutable, so cached copies never have to be invalidated. Reading
+    a blob bumps its mtime, so only blobs which have not been used for a while
+    are removed by `clear_old_entries`.
+    """
+
+    @property
+    def cache_path(self) -> str:
+        return options.get("filestore.blob-cache-path")
+
+    def _get_path(self, checksum: str) -> str:
+        return os.path.join(self.cache_path, checksum[:2], checksum)
+
+    def open(self, checksum: Optional[str]) -> Optional[IO[bytes]]:
+        if not self.cache_path or not checksum:
+            return None
+
+        path = self._get_path(checksum)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            metrics.incr("filestore.blob_cache", tags={"hit": False})
+            return None
+
+        metrics.incr("filestore.blob_cache", tags={"hit": True})
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return f
+
+    @contextmanager
+    def writer(self, checksum: Optional[str]) -> Iterator[Optional[BlobCacheFile]]:
+        """
+        Yields a file to write the contents of a blob to, which is moved into the
+        cache if no error occurs. Yields `None` if the cache is disabled.
+        """
+        if not self.cache_path or not checksum:
+            yield None
+            return
+
+        path = self._get_path(checksum)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = tempfile.NamedTemporaryFile(
+                prefix="._blob-", dir=os.path.dirname(path), delete=False
+            )
+        except OSError:
+            yield None
+            return
+
+        cache_file = BlobCacheFile(f)
+        try:
+            yield cache_file
+        except BaseException:
+            cache_file.discard()
+            raise
+        cache_file.commit(path)
+
+    def clear_old_entries(self) -> None:
+        if self.cache_path:
+            clear_cached_files(self.cache_path)
+
+
+class BlobCacheFile:
+    """
+    A temporary file in the blob cache. Failing to write the cache must not fail
+    reading the blob, so errors are not raised but discard the file instead.
+    """
+
+    def __init__(self, f: IO[bytes]) -> None:
+        self._file = f
+        self._failed = False
+
+    def write(self, data: bytes) -> None:
+        if self._failed:
+            return
+        try:
+            self._file.write(data)
+        except OSError:
+            self._failed = True
+
+    def commit(self, path: str) -> None:
+        try:
+            self._file.close()
+            if not self._failed:
+                os.replace(self._file.name, path)
+                return
+        except OSError:
+            pass
+        metrics.incr("filestore.blob_cache.write_failed")
+        self.discard()
+
+    def discard(self) -> None:
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        try:
+            os.remove(self._file.name)
+        except OSError:
+            pass
+
+
+blob_cache = BlobCache()
+
+
+def _fetch_blob(mem: mmap.mmap, idx) -> None:
+    offset = idx.offset
+    cached = blob_cache.open(idx.blob.checksum)
+    if cached is not None:
+        with cached as sf:
+            _copy_blob(sf, mem, offset)
+        return
+
+    with idx.blob.getfile() as sf, blob_cache.writer(idx.blob.checksum) as cache_file:
+        _copy_blob(sf, mem, offset, cache_file)
+
+
+def _copy_blob(sf, mem: mmap.mmap, offset: int, cache_file: Optional[BlobCacheFile] = None) -> None:
+    while True:
+        chunk = sf.read(65535)
+        if not chunk:
+            break
+        mem[offset : offset + len(chunk)] = chunk
+        offset += len(chunk)
+        if cache_file is not None:
+            cache_file.write(chunk)
+
+
+class PrefetchedBlobs:
+    """
+    A temporary file which is filled with the blobs of a file in the background.
+
+    Reads only wait for the blobs they cover, so they can start as soon as the
+    leading blobs have been downloaded. Blobs which no download thread has picked
+    up yet are fetched by the reading thread itself, so random access (like
+    reading the central directory at the end of a zip archive) does not have to
+    wait for the whole file either.
+    """
+
+    def __init__(self, f, size: int, indexes, concurrency: int) -> None:
+        self.file = f
+        self.size = size
+        self._pos = 0
+        self._mem = mmap.mmap(f.fileno(), size)
+        self._indexes = indexes
+        self._offsets = [idx.offset for idx in indexes]
+        self._executor = ThreadPoolExecutor(max_workers=max(concurrency, 1))
+        self._futures = [self._executor.submit(_fetch_blob, self._mem, idx) for idx in indexes]
+        self._complete = False
+
+    def _wait(self, start: int, end: int) -> None:
+        if self._complete:
+            return
+
+        i = max(bisect_right(self._offsets, start) - 1, 0)
+        while i < len(self._futures) and self._offsets[i] < end:
+            future = self._futures[i]
+            if future.cancel():
+                _fetch_blob(self._mem, self._indexes[i])
+                future = Future()
+                future.set_result(None)
+                self._futures[i] = future
+            future.result()
+            i += 1
+
+    def detach(self):
+        """
+        Waits for all blobs and returns the underlying temporary file.
+        """
+        try:
+            self._wait(0, self.size)
+        except BaseException:
+            self.close()
+            raise
+        self._complete = True
+        self._executor.shutdown()
+        self._mem.flush()
+        self._mem.close()
+        return self.file
+
+    def read(self, n: int = -1) -> bytes:
+        end = self.size if n < 0 else min(self.size, self._pos + n)
+        if self._pos >= end:
+            return b""
+        self._wait(self._pos, end)
+        rv = self._mem[self._pos : end]
+        self._pos = end
+        return rv
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += self.size
+        if pos < 0:
+            raise OSError("Invalid argument")
+        self._pos = pos
+        return pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown()
+        if not self._mem.closed:
+            self._mem.close()
+        self.file.close()
+
+
 class ChunkedFileBlobIndexWrapper:
     def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
         # eager load from database incase its a queryset
@@ -51,6 +275,8 @@ class ChunkedFileBlobIndexWrapper:
             raise TypeError("Can only detech tempfiles in prefetch mode")
         assert self._curfile is not None
         rv = self._curfile
+        if isinstance(rv, PrefetchedBlobs):
+            rv = rv.detach()
         self._curfile = None
         self.close()
         rv.seek(0)
@@ -90,23 +316,14 @@ class ChunkedFileBlobIndexWrapper:
         f.write(b"\x00")
         f.flush()
 
-        mem = mmap.mmap(f.fileno(), size)
-
-        def fetch_file(offset, getfile):
-            with getfile() as sf:
-                while True:
-                    chunk = sf.read(65535)
-                    if not chunk:
-                        break
-                    mem[offset : offset + len(chunk)] = chunk
-                    offset += len(chunk)
-
-        with ThreadPoolExecutor(max_workers=4) as exe:
-            for idx in self._indexes:
-                exe.submit(fetch_file, idx.offset, idx.blob.getfile)
-
-        mem.flush()
-        self._curfile = f
+        prefetched = PrefetchedBlobs(
+            f, size, self._indexes, options.get("filestore.prefetch-concurrency")
+        )
+        if options.get("filestore.prefetch-readahead"):
+            # Reads are served while the remaining blobs are still being downloaded.
+            self._curfile = prefetched
+        else:
+            self._curfile = prefetched.detach()
 
     def close(self):
         if self._curfile:
@@ -16,6 +16,7 @@ from sentry.models.activity import Activity
 from sentry.models.actor import ActorTuple
 from sentry.models.groupowner import OwnerRuleType
 from sentry.models.project import Project
+from sentry.ownership.compiled import compiled_rules_cache
 from sentry.ownership.grammar import Rule, load_schema, resolve_actors
 from sentry.types.activity import ActivityType
 from sentry.utils import metrics
@@ -360,6 +361,10 @@ class ProjectOwnership(Model):
         rules = []
 
         if ownership.schema is not None:
+            compiled_rules = compiled_rules_cache.get(ownership.schema)
+            if compiled_rules is not None:
+                return compiled_rules.matching_rules(data)
+
             for rule in load_schema(ownership.schema):
                 if rule.test(data):
                     rules.append(rule)
@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, Mapping, Optional
+from functools import partial
+from typing import DefaultDict, Dict, List, Literal, Mapping, Optional, Sequence, Tuple
 
 import msgpack
 import sentry_sdk
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import BrokerValue, Commit, Message, Partition
@@ -287,6 +291,10 @@ def update_existing_check_in(
     return
 
 
+def _normalize_monitor_slug(monitor_slug: str) -> str:
+    return slugify(monitor_slug)[:MAX_SLUG_LENGTH].strip("-")
+
+
 def _process_checkin(
     params: CheckinPayload,
     message_ts: datetime,
@@ -295,7 +303,7 @@ def _process_checkin(
     source_sdk: str,
     txn: Transaction | Span,
 ):
-    monitor_slug = slugify(params["monitor_slug"])[:MAX_SLUG_LENGTH].strip("-")
+    monitor_slug = _normalize_monitor_slug(params["monitor_slug"])
 
     environment = params.get("environment")
     project = Project.objects.get_from_cache(id=project_id)
@@ -594,11 +602,15 @@ def _process_message(
     if wrapper["message_type"] == "clock_pulse":
         return
 
+    params: CheckinPayload = json.loads(wrapper["payload"])
+    _process_checkin_message(ts, wrapper, params)
+
+
+def _process_checkin_message(ts: datetime, wrapper: CheckinMessage, params: CheckinPayload) -> None:
     with sentry_sdk.start_transaction(
         op="_process_message",
         name="monitors.monitor_consumer",
     ) as txn:
-        params: CheckinPayload = json.loads(wrapper["payload"])
         start_time = to_datetime(float(wrapper["start_time"]))
         project_id = int(wrapper["project_id"])
         source_sdk = wrapper["sdk"]
@@ -606,25 +618,152 @@ def _process_message(
         _process_checkin(params, ts, start_time, project_id, source_sdk, txn)
 
 
+CheckinItem = Tuple[datetime, CheckinMessage, CheckinPayload]
+
+
+def _process_checkin_group(items: Sequence[CheckinItem]) -> None:
+    """
+    Processes the check-ins of a single monitor in the order they were
+    consumed.
+    """
+    for ts, wrapper, params in items:
+        try:
+            _process_checkin_message(ts, wrapper, params)
+        except Exception:
+            logger.exception("Failed to process check-in")
+
+
+def process_batch(
+    executor: ThreadPoolExecutor, message: Message[ValuesBatch[KafkaPayload]]
+) -> None:
+    """
+    Processes a batch of messages. Check-ins are grouped by monitor (project
+    and slug), the check-ins of a monitor are processed in order while the
+    groups are processed concurrently on the executor.
+
+    Returns once every check-in of the batch has been processed, the offsets
+    of the batch are committed afterwards.
+    """
+    batch = message.payload
+
+    latest_partition_ts: Dict[int, datetime] = {}
+    checkin_groups: DefaultDict[Tuple[int, str], List[CheckinItem]] = defaultdict(list)
+
+    for item in batch:
+        assert isinstance(item, BrokerValue)
+        latest_partition_ts[item.partition.index] = item.timestamp
+
+        try:
+            wrapper = msgpack.unpackb(item.payload.value)
+            # Clock pulses only advance the clock, see below
+            if wrapper.get("message_type", "check_in") == "clock_pulse":
+                continue
+
+            params: CheckinPayload = json.loads(wrapper["payload"])
+            group_key = (
+                int(wrapper["project_id"]),
+                _normalize_monitor_slug(params["monitor_slug"]),
+            )
+        except Exception:
+            logger.exception("Failed to process message payload")
+            continue
+
+        checkin_groups[group_key].append((item.timestamp, wrapper, params))
+
+    metrics.gauge("monitors.checkin.parallel_batch_count", len(batch))
+    metrics.gauge("monitors.checkin.parallel_batch_groups", len(checkin_groups))
+
+    with metrics.timer("monitors.checkin.parallel_batch_processing"):
+        futures = [
+            executor.submit(_process_checkin_group, items) for items in checkin_groups.values()
+        ]
+        wait(futures)
+
+    # Drive the clock once per partition with the latest timestamp of the
+    # batch, instead of for every message. This happens after the check-ins
+    # are stored, so the missed and timeout checks of a minute the batch spans
+    # see the check-ins of that minute.
+    for partition, ts in latest_partition_ts.items():
+        try:
+            try_monitor_tasks_trigger(ts, partition)
+        except Exception:
+            logger.exception("Failed to trigger monitor tasks", exc_info=True)
+
+
+def process_single(message: Message[KafkaPayload]) -> None:
+    assert isinstance(message.value, BrokerValue)
+    try:
+        wrapper = msgpack.unpackb(message.payload.value)
+        _process_message(
+            message.value.timestamp,
+            message.value.partition.index,
+            wrapper,
+        )
+    except Exception:
+        logger.exception("Failed to process message payload")
+
+
 class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
-    def create_with_partitions(
+    """
+    Processes check-ins one after the other, or in ``parallel`` mode, in
+    batches of check-ins grouped by monitor, see ``process_batch``.
+    """
+
+    parallel_executor: ThreadPoolExecutor | None = None
+
+    max_batch_size = 500
+    """
+    How many messages will be batched at once when in parallel mode.
+    """
+
+    max_batch_time = 1
+    """
+    The maximum time in seconds to accumulate a batch of check-ins when in
+    parallel mode.
+    """
+
+    def __init__(
         self,
-        commit: Commit,
-        partitions: Mapping[Partition, int],
-    ) -> ProcessingStrategy[KafkaPayload]:
-        def process_message(message: Message[KafkaPayload]) -> None:
-            assert isinstance(message.value, BrokerValue)
-            try:
-                wrapper = msgpack.unpackb(message.payload.value)
-                _process_message(
-                    message.value.timestamp,
-                    message.value.partition.index,
-                    wrapper,
-                )
-            except Exception:
-                logger.exception("Failed to process message payload")
+        mode: Literal["serial", "parallel"] | None = None,
+        max_batch_size: int | None = None,
+        max_batch_time: int | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        if mode == "parallel":
+            self.parallel_executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        if max_batch_size is not None:
+            self.max_batch_size = max_batch_size
+        if max_batch_time is not None:
+            self.max_batch_time = max_batch_time
+
+    def shutdown(self) -> None:
+        if self.parallel_executor is not None:
+            self.parallel_executor.shutdown()
+
+    def create_parallel_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
+        assert self.parallel_executor is not None
+        batch_processor = RunTask(
+            function=partial(process_batch, self.parallel_executor),
+            next_step=CommitOffsets(commit),
+        )
+        return BatchStep(
+            max_batch_size=self.max_batch_size,
+            max_batch_time=self.max_batch_time,
+            next_step=batch_processor,
+        )
 
+    def create_synchronous_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
         return RunTask(
-            function=process_message,
+            function=process_single,
             next_step=CommitOffsets(commit),
         )
+
+    def create_with_partitions(
+        self,
+        commit: Commit,
+        partitions: Mapping[Partition, int],
+    ) -> ProcessingStrategy[KafkaPayload]:
+        if self.parallel_executor is not None:
+            return self.create_parallel_worker(commit)
+        return self.create_synchronous_worker(commit)
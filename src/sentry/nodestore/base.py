@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import local
+from typing import Iterator
 
 import sentry_sdk
 from django.core.cache import InvalidCacheBackendError, caches
 
+from sentry.nodestore.compression import compress, decompress
 from sentry.utils import json
 from sentry.utils.cache import memoize
 from sentry.utils.services import Service
@@ -58,6 +61,10 @@ class NodeStorage(local, Service):
 
     This is used in reprocessing to store a snapshot of the event from multiple
     stages of the pipeline.
+
+    Payloads written by ``set``/``set_subkeys`` are additionally compressed by
+    ``sentry.nodestore.compression`` when enabled, ``set_bytes``/``get_bytes``
+    always work on the raw bytes.
     """
 
     __all__ = (
@@ -66,6 +73,7 @@ class NodeStorage(local, Service):
         "get",
         "get_bytes",
         "get_multi",
+        "iter_multi",
         "set",
         "set_bytes",
         "set_subkeys",
@@ -142,7 +150,7 @@ class NodeStorage(local, Service):
 
             span.set_tag("subkey", str(subkey))
             bytes_data = self._get_bytes(id)
-            rv = self._decode(bytes_data, subkey=subkey)
+            rv = self._decode(decompress(bytes_data), subkey=subkey)
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
@@ -164,6 +172,31 @@ class NodeStorage(local, Service):
         """
         return {id: self._get_bytes(id) for id in id_list}
 
+    def _iter_bytes_multi(self, id_list: list[str]) -> Iterator[tuple[str, bytes | None]]:
+        """
+        Yields ``(id, bytes)`` pairs in no particular order as they are
+        fetched. Backends which can stream results should override this, the
+        default just iterates over ``_get_bytes_multi``.
+        """
+        yield from self._get_bytes_multi(id_list).items()
+
+    def _iter_bytes_multi_concurrent(
+        self, id_list: list[str], max_workers: int
+    ) -> Iterator[tuple[str, bytes | None]]:
+        """
+        Fetches every id with ``_get_bytes`` on a thread pool, for backends
+        without a native multi-get.
+        """
+        if len(id_list) <= 1 or max_workers <= 1:
+            for id in id_list:
+                yield id, self._get_bytes(id)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(id_list))) as executor:
+            futures = {executor.submit(self._get_bytes, id): id for id in id_list}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
     def get_multi(self, id_list, subkey=None):
         """
         >>> nodestore.get_multi(['key1', 'key2')
@@ -176,29 +209,43 @@ class NodeStorage(local, Service):
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
 
-            if subkey is None:
-                cache_items = self._get_cache_items(id_list)
-                if len(cache_items) == len(id_list):
-                    span.set_tag("result", "from_cache")
-                    return cache_items
-
-                uncached_ids = [id for id in id_list if id not in cache_items]
-            else:
-                uncached_ids = id_list
-
-            items = {
-                id: self._decode(value, subkey=subkey)
-                for id, value in self._get_bytes_multi(uncached_ids).items()
-            }
-            if subkey is None:
-                self._set_cache_items(items)
-                items.update(cache_items)
+            items = dict(self.iter_multi(id_list, subkey=subkey))
 
-            span.set_tag("result", "from_service")
             span.set_tag("found", len(items))
 
             return items
 
+    def iter_multi(self, id_list, subkey=None):
+        """
+        Like ``get_multi``, but yields ``(id, node)`` pairs as soon as they
+        are fetched and decoded. Items are not yielded in the order of
+        ``id_list``.
+
+        >>> for id, node in nodestore.iter_multi(['key1', 'key2']):
+        ...     print(id, node)
+        key2 {"message": "hello world"}
+        key1 {"message": "hello world"}
+        """
+        if subkey is None:
+            cache_items = self._get_cache_items(id_list)
+            yield from cache_items.items()
+            if len(cache_items) == len(id_list):
+                return
+
+            uncached_ids = [id for id in id_list if id not in cache_items]
+        else:
+            uncached_ids = id_list
+
+        items = {}
+        for id, value in self._iter_bytes_multi(uncached_ids):
+            item = self._decode(decompress(value), subkey=subkey)
+            if subkey is None:
+                items[id] = item
+            yield id, item
+
+        if items:
+            self._set_cache_items(items)
+
     def _encode(self, data):
         """
         Encode data dict in a way where its keys can be deserialized
@@ -252,7 +299,8 @@ class NodeStorage(local, Service):
             span.set_tag("node_id", id)
             span.set_data("subkeys_count", len(data))
             cache_item = data.get(None)
-            bytes_data = self._encode(data)
+            platform = cache_item.get("platform") if isinstance(cache_item, dict) else None
+            bytes_data = compress(self._encode(data), platform=platform)
             self._set_bytes(id, bytes_data, ttl=ttl)
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(id, cache_item)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from typing import Iterator
 
 import sentry_sdk
 
@@ -66,6 +67,14 @@ class BigtableNodeStorage(NodeStorage):
         rv.update(self.store.get_many(id_list))
         return rv
 
+    def _iter_bytes_multi(self, id_list: list[str]) -> Iterator[tuple[str, bytes | None]]:
+        missing = set(id_list)
+        for id, value in self.store.get_many(id_list):
+            missing.discard(id)
+            yield id, value
+        for id in missing:
+            yield id, None
+
     def _set_bytes(self, id, data, ttl=None):
         self.store.set(id, data, ttl)
 
@@ -0,0 +1,124 @@
+"""
+Compression of nodestore payloads.
+
+Compressed payloads are prefixed with a single header byte identifying the
+codec. Uncompressed payloads written before compression was enabled start
+with ``{`` (JSON) or a pickle opcode, neither of which collides with a header
+byte, so both formats can be read side by side and no migration is needed.
+
+zstd payloads may be compressed with a dictionary trained on events of the
+same platform (see ``train_dictionary``), configured with
+``SENTRY_NODESTORE_ZSTD_DICTIONARIES``. zstd records the id of the dictionary
+in the frame header, which is used to pick the dictionary when decompressing.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Mapping
+
+import zstandard
+from django.conf import settings
+
+from sentry import options
+from sentry.utils import metrics
+
+CODEC_ZSTD = 0x01
+
+CODECS = frozenset([CODEC_ZSTD])
+
+
+class UnknownDictionary(Exception):
+    pass
+
+
+class ZstdDictionaries:
+    """
+    Lazily loads the zstd dictionaries configured for each platform.
+    """
+
+    def __init__(self, paths: Mapping[str, str] | None = None) -> None:
+        self._paths = paths
+        self._lock = threading.Lock()
+        self._by_platform: dict[str, zstandard.ZstdCompressionDict] | None = None
+        self._by_id: dict[int, zstandard.ZstdCompressionDict] = {}
+
+    def _load(self) -> dict[str, zstandard.ZstdCompressionDict]:
+        if self._by_platform is not None:
+            return self._by_platform
+
+        with self._lock:
+            if self._by_platform is None:
+                paths = self._paths
+                if paths is None:
+                    paths = getattr(settings, "SENTRY_NODESTORE_ZSTD_DICTIONARIES", {})
+
+                by_platform = {}
+                for platform, path in paths.items():
+                    with open(path, "rb") as f:
+                        dictionary = zstandard.ZstdCompressionDict(f.read())
+                    by_platform[platform] = dictionary
+                    self._by_id[dictionary.dict_id()] = dictionary
+                self._by_platform = by_platform
+
+        return self._by_platform
+
+    def for_platform(self, platform: str | None) -> zstandard.ZstdCompressionDict | None:
+        if platform is None:
+            return None
+        return self._load().get(platform)
+
+    def for_id(self, dict_id: int) -> zstandard.ZstdCompressionDict:
+        self._load()
+        try:
+            return self._by_id[dict_id]
+        except KeyError:
+            raise UnknownDictionary(dict_id)
+
+
+dictionaries = ZstdDictionaries()
+
+
+def compress(data: bytes, platform: str | None = None) -> bytes:
+    """
+    Compresses a payload if enabled by the ``nodestore.zstd-compression``
+    option, otherwise returns it unchanged.
+    """
+    if not options.get("nodestore.zstd-compression"):
+        return data
+
+    dictionary = dictionaries.for_platform(platform)
+    compressor = zstandard.ZstdCompressor(
+        level=options.get("nodestore.zstd-compression-level"), dict_data=dictionary
+    )
+    rv = bytes([CODEC_ZSTD]) + compressor.compress(data)
+
+    metrics.timing(
+        "nodestore.compression.ratio",
+        len(rv) / max(len(data), 1),
+        tags={"dictionary": dictionary is not None},
+    )
+    return rv
+
+
+def decompress(value: bytes | None) -> bytes | None:
+    """
+    Decompresses a payload written by ``compress``. Payloads without a header
+    byte are returned unchanged.
+    """
+    if not value or value[0] not in CODECS:
+        return value
+
+    frame = value[1:]
+    dict_id = zstandard.get_frame_parameters(frame).dict_id
+    dictionary = dictionaries.for_id(dict_id) if dict_id else None
+    return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(frame)
+
+
+def train_dictionary(samples: Iterable[bytes], dict_size: int = 112640) -> bytes:
+    """
+    Trains a zstd dictionary from encoded payloads of a single platform. The
+    result can be written to a file and configured in
+    ``SENTRY_NODESTORE_ZSTD_DICTIONARIES``.
+    """
+    return zstandard.train_dictionary(dict_size, list(samples)).as_bytes()
@@ -3,11 +3,13 @@ from __future__ import annotations
 import logging
 import math
 import pickle
+from typing import Iterator
 
 from django.utils import timezone
 
 from sentry.db.models import create_or_update
 from sentry.nodestore.base import NodeStorage
+from sentry.utils.iterators import chunked
 from sentry.utils.strings import compress, decompress
 
 from .models import Node
@@ -16,6 +18,8 @@ logger = logging.getLogger("sentry")
 
 
 class DjangoNodeStorage(NodeStorage):
+    multi_get_batch_size = 100
+
     def delete(self, id):
         Node.objects.filter(id=id).delete()
         self._delete_cache_item(id)
@@ -44,7 +48,14 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
     def _get_bytes_multi(self, id_list: list[str]) -> dict[str, bytes | None]:
-        return {n.id: decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
+        return dict(self._iter_bytes_multi(id_list))
+
+    def _iter_bytes_multi(self, id_list: list[str]) -> Iterator[tuple[str, bytes | None]]:
+        # Query in batches to keep the ``IN`` clauses reasonably sized, and
+        # stream the rows of each batch instead of loading all models first.
+        for ids in chunked(id_list, self.multi_get_batch_size):
+            for id, data in Node.objects.filter(id__in=ids).values_list("id", "data").iterator():
+                yield id, decompress(data)
 
     def delete_multi(self, id_list):
         Node.objects.filter(id__in=id_list).delete()
@@ -1,6 +1,9 @@
+from __future__ import annotations
+
 import datetime
 import os
 from datetime import timezone
+from typing import Iterator
 
 from django.conf import settings
 
@@ -13,6 +16,9 @@ class FileSystemNodeStorage(NodeStorage):
     debugging and development!
     """
 
+    # Number of files read in parallel by ``get_multi``
+    multi_get_max_workers = 8
+
     def __init__(self, path=None):
         self.path: str = ""
 
@@ -27,6 +33,12 @@ class FileSystemNodeStorage(NodeStorage):
         with open(self.node_path(id), "rb") as file:
             return file.read()
 
+    def _get_bytes_multi(self, id_list: list[str]) -> dict[str, bytes | None]:
+        return dict(self._iter_bytes_multi(id_list))
+
+    def _iter_bytes_multi(self, id_list: list[str]) -> Iterator[tuple[str, bytes | None]]:
+        return self._iter_bytes_multi_concurrent(id_list, self.multi_get_max_workers)
+
     def _set_bytes(self, id: str, data: bytes, ttl=0):
         with open(self.node_path(id), "wb") as file:
             file.write(data)
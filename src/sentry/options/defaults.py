@@ -127,6 +127,33 @@ register(
     default=1024 * 1024 * 1024,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# The total size of the ProGuard mapping files kept open in memory by a process, 0 disables
+# the cache of opened mappers.
+register(
+    "proguard.mapper-cache.max-bytes",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Blobs of chunked files are cached here by checksum when prefetching, disabled when empty.
+register(
+    "filestore.blob-cache-path",
+    type=String,
+    default="",
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "filestore.prefetch-concurrency",
+    type=Int,
+    default=4,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Serve reads of prefetched files as soon as the blobs they cover are downloaded.
+register(
+    "filestore.prefetch-readahead",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 
 # Mail
@@ -367,6 +394,20 @@ register(
     default=0,
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# The number of replay segments downloaded concurrently, and the number of bytes downloaded
+# segments may hold in memory before they are streamed to the client.
+register(
+    "replay.storage.download-concurrency",
+    type=Int,
+    default=10,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "replay.storage.download-max-inflight-bytes",
+    type=Int,
+    default=32 * 1024 * 1024,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 # The sample rate at which to allow dom-click-search.
 register(
     "replay.ingest.dom-click-search",
@@ -501,6 +542,29 @@ register("snuba.search.max-total-chunk-time-seconds", default=30.0, flags=FLAG_A
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Paginate data exports with a keyset instead of an offset where the export
+# supports it, and the number of fragments of offset paginated exports that
+# are fetched concurrently.
+register("data-export.keyset-pagination", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("data-export.fetch-concurrency", default=1, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# The number of parse results kept in memory by `parse_search_query`, 0
+# disables the cache.
+register("search.parse-cache.size", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Coalesce identical concurrent snuba queries with `use_cache` into a single
+# query per cache key, and how long expired results may be served for the
+# referrers that accept stale results.
+register("snuba.query-cache.single-flight", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("snuba.query-cache.lock-timeout", default=10, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("snuba.query-cache.stale-ttl", default=300, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "snuba.query-cache.stale-referrers",
+    type=Sequence,
+    default=[],
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register(
     "snuba.tagstore.cache-tagkeys-rate",
@@ -615,6 +679,13 @@ register(
 register(
     "post-process.error-hook-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE
 )  # unused
+# Resolve the frequency conditions of all alert rules evaluated for an event with bulk TSDB
+# queries, sharing the results between events of the same group for a few seconds.
+register("rules.batch-frequency-conditions", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# The number of ownership schemas kept compiled in memory for matching
+# ownership rules and CODEOWNERS against events, 0 disables the compiled matcher.
+register("ownership.compiled-matcher.cache-size", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # Transaction events
 # True => kill switch to disable ingestion of transaction events for internal project.
@@ -702,6 +773,12 @@ register(
     "store.nodestore-stats-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE
 )  # unused
 
+# Compress nodestore payloads with zstd, using the per-platform dictionaries in
+# SENTRY_NODESTORE_ZSTD_DICTIONARIES where available. Compressed payloads can
+# always be read, regardless of this option.
+register("nodestore.zstd-compression", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("nodestore.zstd-compression-level", default=3, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Killswitch to stop storing any reprocessing payloads.
 register("store.reprocessing-force-disable", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -796,6 +873,38 @@ register("store.background-grouping-sample-rate", default=0.0, flags=FLAG_AUTOMA
 # True if background grouping should run before secondary and primary grouping
 register("store.background-grouping-before", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Evaluate stack trace rules with the indexed matcher engine instead of
+# interpreting every rule against every frame
+register("grouping.enhancer.use-compiled-rules", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Process-local LRU tier in front of the cache of frame values changed by stack
+# trace rules. Size is the number of stack traces, TTL is in seconds.
+register(
+    "grouping.enhancer.local-frame-cache.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+register("grouping.enhancer.local-frame-cache.size", default=10000, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("grouping.enhancer.local-frame-cache.ttl", default=300, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Process-local LRU tier in front of the cache of values stored by stacktrace
+# processors for frames. Size is the number of frames, TTL is in seconds.
+register(
+    "stacktrace-processing.local-frame-cache.enabled",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "stacktrace-processing.local-frame-cache.size", default=10000, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+register(
+    "stacktrace-processing.local-frame-cache.ttl", default=300, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
+# Coalesce the TSDB counter and distinct counter writes of save_event in a
+# process-local buffer, flushed after max-events writes or max-delay seconds.
+register("tsdb.coalescing-writer.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("tsdb.coalescing-writer.max-events", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("tsdb.coalescing-writer.max-delay", default=1.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Store release files bundled as zip files
 register(
     "processing.save-release-archives", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
@@ -1000,6 +1109,18 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# A process-local LRU consulted before the caching indexer's remote cache
+register(
+    "sentry-metrics.indexer.local-cache.enabled",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "sentry-metrics.indexer.local-cache.size",
+    default=100000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Option to control sampling percentage of schema validation on the generic metrics pipeline
 # based on namespace.
 register(
@@ -1524,6 +1645,14 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Maintain a binary flat file index of artifact bundles alongside the JSON one, and merge new bundles
+# into it incrementally instead of re-parsing the JSON index.
+register(
+    "sourcemaps.artifact_bundles.binary_flat_file_index",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Killswitch for monitor check-ins
 register("crons.organization.disable-check-in", type=Sequence, default=[])
 
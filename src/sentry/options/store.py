@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import dataclasses
 import logging
+import threading
+from contextlib import contextmanager
 from random import random
-from time import time
-from typing import Any, Optional, Set
+from time import monotonic, time
+from typing import Any, Generator, Iterable, Optional, Set
 
 from django.conf import settings
 from django.db.utils import OperationalError, ProgrammingError
@@ -15,9 +17,26 @@ from sentry.options.manager import UpdateChannel
 
 CACHE_FETCH_ERR = "Unable to fetch option cache for %s"
 CACHE_UPDATE_ERR = "Unable to update option cache for %s"
+VERSION_FETCH_ERR = "Unable to fetch options version"
+VERSION_UPDATE_ERR = "Unable to publish options version"
+
+# Every change of an option increments the version stored under this key, and
+# stores the cache keys of the changed options under ``<VERSION_KEY>:<version>``.
+VERSION_KEY = "o:version"
+# How long the cache keys of a change are kept around. Processes which have
+# not polled the version for longer than this flush their whole local cache.
+CHANGE_TTL = 3600
+# Processes which are behind by more changes flush their whole local cache
+# instead of refreshing the changed options.
+MAX_CHANGES = 100
 
 logger = logging.getLogger("sentry")
 
+# Metrics backends read options themselves. Reads on their behalf must not emit
+# metrics of the store again, or a cold local cache recurses into the store for
+# the same key before it's cached.
+_metrics_state = threading.local()
+
 
 @dataclasses.dataclass
 class GroupingInfo:
@@ -56,6 +75,28 @@ def _make_cache_value(key, value):
     return (value, now + key.ttl, now + key.ttl + key.grace)
 
 
+def _emit_metric(method: str, *args: Any, **kwargs: Any) -> None:
+    if getattr(_metrics_state, "emitting", False):
+        return
+
+    from sentry.utils import metrics
+
+    _metrics_state.emitting = True
+    try:
+        getattr(metrics, method)(*args, **kwargs)
+    finally:
+        _metrics_state.emitting = False
+
+
+@contextmanager
+def _timer(key: str) -> Generator[None, None, None]:
+    start = monotonic()
+    try:
+        yield
+    finally:
+        _emit_metric("timing", key, monotonic() - start)
+
+
 class OptionsStore:
     """
     Abstraction for the Option storage logic that should be driven
@@ -68,9 +109,19 @@ class OptionsStore:
     OptionsManager instead, unless you need raw access to something.
     """
 
-    def __init__(self, cache=None, ttl=None):
+    def __init__(self, cache=None, ttl=None, push_invalidation=False, poll_interval=1.0):
         self.cache = cache
         self.ttl = ttl
+        # With push invalidation, writers publish the keys of changed options
+        # under a version key. Each process polls the version at most every
+        # `poll_interval` seconds and keeps all other options in memory, ignoring
+        # their ttl. If the version can't be read, the ttl applies again.
+        self.push_invalidation = push_invalidation
+        self.poll_interval = poll_interval
+        self._version: Optional[int] = None
+        self._generation = 0
+        self._last_poll = 0.0
+        self._poll_lock = threading.Lock()
         self.flush_local_cache()
 
     @property
@@ -107,6 +158,9 @@ class OptionsStore:
         First check against our local in-process cache, falling
         back to the network cache.
         """
+        if self.push_invalidation:
+            self.maybe_poll_version(silent=silent)
+
         value = self.get_local_cache(key)
         if value is not None:
             return value
@@ -114,15 +168,18 @@ class OptionsStore:
         if self.cache is None:
             return None
 
+        # Changes published while we're fetching the value can't refresh it yet.
+        generation = self._generation
         cache_key = key.cache_key
         try:
-            value = self.cache.get(cache_key)
+            with _timer("options.store.get_cache"):
+                value = self.cache.get(cache_key)
         except Exception:
             if not silent:
                 logger.warning(CACHE_FETCH_ERR, key.name, extra={"key": key.name}, exc_info=True)
             value = None
 
-        if value is not None and key.ttl > 0:
+        if value is not None and key.ttl > 0 and generation == self._generation:
             self._local_cache[cache_key] = _make_cache_value(key, value)
 
         return value
@@ -142,6 +199,10 @@ class OptionsStore:
         except KeyError:
             return None
 
+        # Changes are pushed to us, so the key is valid until it gets invalidated
+        if self._version is not None:
+            return value
+
         now = int(time())
 
         # Key is within normal expiry window, so just return it
@@ -189,7 +250,7 @@ class OptionsStore:
             # because in practice the option query is consistent with the process level silo mode.
             # If you do change the way the option class model is picked, keep in mind it may not be deeply
             # tested due to the core assumption it should be stable per process in practice.
-            with in_test_hide_transaction_boundary():
+            with in_test_hide_transaction_boundary(), _timer("options.store.get_store"):
                 value = self.model.objects.get(key=key.name).value
         except (self.model.DoesNotExist, ProgrammingError, OperationalError):
             value = None
@@ -234,7 +295,9 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.set_store(key, value, channel)
-        return self.set_cache(key, value)
+        rv = self.set_cache(key, value)
+        self.publish_changes([key])
+        return rv
 
     def set_store(self, key, value, channel: UpdateChannel):
         from sentry.db.models.query import create_or_update
@@ -275,7 +338,9 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.delete_store(key)
-        return self.delete_cache(key)
+        rv = self.delete_cache(key)
+        self.publish_changes([key])
+        return rv
 
     def delete_store(self, key):
         self.model.objects.filter(key=key.name).delete()
@@ -294,11 +359,113 @@ class OptionsStore:
             logger.warning(CACHE_UPDATE_ERR, key.name, extra={"key": key.name}, exc_info=True)
             return False
 
+    def publish_changes(self, keys: Iterable[Key]) -> None:
+        """
+        Notify the processes using push invalidation about changed options.
+        The new values have to be written to the network cache before.
+        """
+        if self.cache is None:
+            return
+
+        cache_keys = [key.cache_key for key in keys]
+        if not cache_keys:
+            return
+
+        try:
+            try:
+                version = self.cache.incr(VERSION_KEY)
+            except ValueError:
+                # The version got evicted, which makes everyone flush their
+                # local cache when they see the new version.
+                self.cache.add(VERSION_KEY, 0, None)
+                version = self.cache.incr(VERSION_KEY)
+            self.cache.set(f"{VERSION_KEY}:{version}", cache_keys, CHANGE_TTL)
+        except Exception:
+            logger.warning(VERSION_UPDATE_ERR, exc_info=True)
+
+    def maybe_poll_version(self, silent=False) -> None:
+        """
+        Check whether options changed since the last poll, at most once per
+        `poll_interval` and only from a single thread at a time, and refresh
+        the changed options in the local cache.
+        """
+        if self.cache is None or monotonic() - self._last_poll < self.poll_interval:
+            return
+        if not self._poll_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_poll = monotonic()
+            self.poll_version(silent=silent)
+        finally:
+            self._poll_lock.release()
+
+    def poll_version(self, silent=False) -> None:
+        try:
+            with _timer("options.store.poll_version"):
+                version = self.cache.get(VERSION_KEY)
+                if version is None:
+                    self.cache.add(VERSION_KEY, 0, None)
+                    version = self.cache.get(VERSION_KEY)
+        except Exception:
+            if not silent:
+                logger.warning(VERSION_FETCH_ERR, exc_info=True)
+            version = None
+
+        if version is None:
+            # Fall back to expiring the local cache.
+            self._version = None
+            return
+        if version == self._version:
+            return
+
+        previous, self._version = self._version, version
+        if previous is None or not 0 < version - previous <= MAX_CHANGES:
+            _emit_metric("incr", "options.store.refresh", tags={"full": True})
+            self.flush_local_cache()
+            return
+
+        with _timer("options.store.refresh"):
+            try:
+                change_keys = [f"{VERSION_KEY}:{v}" for v in range(previous + 1, version + 1)]
+                changes = self.cache.get_many(change_keys)
+                if len(changes) < len(change_keys):
+                    # Some changes expired, we can't tell what changed.
+                    cache_keys = None
+                else:
+                    cache_keys = {k for change in changes.values() for k in change}
+                    values = self.cache.get_many([k for k in cache_keys if k in self._local_cache])
+            except Exception:
+                if not silent:
+                    logger.warning(VERSION_FETCH_ERR, exc_info=True)
+                cache_keys = None
+
+            if cache_keys is None:
+                _emit_metric("incr", "options.store.refresh", tags={"full": True})
+                self.flush_local_cache()
+                return
+
+            _emit_metric("incr", "options.store.refresh", tags={"full": False})
+            _emit_metric("incr", "options.store.refresh.keys", amount=len(cache_keys))
+            self._generation += 1
+            for cache_key in cache_keys:
+                try:
+                    value, expires, grace = self._local_cache[cache_key]
+                except KeyError:
+                    continue
+                if cache_key in values:
+                    self._local_cache[cache_key] = (values[cache_key], expires, grace)
+                else:
+                    self._local_cache.pop(cache_key, None)
+
     def clean_local_cache(self):
         """
         Iterate over our local cache items, and
         remove the keys that are beyond their grace time.
         """
+        if self._version is not None:
+            # Changes are pushed to us, keep everything.
+            return
+
         to_expire = []
         now = int(time())
 
@@ -327,6 +494,7 @@ class OptionsStore:
         Empty store's local in-process cache.
         """
         self._local_cache = {}
+        self._generation += 1
 
     def maybe_clean_local_cache(self, **kwargs):
         # Periodically force an expire on the local cache.
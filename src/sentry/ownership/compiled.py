@@ -0,0 +1,303 @@
+"""
+Matches a whole ownership schema against an event at once.
+
+``Rule.test`` evaluates one rule at a time, and every path rule munges and
+walks all frames of the event again, so the cost of matching grows with the
+number of rules times the number of frames. Large CODEOWNERS files have
+thousands of rules, of which only a handful can ever match a given frame.
+
+``CompiledRules`` indexes the literal path segments of every path, codeowners,
+module and url pattern. Every frame value is split into segments once, the
+segments are looked up in the index, and only the rules that have a chance to
+match are tested with the regular matching functions. Rules without a usable
+literal (``*``, ``tags.*`` matchers, ...) are tested like before.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Mapping, MutableSet, Optional, Sequence, Tuple
+
+from cachetools import LRUCache
+
+from sentry import options
+from sentry.ownership.grammar import (
+    CODEOWNERS,
+    MODULE,
+    PATH,
+    URL,
+    Matcher,
+    Rule,
+    load_schema,
+    match_codeowners_value,
+    match_frame_value,
+    match_url_value,
+)
+from sentry.utils import json, metrics
+from sentry.utils.event_frames import find_stack_frames
+from sentry.utils.hashlib import md5_text
+from sentry.utils.safe import PathSearchable, get_path
+
+# Characters which do not match themselves in a glob or codeowners pattern.
+# Everything from the first bracket or brace on is treated as a wildcard, as
+# character classes may contain any of the other characters.
+WILDCARDS = frozenset("*?!")
+GROUPS = frozenset("[{")
+
+# A literal of a pattern is a run of characters without separators or
+# wildcards. It is bounded if it is delimited by a separator or the start
+# or end of the pattern on that side.
+Literal = Tuple[str, bool, bool]
+
+
+def _literals(pattern: str) -> Optional[List[Literal]]:
+    """
+    Splits a pattern into its literals, or returns `None` if the pattern
+    cannot be indexed.
+    """
+    # Backslashes are path separators for `path_normalize` and escape (or
+    # terminate) the pattern for codeowners.
+    if "\\" in pattern or pattern.startswith("!"):
+        return None
+
+    literals: List[Literal] = []
+    start = 0
+    left_bounded = True
+    for i, char in enumerate(pattern):
+        if char == "/" or char in WILDCARDS or char in GROUPS:
+            if i > start:
+                literals.append((pattern[start:i], left_bounded, char == "/"))
+            if char in GROUPS:
+                return literals
+            start = i + 1
+            # `**/` matches any prefix, including one ending in the middle of a segment
+            left_bounded = char == "/" and (i == 0 or pattern[i - 1] not in WILDCARDS)
+    if len(pattern) > start:
+        literals.append((pattern[start:], left_bounded, True))
+    return literals
+
+
+def _segments(value: str) -> List[str]:
+    return value.casefold().replace("\\", "/").split("/")
+
+
+EXACT, PREFIX, SUFFIX = "exact", "prefix", "suffix"
+
+
+def _index_keys(pattern: str) -> List[Tuple[str, str]]:
+    keys = []
+    for literal, left_bounded, right_bounded in _literals(pattern) or ():
+        if left_bounded and right_bounded:
+            keys.append((EXACT, literal.casefold()))
+        elif left_bounded:
+            keys.append((PREFIX, literal.casefold()))
+        elif right_bounded:
+            keys.append((SUFFIX, literal.casefold()))
+    return keys
+
+
+class SegmentIndex:
+    """
+    Maps path segments to the rules that require them.
+
+    A literal bounded on both sides of a pattern has to be equal to one of the
+    segments of a matching value, one only bounded on the left (right) has to
+    be a prefix (suffix) of a segment. Every pattern is indexed under its
+    least common literal. Values are compared case-insensitively, which is
+    never more strict than the matching functions.
+    """
+
+    def __init__(self) -> None:
+        self.exact: Dict[str, List[int]] = {}
+        self.prefix: Dict[str, List[int]] = {}
+        self.suffix: Dict[str, List[int]] = {}
+        self.unindexed: List[int] = []
+        self.size = 0
+        self._pending: List[Tuple[int, List[Tuple[str, str]]]] = []
+        self._prefix_lengths: Sequence[int] = ()
+        self._suffix_lengths: Sequence[int] = ()
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def add(self, pattern: str, rule_index: int) -> None:
+        self.size += 1
+        self._pending.append((rule_index, _index_keys(pattern)))
+
+    def freeze(self) -> None:
+        counts = Counter(key for _, keys in self._pending for key in set(keys))
+        tables = {EXACT: self.exact, PREFIX: self.prefix, SUFFIX: self.suffix}
+        for rule_index, keys in self._pending:
+            if not keys:
+                self.unindexed.append(rule_index)
+                continue
+            kind, literal = min(keys, key=lambda key: (counts[key], key[0] != EXACT, -len(key[1])))
+            tables[kind].setdefault(literal, []).append(rule_index)
+        self._pending = []
+        self._prefix_lengths = sorted({len(literal) for literal in self.prefix})
+        self._suffix_lengths = sorted({len(literal) for literal in self.suffix})
+
+    def all(self) -> List[int]:
+        return [
+            *self.unindexed,
+            *(i for rules in self.exact.values() for i in rules),
+            *(i for rules in self.prefix.values() for i in rules),
+            *(i for rules in self.suffix.values() for i in rules),
+        ]
+
+    def candidates(self, value: Any) -> List[int]:
+        """
+        Returns the rules which may match `value`.
+        """
+        if not isinstance(value, str):
+            return self.all()
+
+        rv = list(self.unindexed)
+        for segment in _segments(value):
+            rules = self.exact.get(segment)
+            if rules:
+                rv.extend(rules)
+            for length in self._prefix_lengths:
+                if length > len(segment):
+                    break
+                rules = self.prefix.get(segment[:length])
+                if rules:
+                    rv.extend(rules)
+            for length in self._suffix_lengths:
+                if length > len(segment):
+                    break
+                rules = self.suffix.get(segment[-length:])
+                if rules:
+                    rv.extend(rules)
+        return rv
+
+
+class CompiledRules:
+    """
+    The rules of an ownership schema, indexed for matching.
+
+    `matching_rules(data)` returns the same rules, in the same order, as
+    testing every rule on its own.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = rules
+        self.paths = SegmentIndex()
+        self.modules = SegmentIndex()
+        self.urls = SegmentIndex()
+        self.others: List[int] = []
+        self.match_functions: List[Optional[Callable[[Any, str], bool]]] = []
+
+        for i, rule in enumerate(rules):
+            matcher_type, pattern = rule.matcher.type, rule.matcher.pattern
+            if matcher_type == PATH:
+                self.paths.add(pattern, i)
+                self.match_functions.append(match_frame_value)
+            elif matcher_type == CODEOWNERS:
+                self.paths.add(pattern, i)
+                self.match_functions.append(match_codeowners_value)
+            elif matcher_type == MODULE:
+                self.modules.add(pattern, i)
+                self.match_functions.append(match_frame_value)
+            elif matcher_type == URL:
+                self.urls.add(pattern, i)
+                self.match_functions.append(match_url_value)
+            else:
+                self.others.append(i)
+                self.match_functions.append(None)
+
+        for index in (self.paths, self.modules, self.urls):
+            index.freeze()
+
+    def _match_values(
+        self, index: SegmentIndex, values: Sequence[Any], matched: MutableSet[int]
+    ) -> None:
+        candidates: Dict[int, List[Any]] = defaultdict(list)
+        for value in values:
+            for i in set(index.candidates(value)):
+                candidates[i].append(value)
+
+        # Test one rule after the other, so the matching functions can reuse
+        # the compiled pattern for all values.
+        for i, rule_values in candidates.items():
+            match_function = self.match_functions[i]
+            assert match_function is not None
+            pattern = self.rules[i].matcher.pattern
+            if any(match_function(value, pattern) for value in rule_values):
+                matched.add(i)
+
+    def matching_rules(self, data: PathSearchable) -> Sequence[Rule]:
+        matched: MutableSet[int] = set()
+
+        if self.paths:
+            frames, keys = Matcher.munge_if_needed(data)
+            self._match_values(self.paths, _frame_values(frames, keys), matched)
+        if self.modules:
+            self._match_values(
+                self.modules, _frame_values(find_stack_frames(data), ["module"]), matched
+            )
+        if self.urls and isinstance(data, Mapping):
+            url = get_path(data, "request", "url")
+            if url:
+                self._match_values(self.urls, [url], matched)
+        for i in self.others:
+            if self.rules[i].test(data):
+                matched.add(i)
+
+        return [rule for i, rule in enumerate(self.rules) if i in matched]
+
+
+def _frame_values(frames: Sequence[Mapping[str, Any]], keys: Sequence[str]) -> List[Any]:
+    return [
+        value
+        for frame in frames
+        if isinstance(frame, Mapping)
+        for value in (frame.get(key) for key in keys)
+        if value
+    ]
+
+
+class CompiledRulesCache:
+    """
+    A process-local LRU of compiled schemas, keyed by a hash of the schema.
+
+    The size is controlled by the ``ownership.compiled-matcher.cache-size``
+    option, ``0`` disables the compiled matcher.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cache: LRUCache[str, CompiledRules] | None = None
+
+    def _get_cache(self) -> LRUCache[str, CompiledRules] | None:
+        maxsize = options.get("ownership.compiled-matcher.cache-size")
+        if maxsize <= 0:
+            self._cache = None
+        elif self._cache is None or self._cache.maxsize != maxsize:
+            self._cache = LRUCache(maxsize=maxsize)
+        return self._cache
+
+    def get(self, schema: Mapping[str, Any]) -> CompiledRules | None:
+        with self._lock:
+            cache = self._get_cache()
+        if cache is None:
+            return None
+
+        key = md5_text(json.dumps(schema)).hexdigest()
+        with self._lock:
+            compiled = cache.get(key)
+        metrics.incr("ownership.compiled_rules.get", tags={"hit": compiled is not None})
+        if compiled is None:
+            with metrics.timer("ownership.compiled_rules.compile"):
+                compiled = CompiledRules(load_schema(schema))
+            with self._lock:
+                cache[key] = compiled
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache = None
+
+
+compiled_rules_cache = CompiledRulesCache()
@@ -65,6 +65,22 @@ _       = space*
 )
 
 
+def match_url_value(value: Optional[str], pattern: str) -> bool:
+    return bool(glob_match(value, pattern, ignorecase=True))
+
+
+def match_frame_value(value: Optional[str], pattern: str) -> bool:
+    return bool(glob_match(value, pattern, ignorecase=True, path_normalize=True))
+
+
+def match_codeowners_value(value: Optional[str], pattern: str) -> bool:
+    # Codeowners has a slightly different syntax compared to issue owners
+    # As such we need to match it using gitignore logic.
+    # See syntax documentation here:
+    # https://docs.github.com/en/github/creating-cloning-and-archiving-repositories/creating-a-repository-on-github/about-code-owners
+    return bool(codeowners_match(value, pattern))
+
+
 class Rule(namedtuple("Rule", "matcher owners")):
     """
     A Rule represents a single line in an Ownership file.
@@ -141,11 +157,7 @@ class Matcher(namedtuple("Matcher", "type pattern")):
         elif self.type == CODEOWNERS:
             return self.test_frames(
                 *self.munge_if_needed(data),
-                # Codeowners has a slightly different syntax compared to issue owners
-                # As such we need to match it using gitignore logic.
-                # See syntax documentation here:
-                # https://docs.github.com/en/github/creating-cloning-and-archiving-repositories/creating-a-repository-on-github/about-code-owners
-                match_frame_value_func=lambda val, pattern: bool(codeowners_match(val, pattern)),
+                match_frame_value_func=match_codeowners_value,
             )
         return False
 
@@ -154,15 +166,13 @@ class Matcher(namedtuple("Matcher", "type pattern")):
             return False
 
         url = get_path(data, "request", "url")
-        return url and bool(glob_match(url, self.pattern, ignorecase=True))
+        return url and match_url_value(url, self.pattern)
 
     def test_frames(
         self,
         frames: Sequence[Mapping[str, Any]],
         keys: Sequence[str],
-        match_frame_value_func: Callable[[Optional[str], str], bool] = lambda val, pattern: bool(
-            glob_match(val, pattern, ignorecase=True, path_normalize=True)
-        ),
+        match_frame_value_func: Callable[[Optional[str], str], bool] = match_frame_value,
     ) -> bool:
         for frame in (f for f in frames if isinstance(f, Mapping)):
             for key in keys:
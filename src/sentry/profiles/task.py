@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+from contextlib import ExitStack
 from copy import deepcopy
 from datetime import datetime, timezone
 from time import time
@@ -13,6 +14,7 @@ from symbolic.proguard import ProguardMapper
 
 from sentry import options, quotas
 from sentry.constants import DataCategory
+from sentry.lang.java.proguard import proguard_mapper_cache
 from sentry.lang.javascript.processing import _handles_frame as is_valid_javascript_frame
 from sentry.lang.native.processing import _merge_image
 from sentry.lang.native.symbolicator import Symbolicator, SymbolicatorTaskKind
@@ -712,11 +714,16 @@ def _deobfuscate(profile: Profile, project: Project) -> None:
         if debug_file_path is None:
             return
 
-    with sentry_sdk.start_span(op="proguard.open"):
-        mapper = ProguardMapper.open(debug_file_path)
-        if not mapper.has_line_info:
-            return
+    with ExitStack() as stack:
+        with sentry_sdk.start_span(op="proguard.open"):
+            mapper = stack.enter_context(proguard_mapper_cache.open(debug_file_id, debug_file_path))
+            if not mapper.has_line_info:
+                return
+
+        _remap_methods(profile, mapper)
+
 
+def _remap_methods(profile: Profile, mapper: ProguardMapper) -> None:
     with sentry_sdk.start_span(op="proguard.remap"):
         for method in profile["profile"]["methods"]:
             method.setdefault("data", {})
@@ -794,11 +801,16 @@ def _deobfuscate_v2(profile: Profile, project: Project) -> None:
         if debug_file_path is None:
             return
 
-    with sentry_sdk.start_span(op="proguard.open"):
-        mapper = ProguardMapper.open(debug_file_path)
-        if not mapper.has_line_info:
-            return
+    with ExitStack() as stack:
+        with sentry_sdk.start_span(op="proguard.open"):
+            mapper = stack.enter_context(proguard_mapper_cache.open(debug_file_id, debug_file_path))
+            if not mapper.has_line_info:
+                return
+
+        _remap_methods_v2(profile, mapper)
+
 
+def _remap_methods_v2(profile: Profile, mapper: ProguardMapper) -> None:
     with sentry_sdk.start_span(op="proguard.remap"):
         for method in profile["profile"]["methods"]:
             method.setdefault("data", {})
@@ -210,6 +210,46 @@ def get_project_config(
             return _get_project_config(project, full_config=full_config, project_keys=project_keys)
 
 
+def get_project_key_configs(
+    project: Project, project_keys: Sequence[ProjectKey], full_config: bool = True
+) -> Dict[str, MutableMapping[str, Any]]:
+    """Constructs the config dictionaries for several keys of the same project.
+
+    Only the public key and quotas differ between the configs of a project's keys, so the
+    project-scoped part of the config is computed once and shared between all keys.
+
+    :param project: The project to load configuration for.
+    :param project_keys: The keys of the project to build a config for.
+    :return: A dict mapping public keys to their config dictionary.
+    """
+    if not project_keys:
+        return {}
+
+    first_key, *other_keys = project_keys
+    base = get_project_config(project, full_config=full_config, project_keys=[first_key]).to_dict()
+    configs = {first_key.public_key: base}
+
+    for project_key in other_keys:
+        if base.get("disabled"):
+            configs[project_key.public_key] = dict(base)
+            continue
+
+        config = dict(base["config"])
+        config.pop("quotas", None)
+        if full_config:
+            with Hub.current.start_span(op="get_all_quotas"):
+                if quotas_config := get_quotas(project, keys=[project_key]):
+                    config["quotas"] = quotas_config
+
+        configs[project_key.public_key] = {
+            **base,
+            "publicKeys": get_public_key_configs(project, full_config, project_keys=[project_key]),
+            "config": config,
+        }
+
+    return configs
+
+
 def get_dynamic_sampling_config(project: Project) -> Optional[Mapping[str, Any]]:
     if features.has("organizations:dynamic-sampling", project.organization):
         # For compatibility reasons we want to return an empty list of old rules. This has been done in order to make
@@ -54,8 +54,7 @@ class RedisProjectConfigCache(ProjectConfigCache):
             "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
         )
 
-    def get(self, public_key):
-        rv = self.cluster_read.get(self.__get_redis_key(public_key))
+    def __decode(self, rv):
         if rv is not None:
             try:
                 rv = zstandard.decompress(rv).decode()
@@ -64,3 +63,16 @@ class RedisProjectConfigCache(ProjectConfigCache):
                 pass
             return json.loads(rv)
         return None
+
+    def get(self, public_key):
+        return self.__decode(self.cluster_read.get(self.__get_redis_key(public_key)))
+
+    def get_many(self, public_keys):
+        public_keys = list(public_keys)
+        # Note: Those are multiple pipelines, one per cluster node
+        with self.cluster_read.pipeline() as p:
+            for public_key in public_keys:
+                p.get(self.__get_redis_key(public_key))
+            values = p.execute()
+
+        return {public_key: self.__decode(value) for public_key, value in zip(public_keys, values)}
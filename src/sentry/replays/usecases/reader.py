@@ -3,9 +3,10 @@ from __future__ import annotations
 import functools
 import uuid
 import zlib
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Iterator, List, Optional
+from typing import Callable, Deque, Iterator, List, Optional
 
 import sentry_sdk
 from django.db.models import Prefetch
@@ -24,12 +25,16 @@ from snuba_sdk import (
     Request,
 )
 
+from sentry import options
 from sentry.models.files.file import File
 from sentry.models.files.fileblobindex import FileBlobIndex
 from sentry.replays.lib.storage import RecordingSegmentStorageMeta, filestore, storage
 from sentry.replays.models import ReplayRecordingSegment
 from sentry.utils.snuba import raw_snql_query
 
+# Downloads are scheduled ahead by their expected size, but never more than this many per worker.
+MAX_QUEUED_DOWNLOADS_PER_WORKER = 4
+
 # METADATA QUERY BEHAVIOR.
 
 
@@ -243,7 +248,11 @@ def _fetch_segments_from_snuba(
 
 
 def download_segments(segments: List[RecordingSegmentStorageMeta]) -> Iterator[bytes]:
-    """Download segment data from remote storage."""
+    """Download segment data from remote storage.
+
+    Segments are downloaded concurrently and streamed in order, decompressing each one
+    incrementally as it is written to the response.
+    """
 
     # start a sentry transaction to pass to the thread pool workers
     transaction = sentry_sdk.start_transaction(
@@ -252,25 +261,102 @@ def download_segments(segments: List[RecordingSegmentStorageMeta]) -> Iterator[b
         sampled=True,
     )
 
-    download_segment_with_fixed_args = functools.partial(
-        download_segment, transaction=transaction, current_hub=sentry_sdk.Hub.current
+    download_segment_blob_with_fixed_args = functools.partial(
+        download_segment_blob, transaction=transaction, current_hub=sentry_sdk.Hub.current
     )
 
     yield b"["
-    # Map all of the segments to a worker process for download.
-    with ThreadPoolExecutor(max_workers=10) as exe:
-        results = exe.map(download_segment_with_fixed_args, segments)
+    results = iter_downloads(
+        segments,
+        download_segment_blob_with_fixed_args,
+        max_workers=options.get("replay.storage.download-concurrency"),
+        max_inflight_bytes=options.get("replay.storage.download-max-inflight-bytes"),
+    )
+    for i, result in enumerate(results):
+        if result is None:
+            yield b"[]"
+        else:
+            yield from iter_decompressed(result)
+
+        if i < len(segments) - 1:
+            yield b","
+    yield b"]"
+    transaction.finish()
+
 
-        for i, result in enumerate(results):
-            if result is None:
-                yield b"[]"
+def iter_downloads(
+    segments: List[RecordingSegmentStorageMeta],
+    download: Callable[[RecordingSegmentStorageMeta], Optional[bytes]],
+    max_workers: int,
+    max_inflight_bytes: int,
+) -> Iterator[Optional[bytes]]:
+    """Download segments on a thread pool and yield their blobs in order.
+
+    Rather than downloading as far ahead as there are workers, downloads are scheduled as long
+    as the blobs held in memory (downloaded but not yet consumed, plus the expected size of the
+    running downloads) stay below `max_inflight_bytes`. The expected size of a download is the
+    average size of the blobs seen so far. At least one download is always in flight, and at
+    most `MAX_QUEUED_DOWNLOADS_PER_WORKER` per worker are scheduled ahead.
+    """
+    remaining = iter(segments)
+    pending: Deque[Future[Optional[bytes]]] = deque()
+    downloaded_bytes = 0
+    downloaded_count = 0
+
+    def inflight_bytes() -> int:
+        average = downloaded_bytes // downloaded_count if downloaded_count else 0
+        total = 0
+        for future in pending:
+            if future.done() and future.exception() is None:
+                total += len(future.result() or b"")
             else:
+                total += average
+        return total
+
+    def can_schedule() -> bool:
+        if not pending:
+            return True
+        if len(pending) >= max_workers * MAX_QUEUED_DOWNLOADS_PER_WORKER:
+            return False
+        average = downloaded_bytes // downloaded_count if downloaded_count else 0
+        if not average:
+            # Until a non-empty download completes we have nothing to estimate with.
+            return len(pending) < max_workers
+        return inflight_bytes() + average <= max_inflight_bytes
+
+    with ThreadPoolExecutor(max_workers=max_workers) as exe:
+        try:
+            while True:
+                while can_schedule():
+                    segment = next(remaining, None)
+                    if segment is None:
+                        break
+                    pending.append(exe.submit(download, segment))
+
+                if not pending:
+                    return
+
+                result = pending.popleft().result()
+                downloaded_bytes += len(result or b"")
+                downloaded_count += 1
                 yield result
+        finally:
+            # Don't download the remaining segments if the client went away.
+            for future in pending:
+                future.cancel()
 
-            if i < len(segments) - 1:
-                yield b","
-    yield b"]"
-    transaction.finish()
+
+def download_segment_blob(
+    segment: RecordingSegmentStorageMeta,
+    transaction: Span,
+    current_hub: sentry_sdk.Hub,
+) -> Optional[bytes]:
+    """Return the (possibly compressed) segment blob."""
+    with sentry_sdk.Hub(current_hub):
+        with transaction.start_child(op="download_segment", description="thread_task"):
+            driver = filestore if segment.file_id else storage
+            with sentry_sdk.start_span(op="download_segment", description="download"):
+                return driver.get(segment)
 
 
 def download_segment(
@@ -279,25 +365,13 @@ def download_segment(
     current_hub: sentry_sdk.Hub,
 ) -> Optional[bytes]:
     """Return the segment blob data."""
-    with sentry_sdk.Hub(current_hub):
-        with transaction.start_child(
-            op="download_segment",
-            description="thread_task",
-        ):
-            driver = filestore if segment.file_id else storage
-            with sentry_sdk.start_span(
-                op="download_segment",
-                description="download",
-            ):
-                result = driver.get(segment)
-            if result is None:
-                return None
+    result = download_segment_blob(segment, transaction, current_hub)
+    if result is None:
+        return None
 
-            with sentry_sdk.start_span(
-                op="download_segment",
-                description="decompress",
-            ):
-                return decompress(result)
+    with sentry_sdk.Hub(current_hub):
+        with sentry_sdk.start_span(op="download_segment", description="decompress"):
+            return decompress(result)
 
 
 def decompress(buffer: bytes) -> bytes:
@@ -310,3 +384,22 @@ def decompress(buffer: bytes) -> bytes:
         return buffer
 
     return zlib.decompress(buffer, zlib.MAX_WBITS | 32)
+
+
+def iter_decompressed(buffer: bytes, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Yield the decompressed output in chunks of at most `chunk_size` bytes."""
+    if buffer.startswith(b"["):
+        yield buffer
+        return
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    data = buffer
+    while data:
+        chunk = decompressor.decompress(data, chunk_size)
+        if chunk:
+            yield chunk
+        data = decompressor.unconsumed_tail
+
+    chunk = decompressor.flush()
+    if chunk:
+        yield chunk
@@ -4,8 +4,9 @@ import abc
 import contextlib
 import logging
 import re
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, Dict, Mapping, Tuple
+from typing import Any, ContextManager, Dict, Mapping, Optional, Sequence, Tuple, Type
 
 from django import forms
 from django.core.cache import cache
@@ -14,6 +15,7 @@ from django.utils import timezone
 from sentry import release_health, tsdb
 from sentry.eventstore.models import GroupEvent
 from sentry.issues.constants import get_issue_tsdb_group_model, get_issue_tsdb_user_group_model
+from sentry.issues.grouptype import GroupCategory
 from sentry.receivers.rules import DEFAULT_RULE_LABEL
 from sentry.rules import EventState
 from sentry.rules.conditions.base import EventCondition
@@ -23,6 +25,7 @@ from sentry.types.condition_activity import (
     round_to_five_minute,
 )
 from sentry.utils import metrics
+from sentry.utils.hashlib import hash_values
 from sentry.utils.snuba import options_override
 
 standard_intervals = {
@@ -48,6 +51,9 @@ comparison_types = {
     COMPARISON_TYPE_COUNT: COMPARISON_TYPE_COUNT,
     COMPARISON_TYPE_PERCENT: COMPARISON_TYPE_PERCENT,
 }
+# Results of batched frequency queries are shared by all events of a group for this many seconds,
+# has to be a divisor of 60.
+FREQUENCY_RESULT_CACHE_TTL = 10
 
 
 class EventFrequencyForm(forms.Form):
@@ -92,8 +98,13 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
     intervals = standard_intervals
     form_cls = EventFrequencyForm
 
+    # Whether `batch_query_hook` is implemented, so queries can be resolved by an
+    # `EventFrequencyBatch`.
+    supports_batch_query = False
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.tsdb = kwargs.pop("tsdb", tsdb)
+        self.batch: EventFrequencyBatch | None = kwargs.pop("batch", None)
         self.form_fields = {
             "value": {"type": "number", "placeholder": 100},
             "interval": {
@@ -162,6 +173,11 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
         raise NotImplementedError
 
     def query(self, event: GroupEvent, start: datetime, end: datetime, environment_id: str) -> int:
+        if self.batch is not None:
+            batch_result = self.batch.get(self, event, start, end, environment_id)
+            if batch_result is not None:
+                return batch_result
+
         query_result = self.query_hook(event, start, end, environment_id)
         metrics.incr(
             "rules.conditions.queried_snuba",
@@ -178,14 +194,47 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
         """ """
         raise NotImplementedError  # subclass must implement
 
+    def batch_query_hook(
+        self,
+        group_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        environment_id: str,
+        issue_category: GroupCategory,
+        organization_id: int,
+    ) -> Mapping[int, int]:
+        """
+        Same as `query_hook`, but for many groups of the same category at once.
+        """
+        raise NotImplementedError  # subclass must implement if `supports_batch_query`
+
+    def add_to_batch(self, event: GroupEvent, batch: EventFrequencyBatch) -> None:
+        """
+        Registers the queries `get_rate` is going to run with `batch`.
+        """
+        interval, value = self._get_options()
+        if not (interval and value is not None) or not self.supports_batch_query:
+            return
+
+        _, duration = self.intervals[interval]
+        # TODO(mgaeta): Bug: Rule is optional.
+        environment_id = self.rule.environment_id  # type: ignore
+        end = batch.now
+        batch.add(self, event, end - duration, end, environment_id)
+        if self.get_option("comparisonType", COMPARISON_TYPE_COUNT) == COMPARISON_TYPE_PERCENT:
+            comparison_end = end - comparison_intervals[self.get_option("comparisonInterval")][1]
+            batch.add(self, event, comparison_end - duration, comparison_end, environment_id)
+
     def get_rate(self, event: GroupEvent, interval: str, environment_id: str) -> int:
         _, duration = self.intervals[interval]
-        end = timezone.now()
-        # For conditions with interval >= 1 hour we don't need to worry about read your writes
-        # consistency. Disable it so that we can scale to more nodes.
-        option_override_cm = contextlib.nullcontext()
-        if duration >= timedelta(hours=1):
-            option_override_cm = options_override({"consistent": False})
+        if self.batch is not None and self.supports_batch_query:
+            end = self.batch.now
+            # The batch may resolve queries of other intervals along with these, so it picks
+            # the consistency of every query itself.
+            option_override_cm: ContextManager[None] = contextlib.nullcontext()
+        else:
+            end = timezone.now()
+            option_override_cm = get_consistency_override(duration)
         with option_override_cm:
             result: int = self.query(event, end - duration, end, environment_id=environment_id)
             comparison_type = self.get_option("comparisonType", COMPARISON_TYPE_COUNT)
@@ -222,6 +271,7 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
 class EventFrequencyCondition(BaseEventFrequencyCondition):
     id = "sentry.rules.conditions.event_frequency.EventFrequencyCondition"
     label = "The issue is seen more than {value} times in {interval}"
+    supports_batch_query = True
 
     def query_hook(
         self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
@@ -239,6 +289,27 @@ class EventFrequencyCondition(BaseEventFrequencyCondition):
         )
         return sums[event.group_id]
 
+    def batch_query_hook(
+        self,
+        group_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        environment_id: str,
+        issue_category: GroupCategory,
+        organization_id: int,
+    ) -> Mapping[int, int]:
+        sums: Mapping[int, int] = self.tsdb.get_sums(
+            model=get_issue_tsdb_group_model(issue_category),
+            keys=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            use_cache=True,
+            tenant_ids={"organization_id": organization_id},
+            referrer_suffix="batch_alert_event_frequency",
+        )
+        return sums
+
     def get_preview_aggregate(self) -> Tuple[str, str]:
         return "count", "roundedTime"
 
@@ -246,6 +317,7 @@ class EventFrequencyCondition(BaseEventFrequencyCondition):
 class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
     id = "sentry.rules.conditions.event_frequency.EventUniqueUserFrequencyCondition"
     label = "The issue is seen by more than {value} users in {interval}"
+    supports_batch_query = True
 
     def query_hook(
         self, event: GroupEvent, start: datetime, end: datetime, environment_id: str
@@ -263,6 +335,27 @@ class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
         )
         return totals[event.group_id]
 
+    def batch_query_hook(
+        self,
+        group_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        environment_id: str,
+        issue_category: GroupCategory,
+        organization_id: int,
+    ) -> Mapping[int, int]:
+        totals: Mapping[int, int] = self.tsdb.get_distinct_counts_totals(
+            model=get_issue_tsdb_user_group_model(issue_category),
+            keys=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            use_cache=True,
+            tenant_ids={"organization_id": organization_id},
+            referrer_suffix="batch_alert_event_uniq_user_frequency",
+        )
+        return totals
+
     def get_preview_aggregate(self) -> Tuple[str, str]:
         return "uniq", "user"
 
@@ -391,6 +484,142 @@ class EventFrequencyPercentCondition(BaseEventFrequencyCondition):
         raise NotImplementedError
 
 
+BatchKey = Tuple[Type[BaseEventFrequencyCondition], GroupCategory, int, datetime, datetime, Any]
+
+
+class EventFrequencyBatch:
+    """
+    Resolves the frequency queries of many conditions, rules and events together.
+
+    Conditions register the queries they are going to run with `add`. The first
+    `get` then resolves all of them at once: results are looked up in a
+    short-lived per-group cache shared by all processes first, and the remaining
+    ones are fetched with a single TSDB query for every distinct condition type,
+    time range and environment, covering all groups.
+
+    All queries end at `now`, which is rounded down to the TTL of the cache so that
+    events of the same group seen within that time share their results.
+    """
+
+    def __init__(self, now: datetime | None = None) -> None:
+        now = now or timezone.now()
+        self.now = now.replace(
+            second=now.second - now.second % FREQUENCY_RESULT_CACHE_TTL, microsecond=0
+        )
+        self._pending: Dict[BatchKey, Dict[int, BaseEventFrequencyCondition]] = defaultdict(dict)
+        self._results: Dict[Tuple[BatchKey, int], int] = {}
+
+    @staticmethod
+    def _get_key(
+        condition: BaseEventFrequencyCondition,
+        event: GroupEvent,
+        start: datetime,
+        end: datetime,
+        environment_id: Any,
+    ) -> BatchKey:
+        return (
+            type(condition),
+            event.group.issue_category,
+            event.group.project.organization_id,
+            start,
+            end,
+            environment_id,
+        )
+
+    @staticmethod
+    def _get_cache_key(key: BatchKey, group_id: int) -> str:
+        condition_cls, _, _, start, end, environment_id = key
+        return "r.c.efb:%s" % hash_values(
+            [
+                condition_cls.id,
+                int(start.timestamp()),
+                int(end.timestamp()),
+                environment_id,
+                group_id,
+            ]
+        )
+
+    def add(
+        self,
+        condition: BaseEventFrequencyCondition,
+        event: GroupEvent,
+        start: datetime,
+        end: datetime,
+        environment_id: Any,
+    ) -> None:
+        key = self._get_key(condition, event, start, end, environment_id)
+        if (key, event.group_id) not in self._results:
+            self._pending[key].setdefault(event.group_id, condition)
+
+    def get(
+        self,
+        condition: BaseEventFrequencyCondition,
+        event: GroupEvent,
+        start: datetime,
+        end: datetime,
+        environment_id: Any,
+    ) -> Optional[int]:
+        """
+        Returns the result of a query, or `None` if it can not be batched.
+        """
+        if not condition.supports_batch_query:
+            return None
+
+        key = self._get_key(condition, event, start, end, environment_id)
+        if (key, event.group_id) not in self._results:
+            self.add(condition, event, start, end, environment_id)
+            self.resolve()
+        return self._results.get((key, event.group_id))
+
+    def resolve(self) -> None:
+        pending, self._pending = self._pending, defaultdict(dict)
+        if not pending:
+            return
+
+        cache_keys = {
+            self._get_cache_key(key, group_id): (key, group_id)
+            for key, groups in pending.items()
+            for group_id in groups
+        }
+        cached = cache.get_many(list(cache_keys))
+        for cache_key, value in cached.items():
+            self._results[cache_keys[cache_key]] = value
+        metrics.incr("rules.conditions.batch.cache_hit", amount=len(cached))
+
+        to_cache = {}
+        for key, groups in pending.items():
+            group_ids = [group_id for group_id in groups if (key, group_id) not in self._results]
+            if not group_ids:
+                continue
+
+            condition_cls, issue_category, organization_id, start, end, environment_id = key
+            # Any of the conditions can run the query, they only differ in their thresholds.
+            condition = groups[group_ids[0]]
+            with get_consistency_override(end - start):
+                values = condition.batch_query_hook(
+                    group_ids, start, end, environment_id, issue_category, organization_id
+                )
+            metrics.incr(
+                "rules.conditions.batch.queried_snuba",
+                tags={"condition": re.sub("(?!^)([A-Z]+)", r"_\1", condition_cls.__name__).lower()},
+            )
+            for group_id in group_ids:
+                value = values.get(group_id, 0)
+                self._results[(key, group_id)] = value
+                to_cache[self._get_cache_key(key, group_id)] = value
+
+        if to_cache:
+            cache.set_many(to_cache, FREQUENCY_RESULT_CACHE_TTL)
+
+
+def get_consistency_override(duration: timedelta) -> ContextManager[None]:
+    # For conditions with interval >= 1 hour we don't need to worry about read your writes
+    # consistency. Disable it so that we can scale to more nodes.
+    if duration >= timedelta(hours=1):
+        return options_override({"consistent": False})
+    return contextlib.nullcontext()
+
+
 def bucket_count(start: datetime, end: datetime, buckets: Dict[datetime, int]) -> int:
     rounded_end = round_to_five_minute(end)
     rounded_start = round_to_five_minute(start)
@@ -20,7 +20,7 @@ from typing import (
 from django.core.cache import cache
 from django.utils import timezone
 
-from sentry import analytics
+from sentry import analytics, options
 from sentry.eventstore.models import GroupEvent
 from sentry.models.environment import Environment
 from sentry.models.grouprulestatus import GroupRuleStatus
@@ -29,6 +29,10 @@ from sentry.models.rulesnooze import RuleSnooze
 from sentry.rules import EventState, history, rules
 from sentry.rules.actions.base import EventAction
 from sentry.rules.conditions.base import EventCondition
+from sentry.rules.conditions.event_frequency import (
+    BaseEventFrequencyCondition,
+    EventFrequencyBatch,
+)
 from sentry.rules.filters.base import EventFilter
 from sentry.types.rules import RuleFuture
 from sentry.utils.hashlib import hash_values
@@ -77,6 +81,7 @@ class RuleProcessor:
         self.grouped_futures: MutableMapping[
             str, Tuple[Callable[[GroupEvent, Sequence[RuleFuture]], None], List[RuleFuture]]
         ] = {}
+        self.frequency_batch: EventFrequencyBatch | None = None
 
     def get_rules(self) -> Sequence[Rule]:
         """Get all of the rules for this project from the DB (or cache)."""
@@ -152,7 +157,12 @@ class RuleProcessor:
             self.logger.warning("Unregistered condition %r", condition["id"])
             return None
 
-        condition_inst = condition_cls(self.project, data=condition, rule=rule)
+        kwargs = {}
+        if self.frequency_batch is not None and issubclass(
+            condition_cls, BaseEventFrequencyCondition
+        ):
+            kwargs["batch"] = self.frequency_batch
+        condition_inst = condition_cls(self.project, data=condition, rule=rule, **kwargs)
         if not isinstance(condition_inst, (EventCondition, EventFilter)):
             self.logger.warning("Unregistered condition %r", condition["id"])
             return None
@@ -181,6 +191,45 @@ class RuleProcessor:
             has_reappeared=self.has_reappeared,
         )
 
+    def get_frequency_batch(
+        self,
+        rules_: Sequence[Rule],
+        rule_statuses: Mapping[int, GroupRuleStatus],
+        snoozed_rules: Collection[int],
+    ) -> EventFrequencyBatch | None:
+        """
+        Collects the frequency queries of all rules which are going to be evaluated,
+        so they can be resolved together instead of one query per condition.
+        """
+        try:
+            environment = self.event.get_environment()
+        except Environment.DoesNotExist:
+            return None
+
+        batch = EventFrequencyBatch()
+        now = timezone.now()
+        for rule in rules_:
+            if rule.id in snoozed_rules:
+                continue
+            if rule.environment_id is not None and environment.id != rule.environment_id:
+                continue
+            status = rule_statuses[rule.id]
+            frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
+            if status.last_active and status.last_active > now - timedelta(minutes=frequency):
+                continue
+
+            for condition in rule.data.get("conditions", ()):
+                condition_cls = rules.get(condition["id"])
+                if condition_cls is None or not issubclass(
+                    condition_cls, BaseEventFrequencyCondition
+                ):
+                    continue
+                condition_inst = condition_cls(self.project, data=condition, rule=rule, batch=batch)
+                safe_execute(
+                    condition_inst.add_to_batch, self.event, batch, _with_transaction=False
+                )
+        return batch
+
     def apply_rule(self, rule: Rule, status: GroupRuleStatus) -> None:
         """
         If all conditions and filters pass, execute every action.
@@ -319,6 +368,8 @@ class RuleProcessor:
             "rule", flat=True
         )
         rule_statuses = self.bulk_get_rule_status(rules)
+        if options.get("rules.batch-frequency-conditions"):
+            self.frequency_batch = self.get_frequency_batch(rules, rule_statuses, snoozed_rules)
         for rule in rules:
             if rule.id not in snoozed_rules:
                 self.apply_rule(rule, rule_statuses[rule.id])
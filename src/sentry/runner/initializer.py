@@ -555,6 +555,8 @@ def bind_cache_to_option_store() -> None:
     from sentry.options import default_store
 
     default_store.set_cache_impl(default_cache)
+    default_store.push_invalidation = settings.SENTRY_OPTIONS_PUSH_INVALIDATION
+    default_store.poll_interval = settings.SENTRY_OPTIONS_VERSION_POLL_INTERVAL
 
 
 def apply_legacy_settings(settings: Any) -> None:
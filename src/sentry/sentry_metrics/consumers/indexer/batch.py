@@ -1,10 +1,12 @@
 import logging
 import random
 from collections import defaultdict
+from dataclasses import dataclass, field
 from typing import (
     Any,
     Callable,
     Dict,
+    List,
     Mapping,
     MutableMapping,
     MutableSequence,
@@ -28,7 +30,10 @@ from sentry_kafka_schemas.schema_types.snuba_generic_metrics_v1 import GenericMe
 from sentry_kafka_schemas.schema_types.snuba_metrics_v1 import Metric
 
 from sentry import options
-from sentry.sentry_metrics.aggregation_option_registry import get_aggregation_option
+from sentry.sentry_metrics.aggregation_option_registry import (
+    AggregationOption,
+    get_aggregation_option,
+)
 from sentry.sentry_metrics.configuration import MAX_INDEXED_COLUMN_LENGTH
 from sentry.sentry_metrics.consumers.indexer.common import (
     BrokerMeta,
@@ -67,6 +72,42 @@ def _should_sample_debug_log() -> bool:
     return (rate > 0) and random.random() <= rate
 
 
+@dataclass
+class BatchColumns:
+    """
+    The fields of the valid messages of a batch that are needed for indexing,
+    stored column-wise. Row `i` of every column belongs to the message
+    `metas[i]`.
+
+    This is not a columnar decode: the messages are still parsed into
+    `IndexerBatch.parsed_payloads_by_meta`, and the columns are a second copy
+    of these fields for the indexing phase. They are filled while the batch is
+    parsed, so extracting the strings and reconstructing the messages do not
+    have to walk the parsed payloads again.
+    """
+
+    metas: List[BrokerMeta] = field(default_factory=list)
+    org_ids: List[OrgId] = field(default_factory=list)
+    use_case_ids: List[UseCaseID] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    tag_keys: List[Tuple[str, ...]] = field(default_factory=list)
+    tag_values: List[Tuple[str, ...]] = field(default_factory=list)
+    rows: Dict[BrokerMeta, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.metas)
+
+    def append(self, broker_meta: BrokerMeta, parsed_payload: ParsedMessage) -> None:
+        tags = parsed_payload.get("tags") or {}
+        self.rows[broker_meta] = len(self.metas)
+        self.metas.append(broker_meta)
+        self.org_ids.append(parsed_payload["org_id"])
+        self.use_case_ids.append(parsed_payload["use_case_id"])
+        self.names.append(parsed_payload["name"])
+        self.tag_keys.append(tuple(tags.keys()))
+        self.tag_values.append(tuple(tags.values()))
+
+
 class IndexerBatch:
     def __init__(
         self,
@@ -92,6 +133,10 @@ class IndexerBatch:
         self.invalid_msg_meta: Set[BrokerMeta] = set()
         self.filtered_msg_meta: Set[BrokerMeta] = set()
         self.parsed_payloads_by_meta: MutableMapping[BrokerMeta, ParsedMessage] = {}
+        self.columns = BatchColumns()
+
+        # Metric names repeat a lot within a batch, only parse each one once.
+        self.__use_case_ids: MutableMapping[str, UseCaseID] = {}
 
         self._extract_messages()
 
@@ -108,16 +153,18 @@ class IndexerBatch:
         - Produce the invalid messages to DLQ
         - Skip those filtered/invalid message from the indexing phase
         (extract_strings and reconstruct_messages)
+
+        The valid messages are added to `columns`, which the indexing phase
+        operates on.
         """
         skipped_msgs_cnt: MutableMapping[str, int] = defaultdict(int)
+        disabled_namespaces = options.get("sentry-metrics.indexer.disabled-namespaces")
 
         for msg in self.outer_message.payload:
             assert isinstance(msg.value, BrokerValue)
             broker_meta = BrokerMeta(msg.value.partition, msg.value.offset)
 
-            if (namespace := self._extract_namespace(msg.payload.headers)) in options.get(
-                "sentry-metrics.indexer.disabled-namespaces"
-            ):
+            if (namespace := self._extract_namespace(msg.payload.headers)) in disabled_namespaces:
                 assert namespace
                 skipped_msgs_cnt[namespace] += 1
                 self.filtered_msg_meta.add(broker_meta)
@@ -126,6 +173,7 @@ class IndexerBatch:
             try:
                 parsed_payload = self._extract_message(msg)
                 self._validate_message(parsed_payload)
+                self.columns.append(broker_meta, parsed_payload)
                 self.parsed_payloads_by_meta[broker_meta] = parsed_payload
             except Exception as e:
                 self.invalid_msg_meta.add(broker_meta)
@@ -149,7 +197,7 @@ class IndexerBatch:
         assert isinstance(msg.value, BrokerValue)
         try:
             parsed_payload: ParsedMessage = json.loads(
-                msg.payload.value.decode("utf-8"), use_rapid_json=True
+                msg.payload.value.decode("utf-8"), use_rapid_json=True, skip_trace=True
             )
         except rapidjson.JSONDecodeError:
             logger.error(
@@ -159,8 +207,11 @@ class IndexerBatch:
             )
             raise
 
-        assert parsed_payload.get("name", None) is not None
-        parsed_payload["use_case_id"] = use_case_id = extract_use_case_id(parsed_payload["name"])
+        assert (name := parsed_payload.get("name", None)) is not None
+        use_case_id = self.__use_case_ids.get(name)
+        if use_case_id is None:
+            use_case_id = self.__use_case_ids[name] = extract_use_case_id(name)
+        parsed_payload["use_case_id"] = use_case_id
 
         try:
             self.schema_validator(use_case_id.value, parsed_payload)
@@ -258,24 +309,16 @@ class IndexerBatch:
             lambda: defaultdict(set)
         )
 
-        for broker_meta, message in self.parsed_payloads_by_meta.items():
-            if broker_meta in self.invalid_msg_meta or broker_meta in self.filtered_msg_meta:
+        columns = self.columns
+        for row, broker_meta in enumerate(columns.metas):
+            if broker_meta in self.filtered_msg_meta:
                 continue
 
-            metric_name = message["name"]
-            use_case_id = message["use_case_id"]
-            org_id = message["org_id"]
-            tags = message.get("tags", {})
-
-            strings_in_message = {
-                metric_name,
-                *tags.keys(),
-            }
-
+            org_strings = strings[columns.use_case_ids[row]][columns.org_ids[row]]
+            org_strings.add(columns.names[row])
+            org_strings.update(columns.tag_keys[row])
             if self.__should_index_tag_values:
-                strings_in_message.update(tags.values())
-
-            strings[use_case_id][org_id].update(strings_in_message)
+                org_strings.update(columns.tag_values[row])
 
         for use_case_id, org_mapping in strings.items():
             metrics.gauge(
@@ -296,6 +339,8 @@ class IndexerBatch:
             Message[Union[RoutingPayload, KafkaPayload, InvalidMessage]]
         ] = []
         cogs_usage: MutableMapping[UseCaseID, int] = defaultdict(int)
+        aggregation_options: Dict[str, Optional[AggregationOption]] = {}
+        columns = self.columns
 
         for message in self.outer_message.payload:
             used_tags: Set[str] = set()
@@ -315,12 +360,14 @@ class IndexerBatch:
                 continue
             old_payload_value = self.parsed_payloads_by_meta.pop(broker_meta)
 
-            metric_name = old_payload_value["name"]
-            org_id = old_payload_value["org_id"]
-            use_case_id = old_payload_value["use_case_id"]
+            row = columns.rows[broker_meta]
+            metric_name = columns.names[row]
+            org_id = columns.org_ids[row]
+            use_case_id = columns.use_case_ids[row]
             cogs_usage[use_case_id] += 1
             sentry_sdk.set_tag("sentry_metrics.organization_id", org_id)
-            tags = old_payload_value.get("tags", {})
+            tag_keys = columns.tag_keys[row]
+            tag_values = columns.tag_values[row]
             used_tags.add(metric_name)
 
             new_tags: Dict[str, Union[str, int]] = {}
@@ -328,9 +375,10 @@ class IndexerBatch:
             exceeded_org_quotas = 0
 
             try:
-                for k, v in tags.items():
+                org_mapping = mapping[use_case_id][org_id]
+                for k, v in zip(tag_keys, tag_values):
                     used_tags.update({k, v})
-                    new_k = mapping[use_case_id][org_id][k]
+                    new_k = org_mapping[k]
                     if new_k is None:
                         metadata = bulk_record_meta[use_case_id][org_id].get(k)
                         if (
@@ -345,7 +393,7 @@ class IndexerBatch:
 
                     value_to_write: Union[int, str] = v
                     if self.__should_index_tag_values:
-                        new_v = mapping[use_case_id][org_id][v]
+                        new_v = org_mapping[v]
                         if new_v is None:
                             metadata = bulk_record_meta[use_case_id][org_id].get(v)
                             if (
@@ -362,7 +410,11 @@ class IndexerBatch:
 
                     new_tags[str(new_k)] = value_to_write
             except KeyError:
-                logger.error("process_messages.key_error", extra={"tags": tags}, exc_info=True)
+                logger.error(
+                    "process_messages.key_error",
+                    extra={"tags": dict(zip(tag_keys, tag_values))},
+                    exc_info=True,
+                )
                 continue
 
             if exceeded_org_quotas or exceeded_global_quotas:
@@ -389,9 +441,10 @@ class IndexerBatch:
                 continue
 
             fetch_types_encountered = set()
+            org_record_meta = bulk_record_meta[use_case_id][org_id]
             for tag in used_tags:
-                if tag in bulk_record_meta[use_case_id][org_id]:
-                    metadata = bulk_record_meta[use_case_id][org_id][tag]
+                if tag in org_record_meta:
+                    metadata = org_record_meta[tag]
                     fetch_types_encountered.add(metadata.fetch_type)
                     output_message_meta[metadata.fetch_type.value][str(metadata.id)] = tag
 
@@ -399,9 +452,9 @@ class IndexerBatch:
                 "".join(sorted(t.value for t in fetch_types_encountered)), "utf-8"
             )
 
-            numeric_metric_id = mapping[use_case_id][org_id][metric_name]
+            numeric_metric_id = org_mapping[metric_name]
             if numeric_metric_id is None:
-                metadata = bulk_record_meta[use_case_id][org_id].get(metric_name)
+                metadata = org_record_meta.get(metric_name)
                 metrics.incr(
                     "sentry_metrics.indexer.process_messages.dropped_message",
                     tags={
@@ -471,7 +524,9 @@ class IndexerBatch:
                     "value": old_payload_value["value"],
                     "sentry_received_timestamp": sentry_received_timestamp,
                 }
-                if aggregation_option := get_aggregation_option(old_payload_value["name"]):
+                if metric_name not in aggregation_options:
+                    aggregation_options[metric_name] = get_aggregation_option(metric_name)
+                if aggregation_option := aggregation_options[metric_name]:
                     new_payload_v2["aggregation_option"] = aggregation_option.value
 
                 new_payload_value = new_payload_v2
@@ -2,9 +2,22 @@ from __future__ import annotations
 
 import logging
 import random
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Collection, Iterable, Mapping, MutableMapping, Optional, Sequence, Set
+from typing import (
+    Any,
+    Collection,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+from cachetools import LRUCache
 from django.conf import settings
 from django.core.cache import caches
 
@@ -33,6 +46,7 @@ _INDEXER_CACHE_RESOLVE_CACHE_REPLENISHMENT_METRIC = (
 _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-write"
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local-cache"
 
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
@@ -43,6 +57,97 @@ NAMESPACED_READ_FEAT_FLAG = "sentry-metrics.indexer.read-new-cache-namespace"
 
 BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
+REVERSE_RESOLVE_CACHE_NAMESPACE = "rev"
+
+
+def randomized_ttl() -> int:
+    # introduce jitter in the cache_ttl so that when we have large
+    # amount of new keys written into the cache, they don't expire all at once
+    cache_ttl = settings.SENTRY_METRICS_INDEXER_CACHE_TTL
+    jitter = random.uniform(0, 0.25) * cache_ttl
+    return int(cache_ttl + jitter)
+
+
+def _get_use_case(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+class LocalIndexerCache:
+    """
+    A process-local, size-bounded LRU in front of the ``StringIndexerCache``.
+
+    Tag keys and values in the metrics stream are heavily skewed, so most
+    lookups of a consumer are for a small set of strings it has seen before.
+    Entries expire after ``randomized_ttl()``, like the remote cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cache: LRUCache[Tuple[str, str], Tuple[Any, float]] | None = None
+
+    def _get_cache(self) -> LRUCache[Tuple[str, str], Tuple[Any, float]] | None:
+        if not options.get("sentry-metrics.indexer.local-cache.enabled"):
+            self._cache = None
+            return None
+
+        maxsize = options.get("sentry-metrics.indexer.local-cache.size")
+        if self._cache is None or self._cache.maxsize != maxsize:
+            self._cache = LRUCache(maxsize=maxsize)
+        return self._cache
+
+    def get_many(
+        self, namespace: str, keys: Iterable[str], caller: str
+    ) -> MutableMapping[str, Any]:
+        """
+        Returns the values of all keys found in the cache, keys are formatted
+        like "use_case_id:org_id:string".
+        """
+        rv: MutableMapping[str, Any] = {}
+        misses: MutableMapping[str, int] = {}
+        with self._lock:
+            local_cache = self._get_cache()
+            if local_cache is None:
+                return rv
+
+            now = time.monotonic()
+            for key in keys:
+                entry = local_cache.get((namespace, key))
+                if entry is not None and entry[1] > now:
+                    rv[key] = entry[0]
+                else:
+                    if entry is not None:
+                        del local_cache[(namespace, key)]
+                    use_case = _get_use_case(key)
+                    misses[use_case] = misses.get(use_case, 0) + 1
+
+        hits: MutableMapping[str, int] = {}
+        for key in rv:
+            use_case = _get_use_case(key)
+            hits[use_case] = hits.get(use_case, 0) + 1
+
+        for cache_hit, counts in (("true", hits), ("false", misses)):
+            for use_case, amount in counts.items():
+                metrics.incr(
+                    _INDEXER_LOCAL_CACHE_METRIC,
+                    tags={"cache_hit": cache_hit, "use_case": use_case, "caller": caller},
+                    amount=amount,
+                )
+        return rv
+
+    def set_many(self, namespace: str, key_values: Mapping[str, Any]) -> None:
+        with self._lock:
+            local_cache = self._get_cache()
+            if local_cache is None:
+                return
+
+            now = time.monotonic()
+            for key, value in key_values.items():
+                if value is not None:
+                    local_cache[(namespace, key)] = (value, now + randomized_ttl())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache = None
 
 
 class StringIndexerCache:
@@ -53,11 +158,7 @@ class StringIndexerCache:
 
     @property
     def randomized_ttl(self) -> int:
-        # introduce jitter in the cache_ttl so that when we have large
-        # amount of new keys written into the cache, they don't expire all at once
-        cache_ttl = settings.SENTRY_METRICS_INDEXER_CACHE_TTL
-        jitter = random.uniform(0, 0.25) * cache_ttl
-        return int(cache_ttl + jitter)
+        return randomized_ttl()
 
     def _make_cache_key(self, key: str) -> str:
         use_case_id, org_id, string = key.split(":", 2)
@@ -205,9 +306,15 @@ class StringIndexerCache:
 
 
 class CachingIndexer(StringIndexer):
-    def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
+    def __init__(
+        self,
+        cache: StringIndexerCache,
+        indexer: StringIndexer,
+        local_cache: Optional[LocalIndexerCache] = None,
+    ) -> None:
         self.cache = cache
         self.indexer = indexer
+        self.local_cache = local_cache if local_cache is not None else LocalIndexerCache()
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, Set[str]]]
@@ -215,7 +322,15 @@ class CachingIndexer(StringIndexer):
         cache_keys = UseCaseKeyCollection(strings)
         metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=cache_keys.size)
         cache_key_strs = cache_keys.as_strings()
-        cache_results = self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
+        local_results = self.local_cache.get_many(
+            BULK_RECORD_CACHE_NAMESPACE, cache_key_strs, caller="get_many_ids"
+        )
+        remote_key_strs = [k for k in cache_key_strs if k not in local_results]
+        cache_results = (
+            self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, remote_key_strs)
+            if remote_key_strs
+            else {}
+        )
 
         hits = [k for k, v in cache_results.items() if v is not None]
 
@@ -237,6 +352,9 @@ class CachingIndexer(StringIndexer):
             amount=cache_keys.size,
         )
 
+        self.local_cache.set_many(BULK_RECORD_CACHE_NAMESPACE, cache_results)
+        cache_results.update(local_results)
+
         cache_key_results = UseCaseKeyResults()
         cache_key_results.add_use_case_key_results(
             [UseCaseKeyResult.from_string(k, v) for k, v in cache_results.items() if v is not None],
@@ -255,9 +373,9 @@ class CachingIndexer(StringIndexer):
             }
         )
 
-        self.cache.set_many(
-            BULK_RECORD_CACHE_NAMESPACE, db_record_key_results.get_mapped_strings_to_ints()
-        )
+        db_record_strings = db_record_key_results.get_mapped_strings_to_ints()
+        self.cache.set_many(BULK_RECORD_CACHE_NAMESPACE, db_record_strings)
+        self.local_cache.set_many(BULK_RECORD_CACHE_NAMESPACE, db_record_strings)
 
         return cache_key_results.merge(db_record_key_results)
 
@@ -268,6 +386,10 @@ class CachingIndexer(StringIndexer):
     @metric_path_key_compatible_resolve
     def resolve(self, use_case_id: UseCaseID, org_id: int, string: str) -> Optional[int]:
         key = f"{use_case_id.value}:{org_id}:{string}"
+        local_result = self.local_cache.get_many(RESOLVE_CACHE_NAMESPACE, [key], caller="resolve")
+        if key in local_result:
+            return local_result[key]
+
         result = self.cache.get(RESOLVE_CACHE_NAMESPACE, key)
 
         if result and isinstance(result, int):
@@ -275,10 +397,12 @@ class CachingIndexer(StringIndexer):
                 _INDEXER_CACHE_RESOLVE_METRIC,
                 tags={"cache_hit": "true", "use_case": use_case_id.value},
             )
+            self.local_cache.set_many(RESOLVE_CACHE_NAMESPACE, {key: result})
             return result
 
         id = self.indexer.resolve(use_case_id, org_id, string)
         if id is not None:
+            self.local_cache.set_many(RESOLVE_CACHE_NAMESPACE, {key: id})
             metrics.incr(
                 _INDEXER_CACHE_RESOLVE_METRIC,
                 tags={"cache_hit": "false", "use_case": use_case_id.value},
@@ -296,7 +420,17 @@ class CachingIndexer(StringIndexer):
 
     @metric_path_key_compatible_rev_resolve
     def reverse_resolve(self, use_case_id: UseCaseID, org_id: int, id: int) -> Optional[str]:
-        return self.indexer.reverse_resolve(use_case_id, org_id, id)
+        key = f"{use_case_id.value}:{org_id}:{id}"
+        local_result = self.local_cache.get_many(
+            REVERSE_RESOLVE_CACHE_NAMESPACE, [key], caller="reverse_resolve"
+        )
+        if key in local_result:
+            return local_result[key]
+
+        string = self.indexer.reverse_resolve(use_case_id, org_id, id)
+        if string is not None:
+            self.local_cache.set_many(REVERSE_RESOLVE_CACHE_NAMESPACE, {key: string})
+        return string
 
     def bulk_reverse_resolve(
         self, use_case_id: UseCaseID, org_id: int, ids: Collection[int]
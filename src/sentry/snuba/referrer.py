@@ -712,9 +712,13 @@ class Referrer(Enum):
     TSDB_MODELID_4_alert_event_frequency = "tsdb-modelid:4.alert_event_frequency"
     TSDB_MODELID_4_alert_event_frequency_percent = "tsdb-modelid:4.alert_event_frequency_percent"
     TSDB_MODELID_300_user_count_snoozes = "tsdb-modelid:300.user_count_snoozes"
+    TSDB_MODELID_4_batch_alert_event_frequency = "tsdb-modelid:4.batch_alert_event_frequency"
     TSDB_MODELID_300_alert_event_uniq_user_frequency = (
         "tsdb-modelid:300.alert_event_uniq_user_frequency"
     )
+    TSDB_MODELID_300_batch_alert_event_uniq_user_frequency = (
+        "tsdb-modelid:300.batch_alert_event_uniq_user_frequency"
+    )
 
     UNKNOWN = "unknown"
     UNMERGE = "unmerge"
@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+import copy
 import logging
+import threading
 from datetime import datetime, timezone
-from typing import Any, Callable, Mapping, MutableMapping, NamedTuple, Optional, Sequence
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Mapping,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
 
 import sentry_sdk
+from cachetools import TTLCache
 
+from sentry import options
 from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.stacktraces.functions import set_in_app, trim_function_name
+from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import get_path, safe_execute
@@ -16,6 +30,8 @@ from sentry.utils.safe import get_path, safe_execute
 logger = logging.getLogger(__name__)
 op = "stacktrace_processing"
 
+FRAME_CACHE_TIMEOUT = 3600
+
 
 class StacktraceInfo(NamedTuple):
     stacktrace: dict[str, Any]
@@ -52,6 +68,7 @@ class ProcessableFrame:
         self.data = None
         self.cache_key = None
         self.cache_value = None
+        self.new_cache_value = None
         self.processable_frames = processable_frames
 
     def __repr__(self):
@@ -85,8 +102,12 @@ class ProcessableFrame:
         return self.processable_frames[last_idx]
 
     def set_cache_value(self, value):
+        """Stores `value` for the cache key of the frame.  The values of all
+        frames are written to the frame cache together once the event has
+        been processed.
+        """
         if self.cache_key is not None:
-            cache.set(self.cache_key, value, 3600)
+            self.new_cache_value = value
             return True
         return False
 
@@ -121,6 +142,17 @@ class StacktraceProcessingTask:
                 if processor is None or frame.processor == processor:
                     yield frame
 
+    def flush_frame_cache(self):
+        """Writes the cache values set by the processors back to the frame
+        cache in one batch.
+        """
+        values = {
+            frame.cache_key: frame.new_cache_value
+            for frame in self.iter_processable_frames()
+            if frame.cache_key is not None and frame.new_cache_value is not None
+        }
+        frame_cache.set_many(values)
+
 
 class StacktraceProcessor:
     def __init__(self, data, stacktrace_infos, project=None):
@@ -525,11 +557,91 @@ def get_crash_frame_from_event_data(data, frame_filter=None):
         return default
 
 
+class FrameCache:
+    """Caches the values stacktrace processors store for frames with a cache
+    key, see ``ProcessableFrame.set_cache_key_from_values``.
+
+    The keys of all frames of an event are looked up with a single
+    ``get_many`` and the values set while processing it are written back with
+    a single ``set_many``.  A process-local, size- and TTL-bounded LRU can be
+    enabled in front of the Django cache, the values are derived from the
+    hashed inputs of the frame only so they do not go stale.  Values are
+    copied into and out of the local tier, as processors may mutate them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local_cache: TTLCache[str, Any] | None = None
+
+    def _get_local_cache(self) -> TTLCache[str, Any] | None:
+        if not options.get("stacktrace-processing.local-frame-cache.enabled"):
+            self._local_cache = None
+            return None
+
+        maxsize = options.get("stacktrace-processing.local-frame-cache.size")
+        ttl = options.get("stacktrace-processing.local-frame-cache.ttl")
+        if (
+            self._local_cache is None
+            or self._local_cache.maxsize != maxsize
+            or self._local_cache.ttl != ttl
+        ):
+            self._local_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        return self._local_cache
+
+    def get_many(self, keys: Collection[str]) -> dict[str, Any]:
+        rv: dict[str, Any] = {}
+        if not keys:
+            return rv
+
+        with self._lock:
+            local_cache = self._get_local_cache()
+            if local_cache is not None:
+                for key in keys:
+                    value = local_cache.get(key)
+                    if value is not None:
+                        rv[key] = copy.deepcopy(value)
+        local_hits = len(rv)
+
+        missing = [key for key in keys if key not in rv]
+        if missing:
+            remote = {
+                key: value for key, value in cache.get_many(missing).items() if value is not None
+            }
+            if remote and local_cache is not None:
+                with self._lock:
+                    local_cache.update(copy.deepcopy(remote))
+            rv.update(remote)
+
+        for result, amount in (
+            ("local_hit", local_hits),
+            ("hit", len(rv) - local_hits),
+            ("miss", len(keys) - len(rv)),
+        ):
+            if amount:
+                metrics.incr("stacktraces.frame_cache.get", amount=amount, tags={"result": result})
+        return rv
+
+    def set_many(self, values: Mapping[str, Any]) -> None:
+        if not values:
+            return
+
+        cache.set_many(values, FRAME_CACHE_TIMEOUT)
+        with self._lock:
+            local_cache = self._get_local_cache()
+            if local_cache is not None:
+                local_cache.update(copy.deepcopy(dict(values)))
+        metrics.incr("stacktraces.frame_cache.set", amount=len(values))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local_cache = None
+
+
+frame_cache = FrameCache()
+
+
 def lookup_frame_cache(keys):
-    rv = {}
-    for key in keys:
-        rv[key] = cache.get(key)
-    return rv
+    return frame_cache.get_many(keys)
 
 
 def get_stacktrace_processing_task(infos, processors):
@@ -537,7 +649,8 @@ def get_stacktrace_processing_task(infos, processors):
     processors that seem to not handle any frames.
     """
     by_processor: dict[str, list[Any]] = {}
-    to_lookup: dict[str, str] = {}
+    to_lookup: dict[str, list[ProcessableFrame]] = {}
+    uncached = 0
 
     # by_stacktrace_info requires stable sorting as it is used in
     # StacktraceProcessingTask.iter_processable_stacktraces. This is important
@@ -553,11 +666,27 @@ def get_stacktrace_processing_task(infos, processors):
                 processable_frame
             )
             if processable_frame.cache_key is not None:
-                to_lookup[processable_frame.cache_key] = processable_frame
-
-    frame_cache = lookup_frame_cache(to_lookup)
-    for cache_key, processable_frame in to_lookup.items():
-        processable_frame.cache_value = frame_cache.get(cache_key)
+                to_lookup.setdefault(processable_frame.cache_key, []).append(processable_frame)
+            else:
+                uncached += 1
+
+    cached = 0
+    cache_values = lookup_frame_cache(to_lookup)
+    for cache_key, processable_frames in to_lookup.items():
+        cache_value = cache_values.get(cache_key)
+        for processable_frame in processable_frames:
+            processable_frame.cache_value = cache_value
+        if cache_value is not None:
+            cached += len(processable_frames)
+
+    looked_up = sum(len(processable_frames) for processable_frames in to_lookup.values())
+    for result, amount in (
+        ("cached", cached),
+        ("processed", looked_up - cached),
+        ("uncacheable", uncached),
+    ):
+        if amount:
+            metrics.incr("stacktraces.frame_cache.frames", amount=amount, tags={"result": result})
 
     return StacktraceProcessingTask(
         processable_stacktraces=by_stacktrace_info, processors=by_processor
@@ -648,6 +777,10 @@ def process_stacktraces(data, make_processors=None, set_raw_stacktrace=True):
         data.setdefault("_metrics", {})["flag.processing.error"] = True
         changed = True
     finally:
+        try:
+            processing_task.flush_frame_cache()
+        except Exception:
+            logger.exception("stacktraces.processing.frame_cache")
         for processor in processors:
             processor.close()
         processing_task.close()
@@ -227,10 +227,21 @@ class TagStorage(Service):
         raise NotImplementedError
 
     def get_group_tag_value_iter(
-        self, group, environment_ids, key, callbacks=(), offset=0, tenant_ids=None
+        self,
+        group,
+        environment_ids,
+        key,
+        callbacks=(),
+        offset=0,
+        tenant_ids=None,
+        order_by="-first_seen",
+        after_value=None,
     ):
         """
         >>> get_group_tag_value_iter(group, 2, 3, 'environment')
+
+        With `order_by="value"`, values are sorted by value and `after_value` can be used to fetch
+        the values following the last value of the previous page.
         """
         raise NotImplementedError
 
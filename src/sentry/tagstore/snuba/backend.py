@@ -1402,7 +1402,16 @@ class SnubaTagStorage(TagStorage):
         )
 
     def get_group_tag_value_iter(
-        self, group, environment_ids, key, callbacks=(), limit=1000, offset=0, tenant_ids=None
+        self,
+        group,
+        environment_ids,
+        key,
+        callbacks=(),
+        limit=1000,
+        offset=0,
+        tenant_ids=None,
+        order_by="-first_seen",
+        after_value=None,
     ):
         filters = {
             "project_id": get_project_list(group.project_id),
@@ -1412,6 +1421,15 @@ class SnubaTagStorage(TagStorage):
 
         if environment_ids:
             filters["environment"] = environment_ids
+
+        if order_by == "value":
+            # Values are unique per group, so they can be used to paginate with a keyset.
+            order_by = "tags_value"
+            if after_value is not None:
+                conditions.append(["tags_value", ">", after_value])
+        elif order_by != "-first_seen" or after_value is not None:
+            raise ValueError("Unsupported order_by: %s" % order_by)
+
         results = snuba.query(
             dataset=dataset,
             groupby=["tags_value"],
@@ -1422,7 +1440,7 @@ class SnubaTagStorage(TagStorage):
                 ["min", "timestamp", "first_seen"],
                 ["max", "timestamp", "last_seen"],
             ],
-            orderby="-first_seen",  # Closest thing to pre-existing `-id` order
+            orderby=order_by,  # `-first_seen` is the closest thing to pre-existing `-id` order
             limit=limit,
             referrer="tagstore.get_group_tag_value_iter",
             offset=offset,
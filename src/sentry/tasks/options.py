@@ -35,10 +35,28 @@ def _sync_options(cutoff):
     though it will correct itself in the next update window.
     """
     cutoff_dt = timezone.now() - timedelta(seconds=cutoff)
+    updated = []
     # TODO(dcramer): this doesnt handle deleted options (which shouldn't be allowed)
     for option in default_store.model.objects.filter(last_updated__gte=cutoff_dt).iterator():
         try:
             opt = default_manager.lookup_key(option.key)
-            default_manager.store.set_cache(opt, option.value)
+            updated.append((opt, option.value))
         except UnknownOption as e:
             logger.exception(str(e))
+
+    if not updated:
+        return
+
+    # Only publish the options which were out of sync, so processes using
+    # push invalidation don't refresh every recently updated option.
+    try:
+        cached = default_store.cache.get_many([opt.cache_key for opt, _ in updated])
+    except Exception:
+        cached = {}
+
+    changed = []
+    for opt, value in updated:
+        default_manager.store.set_cache(opt, value)
+        if cached.get(opt.cache_key) != value:
+            changed.append(opt)
+    default_store.publish_changes(changed)
@@ -125,38 +125,13 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
         for organization in Organization.objects.filter(id=organization_id):
-            for project in Project.objects.filter(organization_id=organization_id):
+            projects = list(Project.objects.filter(organization_id=organization_id))
+            for project in projects:
                 project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+            configs.update(_compute_cached_configs(projects, scope="organization"))
     elif project_id:
-        for project in Project.objects.filter(id=project_id):
-            for key in ProjectKey.objects.filter(project_id=project_id):
-                key.set_cached_field_value("project", project)
-                # If we find the config in the cache it means it was active.  As such we want to
-                # recalculate it.  If the config was not there at all, we leave it and avoid the
-                # cost of re-computation.
-                if projectconfig_cache.backend.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
-                    action = "recompute"
-                else:
-                    action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "project"},
-                    )
+        projects = list(Project.objects.filter(id=project_id))
+        configs.update(_compute_cached_configs(projects, scope="project"))
     elif public_key:
         try:
             key = ProjectKey.objects.get(public_key=public_key)
@@ -179,6 +154,60 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
+def _compute_cached_configs(projects, scope):
+    """Re-computes the configs of all keys of the given projects which are in the cache.
+
+    If we find the config in the cache it means it was active.  As such we want to
+    recalculate it.  If the config was not there at all, we leave it and avoid the
+    cost of re-computation.
+    """
+    from sentry.models.projectkey import ProjectKey
+
+    keys_by_project = {project.id: [] for project in projects}
+    for key in ProjectKey.objects.filter(project_id__in=list(keys_by_project)):
+        keys_by_project[key.project_id].append(key)
+
+    public_keys = [key.public_key for keys in keys_by_project.values() for key in keys]
+    cached = projectconfig_cache.backend.get_many(public_keys) if public_keys else {}
+
+    configs = {}
+    for project in projects:
+        keys = []
+        for key in keys_by_project[project.id]:
+            key.set_cached_field_value("project", project)
+            if cached.get(key.public_key) is not None:
+                keys.append(key)
+        configs.update(compute_projectkey_configs(project, keys))
+
+    metrics.incr(
+        "relay.projectconfig_cache.invalidation.recompute",
+        amount=len(configs),
+        tags={"action": "recompute", "scope": scope},
+    )
+    metrics.incr(
+        "relay.projectconfig_cache.invalidation.recompute",
+        amount=len(public_keys) - len(configs),
+        tags={"action": "not-cached", "scope": scope},
+    )
+    return configs
+
+
+def compute_projectkey_configs(project, keys):
+    """Computes the configs for several :class:`ProjectKey` of the same project.
+
+    The project-scoped part of the config is only computed once for all keys.
+
+    :returns: A dict mapping the public keys to their config.
+    """
+    from sentry.models.projectkey import ProjectKeyStatus
+    from sentry.relay.config import get_project_key_configs
+
+    configs = {key.public_key: {"disabled": True} for key in keys}
+    active_keys = [key for key in keys if key.status == ProjectKeyStatus.ACTIVE]
+    configs.update(get_project_key_configs(project, active_keys, full_config=True))
+    return configs
+
+
 def compute_projectkey_config(key):
     """Computes a single config for the given :class:`ProjectKey`.
 
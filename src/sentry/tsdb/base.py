@@ -437,9 +437,25 @@ class BaseTSDB(Service):
     def record_multi(self, items, timestamp=None, environment_id=None):
         """
         Record occurrence of items in multiple distinct counters.
+
+        Record at individual timestamps:
+
+        >>> record_multi([(TimeSeriesModel.users_affected_by_group, 5, ["a"], {"timestamp": ...})])
         """
-        for model, key, values in items:
-            self.record(model, key, values, timestamp, environment_id=environment_id)
+        for item in items:
+            if len(item) == 3:
+                model, key, values = item
+                options = {}
+            else:
+                model, key, values, options = item
+
+            self.record(
+                model,
+                key,
+                values,
+                options.get("timestamp", timestamp),
+                environment_id=environment_id,
+            )
 
     def get_distinct_counts_series(
         self,
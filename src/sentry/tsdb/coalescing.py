@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Iterable, Sequence
+
+from django.utils import timezone
+
+from sentry import options
+from sentry.tsdb.base import BaseTSDB
+from sentry.utils import metrics
+from sentry.utils.dates import to_datetime, to_timestamp
+
+logger = logging.getLogger(__name__)
+
+# The flusher never wakes up more often than this, even with a max-delay of 0.
+MIN_FLUSH_INTERVAL = 0.05
+
+
+class CoalescingTSDBWriter:
+    """
+    A process-local write-behind buffer for the counter and distinct counter
+    writes done while saving events.
+
+    Writes are accumulated for up to ``tsdb.coalescing-writer.max-delay``
+    seconds or ``tsdb.coalescing-writer.max-events`` calls. Increments of the
+    same ``(model, key, environment, bucket)`` are summed and distinct counter
+    values are merged, where the bucket is the timestamp normalized to the
+    smallest rollup (which is exact as long as every rollup is a multiple of
+    the smallest one). A flush then issues one
+    ``incr_multi`` and one ``record_multi`` call per environment, so a burst of
+    events for the same issue ends up as a single ``HINCRBY`` per rollup.
+
+    Pending writes are lost if the process dies before they are flushed, which
+    is why this is only suitable for approximate counters.
+    """
+
+    def __init__(self, get_backend: Callable[[], BaseTSDB]) -> None:
+        self.get_backend = get_backend
+
+        self._lock = threading.Lock()
+        self._reset()
+        self._flusher: threading.Thread | None = None
+        self._flusher_pid: int | None = None
+        self._flusher_stop: threading.Event | None = None
+
+    def _reset(self) -> None:
+        # environment_id -> (model, key, bucket) -> count
+        self._counters: dict[Any, dict[tuple[Any, Any, int], int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        # environment_id -> (model, key, bucket) -> values
+        self._distinct: dict[Any, dict[tuple[Any, Any, int], set[Any]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        self._pending_events = 0
+        self._first_write: float | None = None
+
+    def _get_bucket(self, backend: BaseTSDB, timestamp: datetime | None) -> int:
+        if timestamp is None:
+            timestamp = timezone.now()
+        epoch = int(to_timestamp(timestamp))
+
+        rollups = sorted(backend.get_rollups())
+        if rollups and all(rollup % rollups[0] == 0 for rollup in rollups):
+            return epoch - (epoch % rollups[0])
+        return epoch
+
+    def incr_multi(
+        self,
+        items: Sequence[tuple[Any, ...]],
+        timestamp: datetime | None = None,
+        count: int = 1,
+        environment_id: int | None = None,
+    ) -> None:
+        backend = self.get_backend()
+        with self._lock:
+            counters = self._counters[environment_id]
+            for item in items:
+                if len(item) == 2:
+                    model, key = item
+                    item_options = {}
+                else:
+                    model, key, item_options = item
+                bucket = self._get_bucket(backend, item_options.get("timestamp", timestamp))
+                counters[(model, key, bucket)] += item_options.get("count", count)
+            should_flush = self._record_write()
+
+        if should_flush:
+            self.flush()
+
+    def record_multi(
+        self,
+        items: Iterable[tuple[Any, Any, Iterable[Any]]],
+        timestamp: datetime | None = None,
+        environment_id: int | None = None,
+    ) -> None:
+        backend = self.get_backend()
+        bucket = self._get_bucket(backend, timestamp)
+        with self._lock:
+            distinct = self._distinct[environment_id]
+            for model, key, values in items:
+                distinct[(model, key, bucket)].update(values)
+            should_flush = self._record_write()
+
+        if should_flush:
+            self.flush()
+
+    def _record_write(self) -> bool:
+        self._pending_events += 1
+        if self._first_write is None:
+            self._first_write = time.monotonic()
+        self._ensure_flusher()
+
+        return self._pending_events >= options.get("tsdb.coalescing-writer.max-events")
+
+    def _ensure_flusher(self) -> None:
+        # The flusher thread does not survive a fork, so restart it in children.
+        if self._flusher is not None and self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+        self._flusher_stop = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._run_flusher,
+            args=(self._flusher_stop,),
+            name="tsdb-coalescing-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _run_flusher(self, stop: threading.Event) -> None:
+        while True:
+            max_delay = options.get("tsdb.coalescing-writer.max-delay")
+            if stop.wait(max(max_delay, MIN_FLUSH_INTERVAL)):
+                return
+            first_write = self._first_write
+            if first_write is None or time.monotonic() - first_write < max_delay:
+                continue
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("tsdb.coalescing.flush_failed")
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Stops the flusher thread, waits for it to exit and writes out all
+        pending writes. A later write starts a new flusher thread.
+        """
+        with self._lock:
+            flusher, stop = self._flusher, self._flusher_stop
+            self._flusher = self._flusher_stop = None
+            self._flusher_pid = None
+
+        if stop is not None:
+            stop.set()
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join(timeout)
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes out all pending writes. The buffers are swapped under the lock,
+        so writers are not blocked on the round-trips to the backend.
+        """
+        with self._lock:
+            counters, distinct = self._counters, self._distinct
+            pending_events, first_write = self._pending_events, self._first_write
+            self._reset()
+
+        if not pending_events:
+            return
+
+        backend = self.get_backend()
+        counter_items = 0
+        distinct_items = 0
+        for environment_id, environment_counters in counters.items():
+            items = [
+                (model, key, {"timestamp": to_datetime(bucket), "count": count})
+                for (model, key, bucket), count in environment_counters.items()
+            ]
+            counter_items += len(items)
+            backend.incr_multi(items, environment_id=environment_id)
+
+        for environment_id, environment_distinct in distinct.items():
+            records = [
+                (model, key, values, {"timestamp": to_datetime(bucket)})
+                for (model, key, bucket), values in environment_distinct.items()
+            ]
+            distinct_items += len(records)
+            backend.record_multi(records, environment_id=environment_id)
+
+        metrics.timing("tsdb.coalescing.flush.events", pending_events)
+        metrics.timing("tsdb.coalescing.flush.counters", counter_items)
+        metrics.timing("tsdb.coalescing.flush.distinct_counters", distinct_items)
+        if first_write is not None:
+            metrics.timing("tsdb.coalescing.flush.delay", time.monotonic() - first_write)
+
+
+def _get_backend() -> BaseTSDB:
+    from sentry import tsdb
+
+    return tsdb.backend
+
+
+coalescing_writer = CoalescingTSDBWriter(_get_backend)
+atexit.register(coalescing_writer.close)
@@ -395,27 +395,39 @@ class RedisTSDB(BaseTSDB):
     def record_multi(self, items, timestamp=None, environment_id=None):
         """
         Record an occurrence of an item in a distinct counter.
+
+        Record at individual timestamps:
+
+        >>> record_multi([(TimeSeriesModel.users_affected_by_group, 5, ["a"], {"timestamp": ...})])
         """
-        self.validate_arguments([model for model, key, values in items], [environment_id])
+        self.validate_arguments([item[0] for item in items], [environment_id])
 
         if timestamp is None:
             timestamp = timezone.now()
 
-        ts = int(to_timestamp(timestamp))  # ``timestamp`` is not actually a timestamp :(
-
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
             manager = cluster.fanout()
             if not durable:
                 manager = SuppressionWrapper(manager)
 
             with manager as client:
-                for model, key, values in items:
+                for item in items:
+                    if len(item) == 3:
+                        model, key, values = item
+                        options = {}
+                    else:
+                        model, key, values, options = item
+
+                    item_timestamp = options.get("timestamp", timestamp)
+                    # ``item_timestamp`` is a datetime, ``make_key`` wants an epoch
+                    ts = int(to_timestamp(item_timestamp))
+
                     c = client.target_key(key)
                     for rollup, max_values in self.rollups.items():
                         for environment_id in environment_ids:
                             k = self.make_key(model, rollup, ts, key, environment_id)
                             c.pfadd(k, *values)
-                            c.expireat(k, self.calculate_expiry(rollup, max_values, timestamp))
+                            c.expireat(k, self.calculate_expiry(rollup, max_values, item_timestamp))
 
     def get_distinct_counts_series(
         self, model, keys, start, end=None, rollup=None, environment_id=None
@@ -38,7 +38,7 @@ method_specifications = {
     "merge": (WRITE, single_model_argument),
     "delete": (WRITE, multiple_model_argument),
     "record": (WRITE, single_model_argument),
-    "record_multi": (WRITE, lambda callargs: {model for model, key, values in callargs["items"]}),
+    "record_multi": (WRITE, lambda callargs: {item[0] for item in callargs["items"]}),
     "merge_distinct_counts": (WRITE, single_model_argument),
     "delete_distinct_counts": (WRITE, multiple_model_argument),
     "record_frequency_multi": (
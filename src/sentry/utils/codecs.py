@@ -1,3 +1,4 @@
+import base64
 import zlib
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar
@@ -66,6 +67,19 @@ class BytesCodec(Codec[str, bytes]):
         return value.decode(self.encoding)
 
 
+class Base64Codec(Codec[bytes, str]):
+    """
+    Encode/decode bytes to/from ASCII strings using base64, for storages which
+    only accept text.
+    """
+
+    def encode(self, value: bytes) -> str:
+        return base64.b64encode(value).decode("ascii")
+
+    def decode(self, value: str) -> bytes:
+        return base64.b64decode(value.encode("ascii"))
+
+
 class JSONCodec(Codec[JSONData, str]):
     """
     Encode/decode Python data structures to/from JSON-encoded strings.
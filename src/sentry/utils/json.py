@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import codecs
 import datetime
 import decimal
 import uuid
@@ -141,6 +142,84 @@ def loads(
             return _default_decoder.decode(value)
 
 
+def iterload_array(fp: IO[bytes], chunk_size: int = 1024 * 1024) -> Generator[JSONData, None, None]:
+    """
+    Incrementally decodes the elements of a top-level JSON array read from ``fp``, so that only a
+    single element (and a chunk of the input) is held in memory at a time.
+    """
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def read_more() -> None:
+        nonlocal buf, pos, eof
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + utf8_decoder.decode(chunk, final=eof)
+        pos = 0
+
+    def skip_whitespace() -> bool:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\n\r":
+                pos += 1
+            if pos < len(buf):
+                return True
+            if eof:
+                return False
+            read_more()
+
+    def next_char() -> str:
+        if not skip_whitespace():
+            raise JSONDecodeError("Unexpected end of JSON array", buf, pos)
+        return buf[pos]
+
+    def expect_end() -> None:
+        # Like `loads`, reject anything but whitespace after the array.
+        if skip_whitespace():
+            raise JSONDecodeError("Extra data", buf, pos)
+
+    if next_char() != "[":
+        raise JSONDecodeError("Expecting '['", buf, pos)
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+        expect_end()
+        return
+
+    while True:
+        next_char()
+        try:
+            value, end = _default_decoder.raw_decode(buf, pos)
+        except JSONDecodeError:
+            # The element may just be cut off at the end of the buffer.
+            if eof:
+                raise
+            read_more()
+            continue
+        if not eof:
+            # Numbers and literals are not self-delimiting, make sure we have all of it. A number
+            # cut off within its fraction or exponent (e.g. `1.` or `1e`) decodes as its prefix.
+            tail = end
+            if isinstance(value, (int, float)):
+                while tail < len(buf) and buf[tail] in "0123456789.eE+-":
+                    tail += 1
+            if tail == len(buf):
+                read_more()
+                continue
+
+        yield value
+        pos = end
+        separator = next_char()
+        pos += 1
+        if separator == "]":
+            expect_end()
+            return
+        if separator != ",":
+            raise JSONDecodeError("Expecting ',' delimiter", buf, pos - 1)
+
+
 def dumps_htmlsafe(value: object) -> SafeString:
     return mark_safe(_default_escaped_encoder.encode(value))
 
@@ -179,6 +258,7 @@ __all__ = (
     "dump",
     "dumps",
     "dumps_htmlsafe",
+    "iterload_array",
     "load",
     "loads",
     "prune_empty_keys",
@@ -34,6 +34,8 @@ from sentry_sdk import Hub
 from snuba_sdk import Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
+from sentry.locks import locks
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.grouprelease import GroupRelease
@@ -47,6 +49,8 @@ from sentry.snuba.events import Columns
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
 from sentry.utils.dates import outside_retention_with_modified_start, to_timestamp
+from sentry.utils.locking import UnableToAcquireLock
+from sentry.utils.locking.lock import Lock
 
 logger = logging.getLogger(__name__)
 
@@ -860,11 +864,13 @@ def _apply_cache_and_build_results(
     query_param_list = list(enumerate(snuba_param_list))
 
     results = []
+    to_query: List[Tuple[int, SnubaQueryBody, Optional[str]]] = []
 
-    if use_cache:
+    if use_cache and options.get("snuba.query-cache.single-flight"):
+        results = _query_with_single_flight(query_param_list, referrer, headers)
+    elif use_cache:
         cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
         cache_data = cache.get_many(cache_keys)
-        to_query: List[Tuple[int, SnubaQueryBody, Optional[str]]] = []
         for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
             cached_result = cache_data.get(cache_key)
             metric_tags = {"referrer": referrer} if referrer else None
@@ -890,6 +896,119 @@ def _apply_cache_and_build_results(
     return [result[1] for result in results]
 
 
+# Results cached with a stale TTL live under their own keys, so that the plain
+# query cache never serves them past their freshness.
+_SINGLE_FLIGHT_SUFFIX = ":single-flight"
+_FRESH_SUFFIX = ":fresh"
+
+
+def _query_with_single_flight(
+    query_param_list: Sequence[Tuple[int, SnubaQueryBody]],
+    referrer: Optional[str],
+    headers: Mapping[str, str],
+) -> List[Tuple[int, Any]]:
+    """
+    Query cache with request coalescing: only one caller at a time queries
+    snuba for a given cache key, holding a short lock, while concurrent callers
+    wait for its result to show up in the cache.
+
+    Results are kept for ``snuba.query-cache.stale-ttl`` seconds after they
+    expire. For referrers in ``snuba.query-cache.stale-referrers`` such stale
+    results are served while a single caller revalidates them.
+    """
+    ttl = settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
+    stale_ttl = options.get("snuba.query-cache.stale-ttl")
+    lock_timeout = options.get("snuba.query-cache.lock-timeout")
+    serve_stale = referrer in options.get("snuba.query-cache.stale-referrers")
+    metric_tags = {"referrer": referrer} if referrer else None
+
+    cache_keys = [
+        get_cache_key(query_params[0]) + _SINGLE_FLIGHT_SUFFIX
+        for _, query_params in query_param_list
+    ]
+    cache_data = cache.get_many(cache_keys + [key + _FRESH_SUFFIX for key in cache_keys])
+
+    results: List[Tuple[int, Any]] = []
+    to_query: List[Tuple[int, SnubaQueryBody, Optional[str], Optional[Lock]]] = []
+    to_wait: List[Tuple[int, SnubaQueryBody, str]] = []
+    for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
+        cached_result = cache_data.get(cache_key)
+        if cached_result is not None and cache_key + _FRESH_SUFFIX in cache_data:
+            metrics.incr("snuba.query_cache.hit", tags=metric_tags)
+            results.append((query_pos, json.loads(cached_result)))
+            continue
+
+        lock = _get_query_cache_lock(cache_key, lock_timeout)
+        try:
+            lock.acquire()
+        except UnableToAcquireLock:
+            if cached_result is not None and serve_stale:
+                metrics.incr("snuba.query_cache.stale", tags=metric_tags)
+                results.append((query_pos, json.loads(cached_result)))
+            else:
+                to_wait.append((query_pos, query_params, cache_key))
+            continue
+
+        metrics.incr("snuba.query_cache.miss", tags=metric_tags)
+        to_query.append((query_pos, query_params, cache_key, lock))
+
+    results.extend(_query_and_cache(to_query, headers, ttl, stale_ttl))
+
+    to_query = []
+    for query_pos, query_params, cache_key in to_wait:
+        lock = _get_query_cache_lock(cache_key, lock_timeout)
+        try:
+            lock.blocking_acquire(initial_delay=0.05, timeout=lock_timeout)
+        except UnableToAcquireLock:
+            # The caller holding the lock is taking too long, don't wait any further.
+            metrics.incr("snuba.query_cache.wait_timeout", tags=metric_tags)
+            to_query.append((query_pos, query_params, None, None))
+            continue
+
+        cache_data = cache.get_many([cache_key, cache_key + _FRESH_SUFFIX])
+        cached_result = cache_data.get(cache_key)
+        if cached_result is not None and cache_key + _FRESH_SUFFIX in cache_data:
+            lock.release()
+            metrics.incr("snuba.query_cache.coalesced", tags=metric_tags)
+            results.append((query_pos, json.loads(cached_result)))
+        else:
+            metrics.incr("snuba.query_cache.miss", tags=metric_tags)
+            to_query.append((query_pos, query_params, cache_key, lock))
+
+    results.extend(_query_and_cache(to_query, headers, ttl, stale_ttl))
+    return results
+
+
+def _get_query_cache_lock(cache_key: str, lock_timeout: int) -> Lock:
+    return locks.get(f"{cache_key}:lock", duration=lock_timeout, name="snuba_query_cache")
+
+
+def _query_and_cache(
+    to_query: Sequence[Tuple[int, SnubaQueryBody, Optional[str], Optional[Lock]]],
+    headers: Mapping[str, str],
+    ttl: int,
+    stale_ttl: int,
+) -> List[Tuple[int, Any]]:
+    if not to_query:
+        return []
+
+    results = []
+    try:
+        query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
+        for result, (query_pos, _, cache_key, _) in zip(query_results, to_query):
+            if cache_key:
+                # The result itself outlives the marker so it can be served stale.
+                cache.set(cache_key, json.dumps(result), ttl + stale_ttl)
+                cache.set(cache_key + _FRESH_SUFFIX, 1, ttl)
+            results.append((query_pos, result))
+    finally:
+        for _, _, _, lock in to_query:
+            if lock is not None:
+                lock.release()
+
+    return results
+
+
 def _bulk_snuba_query(
     snuba_param_list: Sequence[SnubaQueryBody],
     headers: Mapping[str, str],
@@ -14,12 +14,16 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    default_config,
+    event_search_grammar,
+    parse_cache,
     parse_search_query,
 )
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.utils import parse_datetime_string, parse_duration, parse_numeric_value
 from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.helpers.options import override_options
 from sentry.utils import json
 
 fixture_path = "fixtures/search-syntax"
@@ -705,3 +709,53 @@ def test_search_value_to_query_string(value, expected_query_string):
     actual = search_value.to_query_string()
 
     assert actual == expected_query_string
+
+
+@pytest.fixture
+def enable_parse_cache():
+    parse_cache.clear()
+    with override_options({"search.parse-cache.size": 100}):
+        yield
+    parse_cache.clear()
+
+
+@pytest.mark.usefixtures("enable_parse_cache")
+def test_parse_cache():
+    query = "user.email:foo@example.com release:[12,13] count():>10"
+
+    with patch.object(event_search_grammar, "parse", wraps=event_search_grammar.parse) as parse:
+        result = parse_search_query(query)
+        assert parse_search_query(query) == result
+        assert parse.call_count == 1
+
+        # Different configs share the parse tree, but not the filters
+        config = SearchConfig.create_from(default_config, free_text_key="other")
+        parse_search_query("hello", config=config)
+        assert parse_search_query("hello") != parse_search_query("hello", config=config)
+        assert parse.call_count == 2
+
+
+@pytest.mark.usefixtures("enable_parse_cache")
+def test_parse_cache_time_dependent_query():
+    with freeze_time("2023-01-01T00:00:00"):
+        first = parse_search_query("timestamp:-24h")
+    with freeze_time("2023-01-02T00:00:00"):
+        second = parse_search_query("timestamp:-24h")
+
+    assert first[0].value.raw_value != second[0].value.raw_value
+
+
+@pytest.mark.usefixtures("enable_parse_cache")
+def test_parse_cache_fixtures():
+    for file in os.listdir(abs_fixtures_path):
+        with open(os.path.join(abs_fixtures_path, file)) as fp:
+            cases = json.load(fp)
+
+        for case in cases:
+            try:
+                expected = parse_search_query(case["query"])
+            except InvalidSearchQuery:
+                with pytest.raises(InvalidSearchQuery):
+                    parse_search_query(case["query"])
+            else:
+                assert parse_search_query(case["query"]) == expected
@@ -0,0 +1,36 @@
+from sentry.api.event_search import parse_cache, parse_search_query
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
+
+# Queries as they show up in saved searches, alert rules and dashboard widgets
+QUERIES = [
+    "assigned_or_suggested:[me, none] !has:release",
+    "event.type:transaction transaction.op:http.server",
+    "event.type:error !level:info environment:production",
+    'transaction:"/api/0/organizations/{organization_slug}/issues/" http.method:GET',
+    "release:[1.0.0, 1.0.1] user.email:*@example.com",
+    "count():>100 p95(transaction.duration):>500ms",
+    "(browser.name:Chrome OR browser.name:Firefox) has:user.email",
+    'message:"Connection reset by peer" !stack.filename:*/site-packages/*',
+    "measurements.lcp:>2.5s measurements.cls:>0.1 event.type:transaction",
+    "failure_rate():>0.05 transaction.status:[internal_error, unknown]",
+    "error.handled:false error.type:[TypeError, ValueError] os.name:Windows",
+]
+
+
+def parse_all():
+    for query in QUERIES:
+        parse_search_query(query)
+
+
+@requires_pytest_benchmark
+def test_benchmark_parse_search_query(benchmark):
+    benchmark(parse_all)
+
+
+@requires_pytest_benchmark
+def test_benchmark_parse_search_query_cached(benchmark):
+    parse_cache.clear()
+    with override_options({"search.parse-cache.size": 1000}):
+        benchmark(parse_all)
+    parse_cache.clear()
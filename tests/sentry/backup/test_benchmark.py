@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import io
+import time
+import tracemalloc
+
+import pytest
+
+from sentry.backup.exports import export_in_global_scope
+from sentry.backup.helpers import LocalFileEncryptor
+from sentry.testutils.helpers.backups import NOOP_PRINTER, BackupTestCase, generate_rsa_key_pair
+from sentry.testutils.silo import region_silo_test
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_USERS = 20
+
+
+@requires_pytest_benchmark
+@region_silo_test
+class ExportBenchmarkTest(BackupTestCase):
+    @pytest.fixture(autouse=True)
+    def inject_benchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def setUp(self):
+        super().setUp()
+        self.create_exhaustive_instance(is_superadmin=True)
+        for i in range(NUM_USERS):
+            self.create_exhaustive_user(f"user_{i}")
+
+    def run_export(self, *, encrypted: bool) -> None:
+        (_, public_key_pem) = generate_rsa_key_pair()
+        stats = {"bytes": 0, "seconds": 0.0, "peak_memory": 0}
+
+        def export():
+            dest = io.BytesIO()
+            encryptor = LocalFileEncryptor(io.BytesIO(public_key_pem)) if encrypted else None
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            export_in_global_scope(dest, encryptor=encryptor, printer=NOOP_PRINTER)
+            stats["seconds"] += time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # The destination buffer itself is part of the traced memory, so subtract it to only
+            # account for what the export holds on to.
+            stats["bytes"] += dest.tell()
+            stats["peak_memory"] = max(stats["peak_memory"], peak - dest.tell())
+
+        self.benchmark.pedantic(export, rounds=3)
+
+        self.benchmark.extra_info["throughput_bytes_per_second"] = stats["bytes"] / stats["seconds"]
+        self.benchmark.extra_info["peak_memory_bytes"] = stats["peak_memory"]
+
+    def test_benchmark_export(self):
+        self.run_export(encrypted=False)
+
+    def test_benchmark_export_encrypted(self):
+        self.run_export(encrypted=True)
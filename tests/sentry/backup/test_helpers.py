@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import io
+import os
+
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+
+from sentry.backup.helpers import fernet_decrypt_stream, fernet_encrypt_stream
+
+
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 1000])
+@pytest.mark.parametrize("chunk_size", [1, 7, 16, 4096])
+def test_fernet_encrypt_stream(size: int, chunk_size: int):
+    key = Fernet.generate_key()
+    data = os.urandom(size)
+
+    token = io.BytesIO()
+    fernet_encrypt_stream(key, io.BytesIO(data), token, chunk_size=chunk_size)
+
+    assert Fernet(key).decrypt(token.getvalue()) == data
+    assert len(token.getvalue()) == len(Fernet(key).encrypt(data))
+
+
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 1000])
+@pytest.mark.parametrize("chunk_size", [1, 7, 16, 4096])
+def test_fernet_decrypt_stream(size: int, chunk_size: int):
+    key = Fernet.generate_key()
+    data = os.urandom(size)
+    token = Fernet(key).encrypt(data)
+
+    plaintext = io.BytesIO()
+    fernet_decrypt_stream(key, io.BytesIO(token), plaintext, chunk_size=chunk_size)
+    assert plaintext.getvalue() == data
+
+    tampered = token[:30] + (b"B" if token[30:31] == b"A" else b"A") + token[31:]
+    for invalid in (token[:-4], token[:40], tampered):
+        plaintext = io.BytesIO()
+        with pytest.raises(InvalidToken):
+            fernet_decrypt_stream(key, io.BytesIO(invalid), plaintext, chunk_size=chunk_size)
+        assert plaintext.getvalue() == b""
@@ -75,3 +75,56 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    def test_process_batch(self):
+        groups = [Group.objects.create(project=Project(id=1)) for _ in range(2)]
+        release_project = ReleaseProject.objects.create(project=self.project, release=self.release)
+        the_date = timezone.now() + timedelta(days=5)
+
+        self.buf.process_batch(
+            [
+                (Group, {"times_seen": 1}, {"id": groups[0].id}, {"last_seen": the_date}, None),
+                (Group, {"times_seen": 2}, {"id": groups[1].id}, {"last_seen": the_date}, None),
+                (ReleaseProject, {"new_groups": 1}, {"id": release_project.id}, None, None),
+                # Not identified by primary key, goes through ``process``
+                (
+                    ReleaseProject,
+                    {"new_groups": 1},
+                    {"project_id": self.project.id, "release_id": self.release.id},
+                    None,
+                    None,
+                ),
+            ]
+        )
+
+        for i, group in enumerate(groups):
+            group_ = Group.objects.get(id=group.id)
+            assert group_.times_seen == group.times_seen + i + 1
+            assert group_.last_seen == the_date
+        assert ReleaseProject.objects.get(id=release_project.id).new_groups == 2
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batch_missing_row(self, process):
+        release_project = ReleaseProject.objects.create(project=self.project, release=self.release)
+        missing_id = release_project.id + 1
+
+        self.buf.process_batch(
+            [
+                (ReleaseProject, {"new_groups": 1}, {"id": release_project.id}, None, None),
+                (ReleaseProject, {"new_groups": 1}, {"id": missing_id}, None, None),
+            ]
+        )
+
+        assert ReleaseProject.objects.get(id=release_project.id).new_groups == 1
+        # The bulk update can't create rows, ``process`` does.
+        process.assert_called_once_with(
+            self.buf, ReleaseProject, {"new_groups": 1}, {"id": missing_id}, None, None
+        )
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batch_signal_only(self, process):
+        group = Group.objects.create(project=Project(id=1))
+        self.buf.process_batch([(Group, {"times_seen": 1}, {"id": group.id}, None, True)])
+        process.assert_called_once_with(
+            self.buf, Group, {"times_seen": 1}, {"id": group.id}, None, True
+        )
@@ -44,6 +44,24 @@ class TestRedisBuffer:
         client = self.buf.get_routing_client()
         assert client.zrange("b:p", 0, -1) == []
 
+    @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
+    @mock.patch("sentry.buffer.redis.process_incr")
+    def test_process_pending_pipelined_flush(self, process_incr):
+        self.buf.pipelined_flush = True
+        self.buf.incr_batch_size = 2
+        client = self.buf.get_routing_client()
+        client.zadd("b:p", {"foo": 1, "bar": 2, "baz": 3})
+        self.buf.process_pending()
+        assert len(process_incr.apply_async.mock_calls) == 2
+        process_incr.apply_async.assert_any_call(
+            kwargs={"batch_keys": ["foo", "bar"], "pending_since": 1.0}
+        )
+        process_incr.apply_async.assert_any_call(
+            kwargs={"batch_keys": ["baz"], "pending_since": 3.0}
+        )
+        client = self.buf.get_routing_client()
+        assert client.zrange("b:p", 0, -1) == []
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.redis.process_incr")
     def test_process_pending_multiple_batches(self, process_incr):
@@ -258,6 +276,56 @@ class TestRedisBuffer:
         self.buf.process("foo")
         process.assert_called_once_with(mock.Mock, {"times_seen": 1}, {"pk": 1}, {}, True)
 
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    def test_process_pipelined_flush(self, process_batch):
+        self.buf.pipelined_flush = True
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        self.buf.incr(model, {"times_seen": 2}, {"pk": 1})
+        self.buf.incr(model, {"times_seen": 3}, {"pk": 2}, extra={"foo": "bar"})
+        keys = [self.buf._make_key(model, {"pk": 1}), self.buf._make_key(model, {"pk": 2})]
+
+        with mock.patch("sentry.buffer.redis.time", return_value=1000.0), mock.patch(
+            "sentry.buffer.redis.metrics.timing"
+        ) as timing:
+            self.buf.process(batch_keys=keys, pending_since=940.0)
+        timing.assert_any_call("buffer.flush-lag", 60.0)
+        process_batch.assert_called_once_with(
+            [
+                (mock.Mock, {"times_seen": 3}, {"pk": 1}, {}, None),
+                (mock.Mock, {"times_seen": 3}, {"pk": 2}, {"foo": "bar"}, None),
+            ]
+        )
+
+        client = self.buf.get_routing_client()
+        assert client.zrange("b:p", 0, -1) == []
+        for key in keys:
+            assert not client.exists(key)
+            assert not client.exists(self.buf._make_lock_key(key))
+
+    @django_db_all
+    @freeze_time()
+    def test_process_pipelined_flush_updates_groups(self, default_project, task_runner):
+        self.buf.pipelined_flush = True
+        self.buf.incr_batch_size = 10
+        groups = [Group.objects.create(project=default_project) for _ in range(3)]
+        for group in groups:
+            # Make sure group is stored in the cache
+            Group.objects.get_from_cache(id=group.id)
+
+        last_seen = timezone.now() + datetime.timedelta(minutes=5)
+        for i, group in enumerate(groups):
+            self.buf.incr(Group, {"times_seen": i + 1}, {"id": group.id}, {"last_seen": last_seen})
+
+        with task_runner(), mock.patch("sentry.buffer", self.buf):
+            self.buf.process_pending()
+
+        for i, group in enumerate(groups):
+            cached_group = Group.objects.get_from_cache(id=group.id)
+            assert cached_group.times_seen == group.times_seen + i + 1
+            assert cached_group.last_seen == last_seen
+
 
 #    @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
 #    def test_incr_uses_signal_only(self):
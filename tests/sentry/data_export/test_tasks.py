@@ -10,6 +10,7 @@ from sentry.models.files.file import File
 from sentry.search.events.constants import TIMEOUT_ERROR_MESSAGE
 from sentry.testutils.cases import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import region_silo_test
 from sentry.utils.samples import load_data
 from sentry.utils.snuba import (
@@ -610,6 +611,88 @@ class AssembleDownloadTest(TestCase, SnubaTestCase):
 
         assert emailer.called
 
+    @override_options({"data-export.keyset-pagination": True})
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_issue_by_tag_keyset(self, emailer):
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.ISSUES_BY_TAG,
+            query_info={"project": [self.project.id], "group": self.event.group_id, "key": "foo"},
+        )
+        with self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        with de._get_file().getfile() as f:
+            header, raw1, raw2 = f.read().strip().split(b"\r\n")
+        assert header == b"value,times_seen,last_seen,first_seen"
+
+        # Keyset paginated exports are ordered by value
+        assert raw1.startswith(b"bar,1,")
+        assert raw2.startswith(b"bar2,2,")
+
+        assert emailer.called
+
+    @override_options({"data-export.keyset-pagination": True})
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_keyset(self, emailer):
+        # Events sharing a timestamp have to be told apart by the keyset
+        timestamp = iso_format(before_now(seconds=30))
+        for value in ("bar3", "bar4"):
+            self.store_event(
+                data={
+                    "tags": {"foo": value},
+                    "fingerprint": ["group-1"],
+                    "timestamp": timestamp,
+                    "environment": "dev",
+                },
+                project_id=self.project.id,
+            )
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={
+                "project": [self.project.id],
+                "field": ["environment", "foo"],
+                "sort": "-timestamp",
+                "query": "",
+            },
+        )
+        with self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        with de._get_file().getfile() as f:
+            header, *rows = f.read().strip().split(b"\r\n")
+        assert header == b"environment,foo"
+
+        assert sorted(rows[:2]) == [b"dev,bar3", b"dev,bar4"]
+        assert rows[2:] == [b"prod,bar2", b"prod,bar2", b"dev,bar"]
+
+        assert emailer.called
+
+    @override_options({"data-export.fetch-concurrency": 3})
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_discover_concurrent_fetch(self, emailer):
+        de = ExportedData.objects.create(
+            user_id=self.user.id,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={
+                "project": [self.project.id],
+                "field": ["environment"],
+                "sort": "-environment",
+                "query": "",
+            },
+        )
+        with self.tasks():
+            assemble_download(de.id, batch_size=1)
+        de = ExportedData.objects.get(id=de.id)
+        with de._get_file().getfile() as f:
+            assert f.read().strip().split(b"\r\n") == [b"environment", b"prod", b"prod", b"dev"]
+
+        assert emailer.called
+
 
 @region_silo_test
 class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
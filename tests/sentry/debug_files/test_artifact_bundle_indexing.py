@@ -8,7 +8,9 @@ import pytest
 from django.core.files.base import ContentFile
 from django.utils import timezone
 
+from sentry.debug_files import binary_flat_file_index
 from sentry.debug_files.artifact_bundle_indexing import (
+    MAX_BUNDLES_PER_ENTRY,
     BundleManifest,
     BundleMeta,
     FlatFileIndex,
@@ -27,6 +29,7 @@ from sentry.models.artifactbundle import (
 from sentry.models.files.file import File
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.helpers.options import override_options
 from sentry.utils import json
 
 
@@ -231,6 +234,47 @@ class FlatFileIndexingTest(FlatFileTestCase):
             project_id=self.project.id, release_name="", dist_name=""
         ).exists()
 
+    def test_index_bundle_in_binary_flat_file(self):
+        release = "1.0"
+        dist = "android"
+        artifact_bundles = [self.mock_simple_artifact_bundle() for _ in range(2)]
+
+        with override_options({"sourcemaps.artifact_bundles.binary_flat_file_index": True}):
+            # The second bundle is merged into the binary index of the first one.
+            for artifact_bundle in artifact_bundles:
+                identifiers = mark_bundle_for_flat_file_indexing(
+                    artifact_bundle, False, [self.project.id], release, dist
+                )
+                with ArtifactBundleArchive(artifact_bundle.file.getfile()) as archive:
+                    bundles_to_add = [BundleManifest.from_artifact_bundle(artifact_bundle, archive)]
+                for identifier in identifiers:
+                    update_artifact_bundle_index(identifier, bundles_to_add=bundles_to_add)
+
+            index = ArtifactBundleFlatFileIndex.objects.get(
+                project_id=self.project.id, release_name=release, dist_name=dist
+            )
+            json_index = FlatFileIndex()
+            json_index.from_json(index.load_flat_file_index())
+            binary_index = FlatFileIndex()
+            binary_index.from_binary(index.load_binary_flat_file_index())
+            assert json.loads(binary_index.to_json()) == json.loads(json_index.to_json())
+
+            lookup = binary_flat_file_index.BinaryFlatFileIndex(index.load_binary_flat_file_index())
+            assert lookup.lookup_url("~/app.js") == [bundle.id for bundle in artifact_bundles]
+
+            # Removals go through the JSON index and re-encode the binary index.
+            update_artifact_bundle_index(identifiers[0], bundles_to_remove=[artifact_bundles[0].id])
+            index.refresh_from_db()
+            lookup = binary_flat_file_index.BinaryFlatFileIndex(index.load_binary_flat_file_index())
+            assert lookup.lookup_url("~/app.js") == [artifact_bundles[1].id]
+
+        # Updates without the binary index leave it alone, but it is stale afterwards.
+        with patch("sentry.models.artifactbundle.indexstore.delete") as delete:
+            update_artifact_bundle_index(identifiers[0], bundles_to_remove=[artifact_bundles[1].id])
+        assert not delete.called
+        index.refresh_from_db()
+        assert index.load_binary_flat_file_index() is None
+
     def test_remove_bundle_from_index(self):
         release = "1.0"
         dist = "android"
@@ -617,6 +661,75 @@ class FlatFileIndexTest(FlatFileTestCase):
             "files_by_debug_id": {},
         }
 
+    def test_flat_file_index_binary_roundtrip(self):
+        bundles = self.mock_flat_file_index()["bundles"]
+
+        flat_file_index = FlatFileIndex()
+        flat_file_index.merge_urls(bundles[0], ["~/app.js", "~/main.js"])
+        flat_file_index.merge_debug_ids(bundles[1], ["2a9e7ab2-50ba-43b5-a8fd-13f6ac1f5976"])
+
+        binary_index = flat_file_index.to_binary()
+        decoded = FlatFileIndex()
+        decoded.from_binary(binary_index)
+        assert json.loads(decoded.to_json()) == json.loads(flat_file_index.to_json())
+
+        lookup = binary_flat_file_index.BinaryFlatFileIndex(binary_index)
+        assert lookup.lookup_url("~/main.js") == [1]
+        assert lookup.lookup_url("~/missing.js") == []
+        assert lookup.lookup_debug_id("2a9e7ab2-50ba-43b5-a8fd-13f6ac1f5976") == [2]
+
+        with pytest.raises(binary_flat_file_index.InvalidBinaryIndex):
+            binary_flat_file_index.BinaryFlatFileIndex(b"{}")
+
+    def test_flat_file_index_json_from_binary(self):
+        assert json.loads(
+            FlatFileIndex.json_from_binary(FlatFileIndex().to_binary())
+        ) == json.loads(FlatFileIndex().to_json())
+
+        bundles = self.mock_flat_file_index()["bundles"]
+        flat_file_index = FlatFileIndex()
+        flat_file_index.merge_urls(bundles[0], ["~/app.js", '~/"quoted".js', "~/back\\slash.js"])
+        flat_file_index.merge_urls(bundles[1], ["~/app.js", "~/ünïcode.js", "~/\u2028.js"])
+        flat_file_index.merge_debug_ids(bundles[1], ["2a9e7ab2-50ba-43b5-a8fd-13f6ac1f5976"])
+
+        assert json.loads(
+            FlatFileIndex.json_from_binary(flat_file_index.to_binary())
+        ) == json.loads(flat_file_index.to_json())
+
+    def test_flat_file_index_binary_merge(self):
+        now = timezone.now()
+        flat_file_index = FlatFileIndex()
+        for id in range(30):
+            bundle_meta = BundleMeta(id=id, timestamp=now - timedelta(minutes=id % 7))
+            flat_file_index.merge_urls(bundle_meta, [f"~/chunk-{id % 5}.js", f"~/page-{id}.js"])
+        binary_index = flat_file_index.to_binary()
+
+        bundle_meta = BundleMeta(id=100, timestamp=now - timedelta(minutes=3))
+        urls = ["~/chunk-1.js", "~/a.js", "~/page-7.js", "~/zzz.js"]
+        flat_file_index.merge_urls(bundle_meta, urls)
+        merged = binary_flat_file_index.merge_bundle(
+            binary_index,
+            (bundle_meta.id, bundle_meta.timestamp),
+            binary_flat_file_index.TABLE_URLS,
+            urls,
+            max_entries=MAX_BUNDLES_PER_ENTRY,
+            incomplete_above=MAX_BUNDLES_PER_ENTRY,
+        )
+        assert merged == flat_file_index.to_binary()
+
+        # Existing bundles can not be merged incrementally.
+        assert (
+            binary_flat_file_index.merge_bundle(
+                binary_index,
+                (1, now),
+                binary_flat_file_index.TABLE_URLS,
+                urls,
+                max_entries=MAX_BUNDLES_PER_ENTRY,
+                incomplete_above=MAX_BUNDLES_PER_ENTRY,
+            )
+            is None
+        )
+
     # The first "bundle limit" test needs 2 minutes to run, the complete test
     # does not finish at all in reasonable time.
     # I'm just losing my mind how python / pytest can be *this* slow?
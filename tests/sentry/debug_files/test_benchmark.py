@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from sentry.debug_files import binary_flat_file_index
+from sentry.debug_files.artifact_bundle_indexing import (
+    MAX_BUNDLES_PER_INDEX,
+    MAX_URLS_PER_INDEX,
+    BundleManifest,
+    BundleMeta,
+    FlatFileIdentifier,
+    FlatFileIndex,
+    update_artifact_bundle_index,
+)
+from sentry.models.artifactbundle import ArtifactBundleFlatFileIndex
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+
+NEW_BUNDLE_URLS = 500
+
+
+pytestmark = requires_pytest_benchmark
+
+
+@pytest.fixture(scope="module")
+def json_index() -> str:
+    """
+    An index just below the size limits, so a new bundle can still be added without evicting
+    others, with every url contained in a few bundles.
+    """
+    rng = random.Random(0)
+    now = timezone.now()
+    bundle_count = MAX_BUNDLES_PER_INDEX - 1
+    bundles = [
+        {
+            "bundle_id": f"artifact_bundle/{bundle_id}",
+            "timestamp": (now + timedelta(seconds=bundle_id)).isoformat(),
+        }
+        for bundle_id in range(bundle_count)
+    ]
+    files_by_url = {
+        f"~/static/chunks/{i:06x}/app.min.js": sorted(rng.sample(range(bundle_count), 3))
+        for i in range(MAX_URLS_PER_INDEX - NEW_BUNDLE_URLS)
+    }
+    return json.dumps({"is_complete": True, "bundles": bundles, "files_by_url": files_by_url})
+
+
+@pytest.fixture(scope="module")
+def binary_index(json_index: str) -> bytes:
+    index = FlatFileIndex()
+    index.from_json(json_index)
+    return index.to_binary()
+
+
+def new_bundle() -> tuple[BundleMeta, list[str]]:
+    bundle_meta = BundleMeta(id=MAX_BUNDLES_PER_INDEX, timestamp=timezone.now() + timedelta(days=1))
+    # Half of the urls are new, the other half is already contained in the index.
+    urls = [f"~/static/chunks/{i * 97:06x}/app.min.js" for i in range(NEW_BUNDLE_URLS // 2)]
+    urls += [f"~/static/new/{i}.js" for i in range(NEW_BUNDLE_URLS // 2)]
+    return bundle_meta, urls
+
+
+def test_load_json(benchmark, json_index: str):
+    benchmark.extra_info["size_in_bytes"] = len(json_index.encode())
+    benchmark(lambda: FlatFileIndex().from_json(json_index))
+
+
+def test_load_binary(benchmark, binary_index: bytes):
+    benchmark.extra_info["size_in_bytes"] = len(binary_index)
+    benchmark(lambda: FlatFileIndex().from_binary(binary_index))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("use_binary_index", [False, True])
+def test_update_index(
+    benchmark, default_project, json_index: str, binary_index: bytes, use_binary_index: bool
+):
+    """
+    Adds a bundle to a stored index, including loading and storing the index.
+    """
+    identifier = FlatFileIdentifier(default_project.id, release="1.0", dist="")
+    flat_file_index = ArtifactBundleFlatFileIndex.objects.create(
+        project_id=default_project.id, release_name="1.0", dist_name=""
+    )
+    bundle_meta, urls = new_bundle()
+    bundles_to_add = [BundleManifest(meta=bundle_meta, urls=urls, debug_ids=[])]
+
+    def setup():
+        flat_file_index.update_flat_file_index(
+            json_index, binary_index if use_binary_index else None
+        )
+
+    with override_options({"sourcemaps.artifact_bundles.binary_flat_file_index": use_binary_index}):
+        benchmark.pedantic(
+            update_artifact_bundle_index,
+            args=(identifier,),
+            kwargs={"bundles_to_add": bundles_to_add},
+            setup=setup,
+            rounds=5,
+        )
+
+    flat_file_index.refresh_from_db()
+    index = FlatFileIndex()
+    index.from_json(flat_file_index.load_flat_file_index())
+    assert index._bundles[-1] == bundle_meta
+    assert (flat_file_index.load_binary_flat_file_index() is not None) == use_binary_index
+
+
+def test_lookup_json(benchmark, json_index: str):
+    def lookup():
+        return json.loads(json_index)["files_by_url"].get("~/static/chunks/00ffff/app.min.js")
+
+    benchmark(lookup)
+
+
+def test_lookup_binary(benchmark, binary_index: bytes):
+    def lookup():
+        return binary_flat_file_index.BinaryFlatFileIndex(binary_index).lookup_url(
+            "~/static/chunks/00ffff/app.min.js"
+        )
+
+    assert benchmark(lookup)
@@ -0,0 +1,48 @@
+import pytest
+
+from sentry.eventstore.processing.redis import (
+    ZSTD_PREFIX,
+    EventCodec,
+    RedisClusterEventProcessingStore,
+)
+
+event = {"project": 1, "event_id": "a" * 32, "message": "hello " * 100}
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_event_codec(compress):
+    codec = EventCodec(compress=compress)
+    encoded = codec.encode(event)
+
+    assert encoded.startswith(ZSTD_PREFIX) == compress
+    assert codec.decode(encoded) == event
+
+
+def test_event_codec_compatibility():
+    plain, compressed = EventCodec(), EventCodec(compress=True)
+
+    assert compressed.decode(plain.encode(event)) == event
+    assert plain.decode(compressed.encode(event)) == event
+    assert len(compressed.encode(event)) < len(plain.encode(event))
+
+
+@pytest.mark.django_db
+def test_store_codec():
+    legacy_store = RedisClusterEventProcessingStore()
+    store = RedisClusterEventProcessingStore(codec="zstd")
+
+    key = legacy_store.store(event)
+    assert store.get(key) == event
+
+    unprocessed_key = store.store(event, unprocessed=True)
+    assert store.inner.store.get(unprocessed_key).startswith(ZSTD_PREFIX)
+    assert legacy_store.get(key, unprocessed=True) == event
+
+    store.delete(event)
+    assert store.get(key) is None
+    assert store.get(key, unprocessed=True) is None
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        RedisClusterEventProcessingStore(codec="xml")
@@ -1,6 +1,7 @@
 import copy
+from unittest import mock
 
-from sentry.eventstore.compressor import assemble, deduplicate
+from sentry.eventstore.compressor import Deduplicator, assemble, deduplicate
 
 
 def _assert_roundtrip(data, assert_extra_keys=None):
@@ -52,3 +53,49 @@ def test_basic():
             }
         },
     )
+
+
+def test_interfaces():
+    _assert_roundtrip({"modules": {"foo": "1.0", "bar": "2.0"}})
+    _assert_roundtrip({"sdk": {"name": "sentry.java", "version": "6.0.0"}})
+    _assert_roundtrip({"sdk": None, "modules": {}})
+    _assert_roundtrip({"contexts": None})
+    _assert_roundtrip({"contexts": {}})
+    _assert_roundtrip({"contexts": {"os": {"name": "Linux"}}})
+    _assert_roundtrip(
+        {
+            "contexts": {
+                "runtime": {"name": "CPython", "version": "3.8.16"},
+                "trace": {"trace_id": "a" * 32},
+            }
+        }
+    )
+
+
+def test_deduplicator():
+    def make_event(i):
+        return {
+            "event_id": f"{i:032x}",
+            "modules": {"foo": "1.0"},
+            "contexts": {"os": {"name": "Linux"}, "trace": {"trace_id": f"{i:032x}"}},
+        }
+
+    events = [make_event(i) for i in range(3)]
+
+    deduplicator = Deduplicator()
+    with mock.patch("sentry.eventstore.compressor.metrics") as metrics:
+        deduplicated = [deduplicator.deduplicate(copy.deepcopy(event)) for event in events]
+
+    results = [call.kwargs["tags"]["result"] for call in metrics.incr.call_args_list]
+    assert sorted(results) == ["hit"] * 4 + ["miss"] * 2
+
+    assert len(deduplicator.documents) == 2
+    assert sorted(deduplicator.refcounts.values()) == [3, 3]
+    for event in deduplicated:
+        assert "modules" not in event
+        assert "contexts" not in event
+        patchsets = {key: inlined for key, _, inlined in event["__nodestore_patchsets"]}
+        assert patchsets["contexts"] == {"trace": {"trace_id": event["event_id"]}}
+
+    for event, data in zip(events, deduplicated):
+        assert assemble(data, lambda checksums: deduplicator.documents) == event
@@ -1,22 +1,18 @@
 import pytest
 
 from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.enhancer import ENHANCEMENT_BASES, Enhancements, _iter_rule_actions
+from sentry.grouping.enhancer.compiled import CompiledRules
+from sentry.grouping.enhancer.matchers import create_match_frame
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.safe import get_path
 from tests.sentry.grouping import grouping_input as grouping_inputs
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
 
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
@@ -37,3 +33,43 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+def _collect_match_frames():
+    rv = []
+    for grouping_input in grouping_inputs:
+        platform = grouping_input.data.get("platform") or "native"
+        for container in get_path(grouping_input.data, "exception", "values", filter=True) or ():
+            frames = get_path(container, "stacktrace", "frames", filter=True)
+            if frames:
+                rv.append(
+                    ([create_match_frame(frame, platform) for frame in frames], platform, container)
+                )
+    return rv
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("base", sorted(ENHANCEMENT_BASES))
+@pytest.mark.parametrize("engine", ["interpreter", "compiled"])
+def test_benchmark_enhancement_rules(base, engine, benchmark):
+    rules = Enhancements([], bases=[base])._updater_rules
+    stacktraces = _collect_match_frames()
+
+    if engine == "compiled":
+        compiled = CompiledRules(rules)
+
+        def run():
+            for match_frames, platform, container in stacktraces:
+                for _ in compiled.iter_matching_frame_actions(
+                    match_frames, platform, container, {}
+                ):
+                    pass
+
+    else:
+
+        def run():
+            for match_frames, platform, container in stacktraces:
+                for _ in _iter_rule_actions(rules, match_frames, platform, container, {}):
+                    pass
+
+    benchmark(run)
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 from typing import Any
+from unittest import mock
 
 import pytest
 
 from sentry.grouping.component import GroupingComponent
-from sentry.grouping.enhancer import Enhancements
+from sentry.grouping.enhancer import (
+    ENHANCEMENT_BASES,
+    Enhancements,
+    _iter_rule_actions,
+    local_frame_values_cache,
+)
+from sentry.grouping.enhancer.compiled import CompiledRules
 from sentry.grouping.enhancer.exceptions import InvalidEnhancerConfig
 from sentry.grouping.enhancer.matchers import create_match_frame
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.safe import get_path
+from tests.sentry.grouping import with_grouping_input
 
 
 def dump_obj(obj):
@@ -448,3 +458,107 @@ def test_app_no_matches(frame):
     enhancements = Enhancements.from_config_string("app:no +app")
     enhancements.apply_modifications_to_frame([frame], "native", None)
     assert frame.get("in_app")
+
+
+def _iter_stacktrace_frames(data):
+    for path in (("exception", "values"), ("threads", "values")):
+        for container in get_path(data, *path, filter=True) or ():
+            frames = get_path(container, "stacktrace", "frames", filter=True)
+            if frames:
+                yield frames, container
+    frames = get_path(data, "stacktrace", "frames", filter=True)
+    if frames:
+        yield frames, None
+
+
+def _collect_actions(iterator):
+    return [(rule, idx, action) for rule, actions in iterator for idx, action in actions]
+
+
+@pytest.mark.parametrize("base", sorted(ENHANCEMENT_BASES))
+@with_grouping_input("grouping_input")
+def test_compiled_rules_match_interpreter(base, grouping_input):
+    enhancements = Enhancements([], bases=[base])
+    compiled = CompiledRules(enhancements._updater_rules)
+    platform = grouping_input.data.get("platform") or "native"
+
+    for frames, container in _iter_stacktrace_frames(grouping_input.data):
+        match_frames = [create_match_frame(frame, platform) for frame in frames]
+        expected = _collect_actions(
+            _iter_rule_actions(enhancements._updater_rules, match_frames, platform, container, {})
+        )
+        actual = _collect_actions(
+            compiled.iter_matching_frame_actions(match_frames, platform, container, {})
+        )
+        assert actual == expected
+
+
+@pytest.mark.parametrize("use_compiled_rules", [False, True])
+def test_compiled_rules_see_earlier_modifications(use_compiled_rules):
+    enhancements = Enhancements.from_config_string(
+        """
+        function:foo                        +app
+        app:yes                             category=mine
+        category:mine | [ function:bar ]    -app
+        !path:**/vendor/** module:lib.*     category=lib
+        """
+    )
+    frames = [
+        {"function": "foo", "module": "app.foo", "abs_path": "/src/foo.py"},
+        {"function": "bar", "module": "lib.bar", "abs_path": "/src/vendor/bar.py"},
+        {"function": "baz", "module": "lib.baz", "abs_path": "/src/lib/baz.py"},
+    ]
+
+    with override_options({"grouping.enhancer.use-compiled-rules": use_compiled_rules}):
+        enhancements.apply_modifications_to_frame(frames, "python", {})
+
+    assert [frame.get("in_app") for frame in frames] == [False, None, None]
+    assert [get_path(frame, "data", "category") for frame in frames] == ["mine", None, "lib"]
+
+
+@override_options({"grouping.enhancer.local-frame-cache.enabled": True})
+def test_local_frame_cache_skips_remote_cache():
+    local_frame_values_cache.clear()
+    enhancements = Enhancements.from_config_string("function:foo category=bar")
+
+    with mock.patch("sentry.grouping.enhancer.cache") as remote_cache:
+        remote_cache.get.return_value = None
+        frames = [{"function": "foo"}]
+        enhancements.apply_modifications_to_frame(frames, "python", {})
+        assert get_path(frames[0], "data", "category") == "bar"
+        assert remote_cache.set.call_count == 1
+        remote_cache.get.reset_mock()
+
+        frames = [{"function": "foo"}]
+        enhancements.apply_modifications_to_frame(frames, "python", {})
+        assert get_path(frames[0], "data", "category") == "bar"
+        assert remote_cache.get.call_count == 0
+        assert remote_cache.set.call_count == 1
+
+    local_frame_values_cache.clear()
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        "package:**/libart.so",
+        "path:**/nvcuda.dll",
+        "package:*/libart.so",
+        "package:/libart.so",
+        "path:**nvcuda.dll",
+    ],
+)
+@pytest.mark.parametrize("value", ["libart.so", "nvcuda.dll", "/lib/libart.so", "lib\\nvcuda.dll"])
+def test_compiled_rules_match_slashless_paths(rule, value):
+    enhancements = Enhancements.from_config_string(f"{rule} -app")
+    compiled = CompiledRules(enhancements._updater_rules)
+    frames = [{"package": value, "abs_path": value}]
+    match_frames = [create_match_frame(frame, "native") for frame in frames]
+
+    expected = _collect_actions(
+        _iter_rule_actions(enhancements._updater_rules, match_frames, "native", None, {})
+    )
+    actual = _collect_actions(
+        compiled.iter_matching_frame_actions(match_frames, "native", None, {})
+    )
+    assert actual == expected
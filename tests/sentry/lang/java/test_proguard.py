@@ -0,0 +1,93 @@
+import pytest
+
+from sentry.lang.java.proguard import ProguardMapperCache
+from sentry.testutils.helpers.options import override_options
+
+PROGUARD_SOURCE = b"""\
+# compiler: R8
+# compiler_version: 2.0.74
+# min_api: 16
+# pg_map_id: 5b46fdc
+# common_typos_disable
+# {"id":"com.android.tools.r8.mapping","version":"1.0"}
+org.slf4j.helpers.Util$ClassContextSecurityManager -> org.a.b.g$a:
+    65:65:void <init>() -> <init>
+    67:67:java.lang.Class[] getClassContext() -> a
+"""
+
+
+@pytest.fixture
+def mapping_files(tmp_path):
+    paths = []
+    for i in range(3):
+        path = str(tmp_path.joinpath(f"mapping_file_{i}"))
+        with open(path, "wb") as f:
+            f.write(PROGUARD_SOURCE)
+        paths.append((f"debug-id-{i}", path))
+    return paths
+
+
+def test_disabled(mapping_files):
+    cache = ProguardMapperCache()
+    debug_id, path = mapping_files[0]
+
+    with override_options({"proguard.mapper-cache.max-bytes": 0}):
+        with cache.open(debug_id, path) as mapper:
+            assert mapper.remap_class("org.a.b.g$a") == (
+                "org.slf4j.helpers.Util$ClassContextSecurityManager"
+            )
+        with cache.open(debug_id, path) as other_mapper:
+            assert other_mapper is not mapper
+
+
+def test_reuses_mappers(mapping_files):
+    cache = ProguardMapperCache()
+    debug_id, path = mapping_files[0]
+
+    with override_options({"proguard.mapper-cache.max-bytes": 10 * len(PROGUARD_SOURCE)}):
+        with cache.open(debug_id, path) as mapper:
+            assert mapper.has_line_info
+            with cache.open(debug_id, path) as other_mapper:
+                assert other_mapper is mapper
+        with cache.open(debug_id, path) as other_mapper:
+            assert other_mapper is mapper
+
+
+def test_evicts_least_recently_used(mapping_files):
+    cache = ProguardMapperCache()
+    (id_a, path_a), (id_b, path_b), (id_c, path_c) = mapping_files
+
+    with override_options({"proguard.mapper-cache.max-bytes": 2 * len(PROGUARD_SOURCE)}):
+        with cache.open(id_a, path_a) as mapper_a:
+            pass
+        with cache.open(id_b, path_b) as mapper_b:
+            pass
+        with cache.open(id_a, path_a) as mapper:
+            assert mapper is mapper_a
+        with cache.open(id_c, path_c):
+            pass
+
+        with cache.open(id_a, path_a) as mapper:
+            assert mapper is mapper_a
+        with cache.open(id_b, path_b) as mapper:
+            assert mapper is not mapper_b
+
+
+def test_does_not_evict_mappers_in_use(mapping_files):
+    cache = ProguardMapperCache()
+    (id_a, path_a), (id_b, path_b), _ = mapping_files
+
+    with override_options({"proguard.mapper-cache.max-bytes": len(PROGUARD_SOURCE)}):
+        with cache.open(id_a, path_a) as mapper_a:
+            # Exceeds the size while `mapper_a` is in use
+            with cache.open(id_b, path_b) as mapper_b:
+                with cache.open(id_a, path_a) as mapper:
+                    assert mapper is mapper_a
+                with cache.open(id_b, path_b) as mapper:
+                    assert mapper is mapper_b
+
+        # `mapper_b` was evicted as soon as it was released
+        with cache.open(id_a, path_a) as mapper:
+            assert mapper is mapper_a
+        with cache.open(id_b, path_b) as mapper:
+            assert mapper is not mapper_b
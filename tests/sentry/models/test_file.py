@@ -1,7 +1,9 @@
+import errno
 import os
+import tempfile
 from datetime import timedelta
 from io import BytesIO
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 from django.core.files.base import ContentFile
@@ -191,3 +193,66 @@ class FileTest(TestCase):
 
         f = file.getfile(prefetch=True)
         assert f.read() == random_data
+
+    def test_multi_chunk_prefetch_readahead(self):
+        random_data = os.urandom(1 << 23)
+
+        fileobj = ContentFile(random_data)
+        file = File.objects.create(name="test.bin", type="default", size=len(random_data))
+        file.putfile(fileobj, blob_size=1 << 20)
+
+        with override_options(
+            {"filestore.prefetch-readahead": True, "filestore.prefetch-concurrency": 2}
+        ):
+            with file.getfile(prefetch=True) as f:
+                f.seek(-10, os.SEEK_END)
+                assert f.read() == random_data[-10:]
+                f.seek(0)
+                assert f.read(100) == random_data[:100]
+                assert f.read() == random_data[100:]
+
+            f = file._get_chunked_blob(prefetch=True).detach_tempfile()
+            assert f.read() == random_data
+            f.close()
+
+    def test_prefetch_blob_cache(self):
+        random_data = os.urandom(1 << 21)
+
+        fileobj = ContentFile(random_data)
+        file = File.objects.create(name="test.bin", type="default", size=len(random_data))
+        file.putfile(fileobj, blob_size=1 << 20)
+
+        with tempfile.TemporaryDirectory() as cache_path, override_options(
+            {"filestore.blob-cache-path": cache_path}
+        ):
+            assert file.getfile(prefetch=True).read() == random_data
+            for blob in file.blobs.all():
+                assert os.path.isfile(os.path.join(cache_path, blob.checksum[:2], blob.checksum))
+
+            with patch.object(FileBlob, "getfile", side_effect=AssertionError("not cached")):
+                assert file.getfile(prefetch=True).read() == random_data
+
+    def test_prefetch_blob_cache_write_failure(self):
+        random_data = os.urandom(1 << 21)
+
+        fileobj = ContentFile(random_data)
+        file = File.objects.create(name="test.bin", type="default", size=len(random_data))
+        file.putfile(fileobj, blob_size=1 << 20)
+
+        named_temporary_file = tempfile.NamedTemporaryFile
+
+        def failing_temporary_file(*args, **kwargs):
+            f = named_temporary_file(*args, **kwargs)
+            # Only the blob cache writes fail, not the prefetch temp file.
+            if kwargs.get("prefix") == "._blob-":
+                f.write = Mock(side_effect=OSError(errno.ENOSPC, "No space left on device"))
+            return f
+
+        with tempfile.TemporaryDirectory() as cache_path, override_options(
+            {"filestore.blob-cache-path": cache_path}
+        ), patch(
+            "sentry.models.files.abstractfile.tempfile.NamedTemporaryFile",
+            side_effect=failing_temporary_file,
+        ):
+            assert file.getfile(prefetch=True).read() == random_data
+            assert [files for _, _, files in os.walk(cache_path) if files] == []
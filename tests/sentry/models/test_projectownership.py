@@ -193,6 +193,43 @@ class ProjectOwnershipTestCase(TestCase):
             ),
         )
 
+    def test_get_owners_compiled_matcher(self):
+        self.code_mapping = self.create_code_mapping(project=self.project2)
+
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        rule_b = Rule(Matcher("path", "src/*"), [Owner("user", self.user.email)])
+        rule_c = Rule(Matcher("codeowners", "/api/"), [Owner("team", self.team2.slug)])
+
+        ProjectOwnership.objects.create(
+            project_id=self.project2.id, schema=dump_schema([rule_a, rule_b]), fallthrough=True
+        )
+        self.create_codeowners(
+            self.project2, self.code_mapping, raw="/api/ @tiger-team", schema=dump_schema([rule_c])
+        )
+
+        with self.options({"ownership.compiled-matcher.cache-size": 10}):
+            self.assert_ownership_equals(
+                ProjectOwnership.get_owners(
+                    self.project2.id, {"stacktrace": {"frames": [{"filename": "api/foo.py"}]}}
+                ),
+                (
+                    [ActorTuple(self.team2.id, Team), ActorTuple(self.team.id, Team)],
+                    [rule_c, rule_a],
+                ),
+            )
+            self.assert_ownership_equals(
+                ProjectOwnership.get_owners(
+                    self.project2.id, {"stacktrace": {"frames": [{"filename": "src/foo.py"}]}}
+                ),
+                (
+                    [ActorTuple(self.team.id, Team), ActorTuple(self.user.id, User)],
+                    [rule_a, rule_b],
+                ),
+            )
+            assert ProjectOwnership.get_owners(
+                self.project2.id, {"stacktrace": {"frames": [{"filename": "xxxx"}]}}
+            ) == (ProjectOwnership.Everyone, None)
+
     def test_get_issue_owners_no_codeowners_or_issueowners(self):
         assert ProjectOwnership.get_issue_owners(self.project.id, {}) == []
 
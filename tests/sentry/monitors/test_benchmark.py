@@ -0,0 +1,78 @@
+import time
+from datetime import datetime
+from unittest import mock
+
+import msgpack
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.backends.local.backend import LocalBroker
+from arroyo.backends.local.storages.memory import MemoryMessageStorage
+from arroyo.commit import IMMEDIATE
+from arroyo.processing.processor import StreamProcessor
+from arroyo.types import Topic
+
+from sentry.monitors.consumers.monitor_consumer import StoreMonitorCheckInStrategyFactory
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+
+NUM_CHECKINS = 1000
+NUM_MONITORS = 50
+# Simulated time spent in queries, locks and rate limits per check-in
+CHECKIN_LATENCY = 0.002
+
+
+pytestmark = requires_pytest_benchmark
+
+
+def make_consumer(factory: StoreMonitorCheckInStrategyFactory):
+    """
+    Produces the check-ins to a local broker standing in for Kafka, and
+    returns a stream processor consuming them.
+    """
+    broker: LocalBroker[KafkaPayload] = LocalBroker(MemoryMessageStorage())
+    topic = Topic("ingest-monitors")
+    broker.create_topic(topic, partitions=1)
+
+    producer = broker.get_producer()
+    for i in range(NUM_CHECKINS):
+        wrapper = {
+            "start_time": datetime.now().timestamp(),
+            "project_id": 1,
+            "payload": json.dumps(
+                {"monitor_slug": f"monitor-{i % NUM_MONITORS}", "check_in_id": str(i)}
+            ),
+            "sdk": "test/1.0",
+        }
+        producer.produce(topic, KafkaPayload(None, msgpack.packb(wrapper), [])).result()
+
+    return StreamProcessor(
+        consumer=broker.get_consumer("ingest-monitors"),
+        topic=topic,
+        processor_factory=factory,
+        commit_policy=IMMEDIATE,
+    )
+
+
+@pytest.mark.parametrize("mode", ["serial", "parallel"])
+@mock.patch("sentry.monitors.consumers.monitor_consumer.try_monitor_tasks_trigger")
+@mock.patch("sentry.monitors.consumers.monitor_consumer._process_checkin")
+def test_consume_checkins(process_checkin, try_monitor_tasks_trigger, benchmark, mode):
+    processed = []
+
+    def process(params, *args):
+        time.sleep(CHECKIN_LATENCY)
+        processed.append(params["check_in_id"])
+
+    process_checkin.side_effect = process
+
+    def setup():
+        factory = StoreMonitorCheckInStrategyFactory(mode=mode, max_batch_size=100)
+        return (make_consumer(factory), factory), {}
+
+    def consume(processor, factory):
+        processed.clear()
+        while len(processed) < NUM_CHECKINS:
+            processor._run_once()
+        factory.shutdown()
+
+    benchmark.pedantic(consume, setup=setup, rounds=3)
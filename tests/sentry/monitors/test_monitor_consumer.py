@@ -580,3 +580,61 @@ class MonitorConsumerTest(TestCase):
             assert MonitorCheckIn.objects.filter(guid=self.guid).exists()
             logger.exception.assert_called_with("Failed to trigger monitor tasks", exc_info=True)
             try_monitor_tasks_trigger.side_effect = None
+
+    @mock.patch("sentry.monitors.consumers.monitor_consumer.try_monitor_tasks_trigger")
+    @mock.patch("sentry.monitors.consumers.monitor_consumer._process_checkin")
+    def test_parallel_monitor_checkins(self, process_checkin, try_monitor_tasks_trigger):
+        processed = []
+        process_checkin.side_effect = lambda params, *args: processed.append(
+            (params["monitor_slug"], params["check_in_id"])
+        )
+        # The clock is driven after every check-in of the batch is stored
+        try_monitor_tasks_trigger.side_effect = lambda *args: processed.append(("clock", None))
+
+        factory = StoreMonitorCheckInStrategyFactory(mode="parallel", max_batch_size=10)
+        commit = mock.Mock()
+        partition = Partition(Topic("test"), 0)
+        strategy = factory.create_with_partitions(commit, {partition: 0})
+
+        ts = datetime.now()
+        wrappers: list[dict[str, Any]] = [
+            {
+                "start_time": ts.timestamp(),
+                "project_id": self.project.id,
+                "payload": json.dumps({"monitor_slug": slug, "check_in_id": str(i)}),
+                "sdk": "test/1.0",
+            }
+            for i, slug in enumerate(["a", "b", "a", "c", "a", "b"])
+        ]
+        wrappers.insert(3, {"message_type": "clock_pulse"})
+
+        for offset, wrapper in enumerate(wrappers):
+            strategy.submit(
+                Message(
+                    BrokerValue(
+                        KafkaPayload(b"fake-key", msgpack.packb(wrapper), []),
+                        partition,
+                        offset,
+                        ts,
+                    )
+                )
+            )
+
+        # Nothing is processed or committed before the batch is complete
+        assert process_checkin.call_count == 0
+        assert commit.call_count == 0
+
+        strategy.close()
+        strategy.join()
+        factory.shutdown()
+
+        # Check-ins of the same monitor are processed in order
+        assert [i for slug, i in processed if slug == "a"] == ["0", "2", "4"]
+        assert [i for slug, i in processed if slug == "b"] == ["1", "5"]
+        assert [i for slug, i in processed if slug == "c"] == ["3"]
+
+        # The clock is driven once per partition, offsets are committed once
+        try_monitor_tasks_trigger.assert_called_once_with(ts, 0)
+        assert processed[-1] == ("clock", None)
+        assert len(processed) == 7
+        assert commit.call_args_list[0] == mock.call({partition: len(wrappers)})
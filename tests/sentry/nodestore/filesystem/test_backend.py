@@ -0,0 +1,28 @@
+import pytest
+from django.test import override_settings
+
+from sentry.nodestore.filesystem.backend import FileSystemNodeStorage
+
+
+@pytest.fixture
+def ns(tmp_path):
+    with override_settings(DEBUG=True):
+        ns = FileSystemNodeStorage(path=str(tmp_path))
+        ns.bootstrap()
+        yield ns
+
+
+def test_get_multi(ns):
+    nodes = {f"{i:032x}": {"foo": i} for i in range(20)}
+    for node_id, data in nodes.items():
+        ns.set(node_id, data)
+
+    assert ns.get_multi(list(nodes)) == nodes
+    assert dict(ns.iter_multi(list(nodes))) == nodes
+
+
+def test_get_multi_missing(ns):
+    ns.set("a" * 32, {"foo": "a"})
+
+    with pytest.raises(FileNotFoundError):
+        ns.get_multi(["a" * 32, "b" * 32])
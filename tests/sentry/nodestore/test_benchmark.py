@@ -0,0 +1,59 @@
+from contextlib import contextmanager, nullcontext
+
+import pytest
+from django.test import override_settings
+
+from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.nodestore.filesystem.backend import FileSystemNodeStorage
+from sentry.testutils.silo import region_silo_test
+from sentry.testutils.skips import requires_pytest_benchmark
+from tests.sentry.nodestore.bigtable.test_backend import MockedBigtableNodeStorage
+
+NUM_NODES = 200
+
+
+@contextmanager
+def filesystem_nodestorage(path):
+    with override_settings(DEBUG=True):
+        yield FileSystemNodeStorage(path=str(path))
+
+
+@pytest.fixture(
+    params=["bigtable-mocked", "filesystem", pytest.param("django", marks=pytest.mark.django_db)]
+)
+def ns(request, tmp_path):
+    backends = {
+        "bigtable-mocked": lambda: nullcontext(MockedBigtableNodeStorage(project="test")),
+        "filesystem": lambda: filesystem_nodestorage(tmp_path),
+        "django": lambda: nullcontext(DjangoNodeStorage()),
+    }
+
+    with backends[request.param]() as ns:
+        ns.bootstrap()
+        # Measure the backends, not the node cache
+        ns.cache = None
+        yield ns
+
+
+@pytest.fixture
+def node_ids(ns):
+    node_ids = [f"{i:032x}" for i in range(NUM_NODES)]
+    for node_id in node_ids:
+        ns.set(node_id, {"id": node_id, "message": "hello world" * 100})
+    return node_ids
+
+
+@requires_pytest_benchmark
+@region_silo_test
+def test_benchmark_get_multi(ns, node_ids, benchmark):
+    result = benchmark(ns.get_multi, node_ids)
+    assert len(result) == NUM_NODES
+
+
+@requires_pytest_benchmark
+@region_silo_test
+def test_benchmark_iter_multi(ns, node_ids, benchmark):
+    def consume_first():
+        return next(ns.iter_multi(node_ids))
+
+    assert benchmark(consume_first)
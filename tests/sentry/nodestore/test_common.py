@@ -7,6 +7,7 @@ from contextlib import nullcontext
 import pytest
 
 from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import region_silo_test
 from tests.sentry.nodestore.bigtable.test_backend import (
     MockedBigtableNodeStorage,
@@ -42,6 +43,22 @@ def test_get_multi(ns):
     assert result == {n[0]: n[1] for n in nodes}
 
 
+@region_silo_test
+def test_iter_multi(ns):
+    nodes = {f"{i:032x}": {"foo": i} for i in range(5)}
+    for node_id, data in nodes.items():
+        ns.set(node_id, data)
+
+    result = list(ns.iter_multi(list(nodes)))
+    assert len(result) == len(nodes)
+    assert dict(result) == nodes
+
+    ns.set_subkeys("c" * 32, {None: {"foo": "c"}, "other": {"foo": "d"}})
+    result = dict(ns.iter_multi(["c" * 32, "0" * 32], subkey="other"))
+    assert result["c" * 32] == {"foo": "d"}
+    assert result["0" * 32] is None
+
+
 @region_silo_test
 def test_set(ns):
     node_id = "d2502ebbd7df41ceba8d3275595cac33"
@@ -97,3 +114,21 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@region_silo_test
+def test_compressed_payloads(ns):
+    ns.set("node_1", {"foo": "a"})
+    with override_options({"nodestore.zstd-compression": True}):
+        ns.set_subkeys("node_2", {None: {"foo": "b", "platform": "python"}, "other": {"foo": "c"}})
+        assert ns.get_bytes("node_2")[0] != ord("{")
+
+    # Old and new payloads can be read regardless of the option
+    ns.cache = None
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_2") == {"foo": "b", "platform": "python"}
+    assert ns.get("node_2", subkey="other") == {"foo": "c"}
+    assert ns.get_multi(["node_1", "node_2"]) == {
+        "node_1": {"foo": "a"},
+        "node_2": {"foo": "b", "platform": "python"},
+    }
@@ -0,0 +1,67 @@
+import pytest
+
+from sentry.nodestore.base import json_dumps
+from sentry.nodestore.compression import (
+    CODEC_ZSTD,
+    UnknownDictionary,
+    ZstdDictionaries,
+    compress,
+    decompress,
+    train_dictionary,
+)
+from sentry.testutils.helpers.options import override_options
+
+
+def make_payload(i):
+    return json_dumps(
+        {
+            "event_id": f"{i:032x}",
+            "platform": "python",
+            "message": f"Something went wrong in request {i}",
+            "tags": [["environment", "production"], ["server_name", f"web-{i % 7}"]],
+        }
+    ).encode("utf8")
+
+
+@pytest.fixture
+def dictionaries(tmp_path, monkeypatch):
+    path = tmp_path / "python.dict"
+    path.write_bytes(train_dictionary((make_payload(i) for i in range(1000)), dict_size=4096))
+
+    dictionaries = ZstdDictionaries({"python": str(path)})
+    monkeypatch.setattr("sentry.nodestore.compression.dictionaries", dictionaries)
+    return dictionaries
+
+
+def test_disabled():
+    payload = make_payload(1)
+    assert compress(payload, platform="python") == payload
+    assert decompress(payload) == payload
+
+
+@override_options({"nodestore.zstd-compression": True})
+def test_roundtrip():
+    payload = make_payload(1)
+    compressed = compress(payload)
+    assert compressed[0] == CODEC_ZSTD
+    assert decompress(compressed) == payload
+
+
+@override_options({"nodestore.zstd-compression": True})
+def test_dictionary(dictionaries):
+    payload = make_payload(5000)
+    with_dictionary = compress(payload, platform="python")
+    without_dictionary = compress(payload, platform="javascript")
+
+    assert len(with_dictionary) < len(without_dictionary)
+    assert decompress(with_dictionary) == payload
+    assert decompress(without_dictionary) == payload
+
+
+@override_options({"nodestore.zstd-compression": True})
+def test_unknown_dictionary(dictionaries, monkeypatch):
+    compressed = compress(make_payload(1), platform="python")
+
+    monkeypatch.setattr("sentry.nodestore.compression.dictionaries", ZstdDictionaries({}))
+    with pytest.raises(UnknownDictionary):
+        decompress(compressed)
@@ -1,5 +1,5 @@
 from functools import cached_property
-from unittest.mock import patch
+from unittest.mock import call, patch
 from uuid import uuid1
 
 import pytest
@@ -9,7 +9,7 @@ from django.test import override_settings
 
 from sentry.models.options.option import Option
 from sentry.options.manager import OptionsManager, UpdateChannel
-from sentry.options.store import OptionsStore
+from sentry.options.store import VERSION_KEY, OptionsStore
 from sentry.testutils.cases import TestCase
 from sentry.testutils.silo import no_silo_test
 
@@ -164,3 +164,91 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+    def test_metrics_backend_reading_options(self):
+        store, key = self.store, self.key
+        store.set(key, "bar", UpdateChannel.CLI)
+        store.flush_local_cache()
+
+        # Metrics backends read options while emitting the metrics of the store
+        with patch("sentry.utils.metrics.timing", side_effect=lambda *a: store.get(key)) as timing:
+            assert store.get(key) == "bar"
+
+        assert timing.call_count == 1
+        assert key.cache_key in store._local_cache
+
+    @patch("sentry.options.store.time")
+    def test_push_invalidation(self, mocked_time):
+        writer = self.store
+        reader = OptionsStore(cache=writer.cache, push_invalidation=True, poll_interval=0)
+        key, other_key = self.make_key(10, 0), self.make_key(10, 0)
+
+        mocked_time.return_value = 0
+        writer.set(key, "bar", UpdateChannel.CLI)
+        writer.set(other_key, "x", UpdateChannel.CLI)
+        assert reader.get(key) == "bar"
+        assert reader.get(other_key) == "x"
+
+        # Beyond the ttl, values are served from memory as long as nothing changed
+        mocked_time.return_value = 100
+        with patch.object(reader.cache, "get", wraps=reader.cache.get) as cache_get:
+            assert reader.get(key) == "bar"
+        assert cache_get.call_args_list == [call(VERSION_KEY)]
+        reader.clean_local_cache()
+        assert len(reader._local_cache) == 2
+
+        # Only the changed option is refreshed
+        writer.set(key, "baz", UpdateChannel.CLI)
+        with patch.object(reader, "flush_local_cache") as flush_local_cache:
+            assert reader.get(key) == "baz"
+            assert reader.get(other_key) == "x"
+        assert not flush_local_cache.called
+
+        writer.delete(key)
+        assert reader.get(key) is None
+
+    @patch("sentry.options.store.time")
+    def test_push_invalidation_missing_changes(self, mocked_time):
+        writer = self.store
+        reader = OptionsStore(cache=writer.cache, push_invalidation=True, poll_interval=0)
+        key, other_key = self.make_key(10, 0), self.make_key(10, 0)
+
+        mocked_time.return_value = 0
+        writer.set(key, "bar", UpdateChannel.CLI)
+        writer.set(other_key, "x", UpdateChannel.CLI)
+        assert reader.get(key) == "bar"
+        assert reader.get(other_key) == "x"
+
+        writer.set(key, "baz", UpdateChannel.CLI)
+        version = writer.cache.get(VERSION_KEY)
+        writer.cache.delete(f"{VERSION_KEY}:{version}")
+
+        # We can't tell which options changed, so everything is refetched
+        assert reader.get(other_key) == "x"
+        assert list(reader._local_cache) == [other_key.cache_key]
+        assert reader.get(key) == "baz"
+
+    @patch("sentry.options.store.time")
+    def test_push_invalidation_version_unavailable(self, mocked_time):
+        writer = self.store
+        reader = OptionsStore(cache=writer.cache, push_invalidation=True, poll_interval=0)
+        key = self.make_key(10, 0)
+
+        mocked_time.return_value = 0
+        writer.set(key, "bar", UpdateChannel.CLI)
+        assert reader.get(key) == "bar"
+
+        Option.objects.filter(key=key.name).update(value="lol")
+        writer.cache.set(key.cache_key, "lol")
+        cache_get = reader.cache.get
+
+        def get(cache_key, *args, **kwargs):
+            if cache_key == VERSION_KEY:
+                raise RuntimeError()
+            return cache_get(cache_key, *args, **kwargs)
+
+        # Without a version, the ttl applies again
+        with patch.object(reader.cache, "get", side_effect=get):
+            assert reader.get(key) == "bar"
+            mocked_time.return_value = 15
+            assert reader.get(key) == "lol"
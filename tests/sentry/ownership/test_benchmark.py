@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Mapping
+
+import pytest
+
+from sentry.ownership.compiled import CompiledRules
+from sentry.ownership.grammar import Matcher, Owner, Rule
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_RULES = 5000
+NUM_FRAMES = 50
+
+
+pytestmark = requires_pytest_benchmark
+
+
+@pytest.fixture(scope="module")
+def rules() -> list[Rule]:
+    """
+    A large CODEOWNERS file, in the shapes commonly found in monorepos.
+    """
+    rng = random.Random(0)
+    owner = [Owner("team", "owners")]
+    rules = []
+    for i in range(NUM_RULES):
+        pattern = rng.choice(
+            [
+                f"/packages/pkg-{i}/",
+                f"/services/svc-{i}/src/**",
+                f"**/module_{i}/",
+                f"/apps/app-{i}/*.ts",
+                f"docs/section-{i}",
+            ]
+        )
+        rules.append(Rule(Matcher("codeowners", pattern), owner))
+    rules.append(Rule(Matcher("codeowners", "*.py"), owner))
+    rules.append(Rule(Matcher("codeowners", "/"), owner))
+    return rules
+
+
+@pytest.fixture(scope="module")
+def data() -> Mapping[str, Any]:
+    frames = [
+        {
+            "filename": f"services/svc-{i * 97}/src/handlers/handler_{i}.py",
+            "abs_path": f"/srv/app/services/svc-{i * 97}/src/handlers/handler_{i}.py",
+        }
+        for i in range(NUM_FRAMES)
+    ]
+    return {"platform": "python", "exception": {"values": [{"stacktrace": {"frames": frames}}]}}
+
+
+def test_match_rules(benchmark, rules: list[Rule], data: Mapping[str, Any]):
+    benchmark(lambda: [rule for rule in rules if rule.test(data)])
+
+
+def test_match_compiled_rules(benchmark, rules: list[Rule], data: Mapping[str, Any]):
+    compiled = CompiledRules(rules)
+    assert compiled.matching_rules(data) == [rule for rule in rules if rule.test(data)]
+    benchmark(compiled.matching_rules, data)
+
+
+def test_compile_rules(benchmark, rules: list[Rule]):
+    benchmark(CompiledRules, rules)
@@ -0,0 +1,104 @@
+import pytest
+
+from sentry.ownership.compiled import CompiledRules, SegmentIndex, compiled_rules_cache
+from sentry.ownership.grammar import dump_schema, parse_rules
+from sentry.testutils.helpers.options import override_options
+
+rules_text = """
+*.js                            #frontend
+path:src/sentry/*               #backend
+path:*/tests/*                  #qa
+path:*.PY                       #python
+url:http://google.com/*         #backend
+url:*/checkout*                 #payments
+tags.foo:bar                    #tagteam
+module:foo.bar                  #workflow
+module:foo.*                    #workflow
+codeowners:/src/components/     #frontend
+codeowners:frontend/*.ts        #frontend
+codeowners:**/migrations/**     #database
+codeowners:docs                 #docs
+codeowners:*.java               #android
+codeowners:/                    #everyone
+codeowners:\\filename           #backslash
+"""
+
+events = [
+    {},
+    {"stacktrace": {"frames": [{"filename": "foo/file.py"}, {"abs_path": "/usr/src/app.py"}]}},
+    {"stacktrace": {"frames": [{"filename": "src/sentry/api/base.py"}]}},
+    {"stacktrace": {"frames": [{"filename": "SRC\\sentry\\models\\group.py"}]}},
+    {"stacktrace": {"frames": [{"filename": "static/app/index.js"}, {"filename": "x/tests/y"}]}},
+    {"stacktrace": {"frames": [{"filename": "frontend/app.ts"}, {"filename": "frontend/a/b.ts"}]}},
+    {"stacktrace": {"frames": [{"filename": "src/components/button.tsx"}]}},
+    {"stacktrace": {"frames": [{"filename": "app/db/migrations/0001_initial.py"}]}},
+    {"stacktrace": {"frames": [{"filename": "docs/index.md"}, {"filename": "docsite/x.md"}]}},
+    {"stacktrace": {"frames": [{"filename": "foo/subdir/\\/backslash_dir"}]}},
+    {"stacktrace": {"frames": [{"module": "foo.bar"}, {"module": "foo.baz.qux"}]}},
+    {"stacktrace": {"frames": [None, {"filename": None}, {"module": ""}]}},
+    {"request": {"url": "http://google.com/search"}},
+    {"request": {"url": "https://example.com/shop/checkout/pay"}},
+    {"tags": [["foo", "bar"]]},
+    {
+        "platform": "java",
+        "exception": {
+            "values": [
+                {
+                    "stacktrace": {
+                        "frames": [
+                            {
+                                "module": "jdk.internal.reflect.NativeMethodAccessorImpl",
+                                "filename": "NativeMethodAccessorImpl.java",
+                            }
+                        ]
+                    }
+                }
+            ]
+        },
+    },
+]
+
+
+@pytest.mark.parametrize("data", events)
+def test_matching_rules(data):
+    rules = parse_rules(rules_text)
+    compiled = CompiledRules(rules)
+
+    assert compiled.matching_rules(data) == [rule for rule in rules if rule.test(data)]
+
+
+def test_segment_index():
+    index = SegmentIndex()
+    index.add("src/sentry/*", 0)
+    index.add("*.py", 1)
+    index.add("static*", 2)
+    index.add("**/tests/", 3)
+    index.add("*", 4)
+    index.freeze()
+
+    assert index.exact == {"sentry": [0]}
+    assert index.prefix == {"static": [2]}
+    assert index.suffix == {".py": [1], "tests": [3]}
+    assert index.unindexed == [4]
+
+    assert sorted(index.candidates("SRC/Sentry/api.py")) == [0, 1, 4]
+    assert sorted(index.candidates("src/static/app.js")) == [2, 4]
+    assert sorted(index.candidates("src/unittests/test.js")) == [3, 4]
+    assert sorted(index.candidates(1)) == [0, 1, 2, 3, 4]
+
+
+def test_compiled_rules_cache():
+    schema = dump_schema(parse_rules(rules_text))
+    compiled_rules_cache.clear()
+
+    assert compiled_rules_cache.get(schema) is None
+
+    with override_options({"ownership.compiled-matcher.cache-size": 10}):
+        compiled = compiled_rules_cache.get(schema)
+        assert compiled is not None
+        assert compiled_rules_cache.get(dict(schema)) is compiled
+
+        other_schema = dump_schema(parse_rules("*.py #python"))
+        assert compiled_rules_cache.get(other_schema) is not compiled
+
+    compiled_rules_cache.clear()
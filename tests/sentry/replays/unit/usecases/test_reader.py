@@ -0,0 +1,68 @@
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from sentry.replays.usecases.reader import (
+    MAX_QUEUED_DOWNLOADS_PER_WORKER,
+    iter_decompressed,
+    iter_downloads,
+)
+
+
+def test_iter_decompressed():
+    payload = b"[" + b'{"hello":"world"},' * 10000 + b"{}]"
+
+    chunks = list(iter_decompressed(zlib.compress(payload), chunk_size=1024))
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert b"".join(chunks) == payload
+
+    # Uncompressed segments are passed through.
+    assert list(iter_decompressed(payload)) == [payload]
+
+
+def test_iter_downloads_preserves_order():
+    blobs = {i: (b"x" * i if i % 3 else None) for i in range(50)}
+
+    results = iter_downloads(list(blobs), blobs.get, max_workers=4, max_inflight_bytes=100)
+    assert list(results) == list(blobs.values())
+
+
+def test_iter_downloads_bounds_inflight_bytes():
+    downloaded = []
+
+    def download(segment):
+        downloaded.append(segment)
+        return b"x" * 100
+
+    results = iter_downloads(list(range(50)), download, max_workers=4, max_inflight_bytes=300)
+    next(results)
+    # Only as many downloads as fit into the limit are scheduled ahead.
+    assert len(downloaded) <= 5
+    results.close()
+    assert len(downloaded) < 50
+
+
+@pytest.mark.parametrize(
+    "blob,max_scheduled", [(None, 2), (b"x", 2 * MAX_QUEUED_DOWNLOADS_PER_WORKER)]
+)
+def test_iter_downloads_bounds_queue_length(blob, max_scheduled):
+    scheduled = []
+    submit = ThreadPoolExecutor.submit
+
+    def counting_submit(self, fn, segment):
+        scheduled.append(segment)
+        return submit(self, fn, segment)
+
+    # Empty or tiny blobs barely count against the byte limit, the queue is bounded regardless.
+    with mock.patch.object(ThreadPoolExecutor, "submit", counting_submit):
+        results = iter_downloads(
+            list(range(50)), lambda segment: blob, max_workers=2, max_inflight_bytes=1 << 20
+        )
+        # The downloads after the first one are scheduled by the time the second is yielded.
+        next(results)
+        next(results)
+        assert len(scheduled) <= 1 + max_scheduled
+        results.close()
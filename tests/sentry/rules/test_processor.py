@@ -20,6 +20,7 @@ from sentry.rules.filters.base import EventFilter
 from sentry.rules.processor import RuleProcessor
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers import install_slack
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import region_silo_test
 from sentry.testutils.skips import requires_snuba
 from sentry.utils import json
@@ -372,6 +373,52 @@ class RuleProcessorTest(TestCase):
         # mock condition first.
         assert passes.call_count == 0
 
+    @patch(
+        "sentry.constants._SENTRY_RULES",
+        [
+            "sentry.mail.actions.NotifyEmailAction",
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+        ],
+    )
+    def test_batched_frequency_conditions(self):
+        frequency_condition = {
+            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+            "interval": "1h",
+            "value": 5,
+        }
+        self.rule.update(data={"conditions": [frequency_condition], "actions": [EMAIL_ACTION_DATA]})
+        Rule.objects.create(
+            project=self.group_event.project,
+            data={
+                "conditions": [{**frequency_condition, "value": 50}],
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+
+        with override_options({"rules.batch-frequency-conditions": True}), patch(
+            "sentry.rules.processor.rules", init_registry()
+        ), patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.batch_query_hook",
+            return_value={self.group_event.group_id: 10},
+        ) as batch_query_hook, patch(
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition.query_hook"
+        ) as query_hook:
+            rp = RuleProcessor(
+                self.group_event,
+                is_new=True,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            results = list(rp.apply())
+
+        assert len(results) == 1
+        callback, futures = results[0]
+        assert [future.rule for future in futures] == [self.rule]
+        # Both rules query the same interval, which is resolved once for all of them.
+        assert batch_query_hook.call_count == 1
+        assert query_hook.call_count == 0
+
 
 class MockFilterTrue(EventFilter):
     id = "tests.sentry.rules.test_processor.MockFilterTrue"
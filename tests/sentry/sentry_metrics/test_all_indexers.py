@@ -7,6 +7,7 @@ the mock indexer actually behaves the same as the postgres indexer.
 """
 
 from typing import Mapping, Set
+from unittest import mock
 
 import pytest
 
@@ -390,6 +391,46 @@ def test_already_cached_plus_read_results(indexer, indexer_cache, use_case_id) -
         )
 
 
+def test_local_cache(indexer, indexer_cache, use_case_id) -> None:
+    with override_options(
+        {
+            "sentry-metrics.indexer.read-new-cache-namespace": False,
+            "sentry-metrics.indexer.write-new-cache-namespace": False,
+            "sentry-metrics.indexer.local-cache.enabled": True,
+        }
+    ):
+        org_id = 9
+        raw_indexer = indexer
+        indexer = CachingIndexer(indexer_cache, indexer)
+
+        results = indexer.bulk_record({use_case_id: {org_id: {"beep", "boop"}}})
+        beep = results[use_case_id][org_id]["beep"]
+        boop = results[use_case_id][org_id]["boop"]
+
+        # Served from the local tier without going to the remote cache or db
+        indexer_cache.cache.clear()
+        with mock.patch.object(raw_indexer, "bulk_record") as bulk_record:
+            results = indexer.bulk_record({use_case_id: {org_id: {"beep", "boop"}}})
+        assert not bulk_record.called
+        assert results[use_case_id][org_id] == {"beep": beep, "boop": boop}
+        assert_fetch_type_for_tag_string_set(
+            results.get_fetch_metadata()[use_case_id][org_id],
+            FetchType.CACHE_HIT,
+            {"beep", "boop"},
+        )
+
+        assert indexer.resolve(use_case_id, org_id, "beep") == beep
+        assert indexer.reverse_resolve(use_case_id, org_id, boop) == "boop"
+        with mock.patch.object(raw_indexer, "resolve") as resolve, mock.patch.object(
+            raw_indexer, "reverse_resolve"
+        ) as reverse_resolve:
+            indexer_cache.cache.clear()
+            assert indexer.resolve(use_case_id, org_id, "beep") == beep
+            assert indexer.reverse_resolve(use_case_id, org_id, boop) == "boop"
+        assert not resolve.called
+        assert not reverse_resolve.called
+
+
 def test_read_when_bulk_record(indexer, use_case_id):
     with override_options(
         {
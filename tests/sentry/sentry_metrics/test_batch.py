@@ -259,6 +259,44 @@ def test_extract_strings_with_rollout(should_index_tag_values, expected):
     assert not batch.invalid_msg_meta
 
 
+@pytest.mark.django_db
+def test_batch_columns():
+    """
+    Test that the valid messages of a batch are stored column-wise.
+    """
+    invalid_payload = {**counter_payload, "type": "x"}
+    outer_message = _construct_outer_message(
+        [
+            (counter_payload, counter_headers),
+            (invalid_payload, counter_headers),
+            (set_payload, set_headers),
+        ]
+    )
+    batch = IndexerBatch(
+        outer_message,
+        True,
+        False,
+        tags_validator=ReleaseHealthTagsValidator().is_allowed,
+        schema_validator=MetricsSchemaValidator(
+            INGEST_CODEC, RELEASE_HEALTH_SCHEMA_VALIDATION_RULES_OPTION_NAME
+        ).validate,
+    )
+
+    partition = Partition(Topic("topic"), 0)
+    assert batch.invalid_msg_meta == {BrokerMeta(partition, 1)}
+    assert len(batch.columns) == 2
+    assert batch.columns.metas == [BrokerMeta(partition, 0), BrokerMeta(partition, 2)]
+    assert batch.columns.rows == {BrokerMeta(partition, 0): 0, BrokerMeta(partition, 2): 1}
+    assert batch.columns.org_ids == [1, 1]
+    assert batch.columns.use_case_ids == [UseCaseID.SESSIONS, UseCaseID.SESSIONS]
+    assert batch.columns.names == [counter_payload["name"], set_payload["name"]]
+    assert batch.columns.tag_keys == [
+        ("environment", "session.status"),
+        ("environment", "session.status"),
+    ]
+    assert batch.columns.tag_values == [("production", "init"), ("production", "errored")]
+
+
 @pytest.mark.django_db
 def test_extract_strings_with_multiple_use_case_ids():
     """
@@ -0,0 +1,97 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
+
+from sentry.sentry_metrics.configuration import GENERIC_METRICS_SCHEMA_VALIDATION_RULES_OPTION_NAME
+from sentry.sentry_metrics.consumers.indexer.batch import IndexerBatch
+from sentry.sentry_metrics.consumers.indexer.processing import INGEST_CODEC
+from sentry.sentry_metrics.consumers.indexer.schema_validator import MetricsSchemaValidator
+from sentry.sentry_metrics.consumers.indexer.tags_validator import GenericMetricsTagsValidator
+from sentry.sentry_metrics.indexer.base import FetchType, Metadata
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+
+NUM_MESSAGES = 5000
+NUM_ORGS = 20
+NUM_NAMES = 50
+
+pytestmark = [pytest.mark.sentry_metrics]
+
+
+def make_outer_message() -> Message:
+    """
+    A batch of synthetic transaction metrics, with the names and tags repeating
+    like they do in production traffic.
+    """
+    rng = random.Random(0)
+    now = datetime.now(tz=timezone.utc)
+    partition = Partition(Topic("ingest-performance-metrics"), 0)
+    messages = []
+    for offset in range(NUM_MESSAGES):
+        metric_type = rng.choice(["c", "d", "s"])
+        payload = {
+            "name": f"{metric_type}:transactions/measurement_{rng.randrange(NUM_NAMES)}@none",
+            "tags": {
+                "environment": rng.choice(["production", "staging"]),
+                "transaction": f"/api/endpoint/{rng.randrange(100)}/",
+                "release": f"backend@1.{rng.randrange(10)}",
+            },
+            "timestamp": int(now.timestamp()),
+            "type": metric_type,
+            "value": 1 if metric_type == "c" else [rng.randrange(1000)],
+            "org_id": rng.randrange(NUM_ORGS),
+            "retention_days": 90,
+            "project_id": 3,
+        }
+        messages.append(
+            Message(
+                BrokerValue(
+                    KafkaPayload(
+                        None, json.dumps(payload).encode("utf-8"), [("namespace", b"transactions")]
+                    ),
+                    partition,
+                    offset,
+                    now,
+                )
+            )
+        )
+    return Message(Value(messages, messages[-1].committable))
+
+
+def index_batch(outer_message: Message) -> int:
+    batch = IndexerBatch(
+        outer_message,
+        False,
+        False,
+        tags_validator=GenericMetricsTagsValidator().is_allowed,
+        schema_validator=MetricsSchemaValidator(
+            INGEST_CODEC, GENERIC_METRICS_SCHEMA_VALIDATION_RULES_OPTION_NAME
+        ).validate,
+    )
+    strings = batch.extract_strings()
+
+    mapping = {}
+    bulk_record_meta = {}
+    for use_case_id, org_strings in strings.items():
+        for org_id, org_string_set in org_strings.items():
+            ids = {string: i for i, string in enumerate(sorted(org_string_set), 1)}
+            mapping.setdefault(use_case_id, {})[org_id] = ids
+            bulk_record_meta.setdefault(use_case_id, {})[org_id] = {
+                string: Metadata(id=i, fetch_type=FetchType.CACHE_HIT) for string, i in ids.items()
+            }
+
+    return len(batch.reconstruct_messages(mapping, bulk_record_meta).data)
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_index_batch(benchmark):
+    outer_message = make_outer_message()
+
+    assert benchmark(index_batch, outer_message) == NUM_MESSAGES
+
+    # Indexing runs single threaded, this is the throughput of one core.
+    benchmark.extra_info["messages_per_second"] = NUM_MESSAGES / benchmark.stats.stats.mean
@@ -0,0 +1,101 @@
+from unittest import mock
+
+from sentry.stacktraces.processing import StacktraceProcessor, frame_cache, process_stacktraces
+from sentry.testutils.helpers.options import override_options
+
+
+class UppercaseProcessor(StacktraceProcessor):
+    def handles_frame(self, frame, stacktrace_info):
+        return "function" in frame
+
+    def preprocess_frame(self, processable_frame):
+        processable_frame.set_cache_key_from_values([processable_frame["function"]])
+
+    def process_frame(self, processable_frame, processing_task):
+        function = processable_frame.cache_value
+        if function is None:
+            function = processable_frame["function"].upper()
+            processable_frame.set_cache_value(function)
+        return [dict(processable_frame.frame, function=function)], None, None
+
+
+def make_data():
+    return {
+        "exception": {
+            "values": [
+                {"stacktrace": {"frames": [{"function": "foo"}, {"function": "bar"}]}},
+                {"stacktrace": {"frames": [{"function": "foo"}, {"function": "baz"}]}},
+            ]
+        }
+    }
+
+
+def process(data):
+    return process_stacktraces(
+        data, make_processors=lambda data, infos: [UppercaseProcessor(data, infos, project=1)]
+    )
+
+
+def get_functions(data):
+    return [
+        [frame["function"] for frame in exception["stacktrace"]["frames"]]
+        for exception in data["exception"]["values"]
+    ]
+
+
+def test_frame_cache_batches_lookups():
+    with mock.patch("sentry.stacktraces.processing.cache") as remote_cache:
+        remote_cache.get_many.return_value = {}
+        data = process(make_data())
+        assert get_functions(data) == [["FOO", "BAR"], ["FOO", "BAZ"]]
+
+        assert remote_cache.get_many.call_count == 1
+        assert remote_cache.get.call_count == 0
+        assert remote_cache.set.call_count == 0
+        ((values, _), _) = remote_cache.set_many.call_args
+        assert sorted(values.values()) == ["BAR", "BAZ", "FOO"]
+
+        remote_cache.get_many.return_value = {key: "CACHED" for key in values}
+        remote_cache.set_many.reset_mock()
+        data = process(make_data())
+        assert get_functions(data) == [["CACHED", "CACHED"], ["CACHED", "CACHED"]]
+        assert remote_cache.set_many.call_count == 0
+
+
+@override_options({"stacktrace-processing.local-frame-cache.enabled": True})
+def test_local_frame_cache_skips_remote_cache():
+    frame_cache.clear()
+
+    with mock.patch("sentry.stacktraces.processing.cache") as remote_cache:
+        remote_cache.get_many.return_value = {}
+        process(make_data())
+        assert remote_cache.set_many.call_count == 1
+        remote_cache.get_many.reset_mock()
+
+        data = process(make_data())
+        assert get_functions(data) == [["FOO", "BAR"], ["FOO", "BAZ"]]
+        assert remote_cache.get_many.call_count == 0
+        assert remote_cache.set_many.call_count == 1
+
+    frame_cache.clear()
+
+
+@override_options({"stacktrace-processing.local-frame-cache.enabled": True})
+def test_local_frame_cache_copies_values():
+    frame_cache.clear()
+
+    with mock.patch("sentry.stacktraces.processing.cache") as remote_cache:
+        remote_cache.get_many.return_value = {"remote": {"frames": ["a"]}}
+        frame_cache.get_many(["remote"])["remote"]["frames"].append("b")
+
+        value = {"frames": ["c"]}
+        frame_cache.set_many({"local": value})
+        value["frames"].append("d")
+
+        frame_cache.get_many(["local"])["local"]["frames"].append("e")
+        assert frame_cache.get_many(["remote", "local"]) == {
+            "remote": {"frames": ["a"]},
+            "local": {"frames": ["c"]},
+        }
+
+    frame_cache.clear()
@@ -35,3 +35,18 @@ class SyncOptionsTest(TestCase):
         sync_options(cutoff=60)
 
         assert not mock_set_cache.called
+
+    @patch.object(default_store, "publish_changes")
+    def test_publishes_out_of_sync_options(self, mock_publish_changes):
+        default_manager.register(self._TEST_KEY)
+        default_store.model.objects.create(key=self._TEST_KEY, value="bar")
+        opt = default_manager.lookup_key(self._TEST_KEY)
+        default_store.cache.delete(opt.cache_key)
+
+        sync_options(cutoff=60)
+        mock_publish_changes.assert_called_once_with([opt])
+        mock_publish_changes.reset_mock()
+
+        # The cache is in sync now
+        sync_options(cutoff=60)
+        mock_publish_changes.assert_called_once_with([])
@@ -9,11 +9,14 @@ from sentry.db.postgres.transactions import in_test_hide_transaction_boundary
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey, ProjectKeyStatus
+from sentry.relay.config import _get_project_config
 from sentry.relay.projectconfig_cache.redis import RedisProjectConfigCache
 from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDebounceCache
 from sentry.tasks.relay import (
     _schedule_invalidate_project_config,
     build_project_config,
+    compute_configs,
+    compute_projectkey_config,
     invalidate_project_config,
     schedule_build_project_config,
     schedule_invalidate_project_config,
@@ -93,6 +96,7 @@ def redis_cache(monkeypatch):
     monkeypatch.setattr("sentry.relay.projectconfig_cache.set_many", cache.set_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.delete_many", cache.delete_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.get", cache.get)
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.get_many", cache.get_many)
 
     return cache
 
@@ -328,6 +332,41 @@ def test_projectkeys(
         assert not redis_cache.get(key.public_key)
 
 
+@django_db_all
+def test_compute_configs_shares_project_config(
+    default_project,
+    default_projectkey,
+    redis_cache,
+    django_cache,
+):
+    other_key = ProjectKey.objects.create(project=default_project)
+    inactive_key = ProjectKey.objects.create(
+        project=default_project, status=ProjectKeyStatus.INACTIVE
+    )
+    uncached_key = ProjectKey.objects.create(project=default_project)
+    cached_keys = [default_projectkey, other_key, inactive_key]
+    redis_cache.set_many({key.public_key: {"dummy-key": "val"} for key in cached_keys})
+
+    with mock.patch(
+        "sentry.relay.config._get_project_config", wraps=_get_project_config
+    ) as get_project_config:
+        configs = compute_configs(organization_id=default_project.organization_id)
+
+    # The project-scoped part of the config is computed once for all keys
+    assert get_project_config.call_count == 1
+    assert set(configs) == {key.public_key for key in cached_keys}
+    assert uncached_key.public_key not in configs
+    assert configs[inactive_key.public_key] == {"disabled": True}
+
+    for key in (default_projectkey, other_key):
+        expected = compute_projectkey_config(key)
+        for config in (configs[key.public_key], expected):
+            # These default to the current time and a random revision
+            for field in ("lastFetch", "lastChange", "rev"):
+                config.pop(field)
+        assert configs[key.public_key] == expected
+
+
 @django_db_all(transaction=True)
 def test_db_transaction(
     default_project,
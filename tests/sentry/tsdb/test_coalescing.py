@@ -0,0 +1,155 @@
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from sentry.testutils.helpers.options import override_options
+from sentry.tsdb.base import TSDBModel
+from sentry.tsdb.coalescing import CoalescingTSDBWriter
+from sentry.tsdb.redissnuba import RedisSnubaTSDB
+from sentry.utils.dates import to_datetime
+
+
+@pytest.fixture
+def make_writer():
+    writers = []
+
+    def make(backend):
+        writer = CoalescingTSDBWriter(lambda: backend)
+        writers.append(writer)
+        return writer
+
+    yield make
+
+    for writer in writers:
+        writer.close()
+
+
+def test_merges_duplicate_increments(make_writer):
+    backend = mock.Mock()
+    backend.get_rollups.return_value = {10: 360, 3600: 24}
+    writer = make_writer(backend)
+
+    timestamp = datetime(2023, 1, 1, 0, 0, 3, tzinfo=timezone.utc)
+    for _ in range(3):
+        writer.incr_multi(
+            [(TSDBModel.project, 1), (TSDBModel.group, 2)], timestamp=timestamp, environment_id=5
+        )
+    writer.incr_multi(
+        [(TSDBModel.group, 2)],
+        timestamp=timestamp.replace(second=12),
+        environment_id=5,
+    )
+    writer.flush()
+
+    bucket = to_datetime(1672531200)
+    backend.incr_multi.assert_called_once_with(
+        [
+            (TSDBModel.project, 1, {"timestamp": bucket, "count": 3}),
+            (TSDBModel.group, 2, {"timestamp": bucket, "count": 3}),
+            (TSDBModel.group, 2, {"timestamp": to_datetime(1672531210), "count": 1}),
+        ],
+        environment_id=5,
+    )
+    assert not backend.record_multi.called
+
+    # Nothing is written twice
+    writer.flush()
+    assert backend.incr_multi.call_count == 1
+
+
+def test_merges_distinct_values(make_writer):
+    backend = mock.Mock()
+    backend.get_rollups.return_value = {10: 360}
+    writer = make_writer(backend)
+
+    timestamp = datetime(2023, 1, 1, 0, 0, 3, tzinfo=timezone.utc)
+    writer.record_multi(
+        [(TSDBModel.users_affected_by_group, 2, ("a",))], timestamp=timestamp, environment_id=5
+    )
+    writer.record_multi(
+        [(TSDBModel.users_affected_by_group, 2, ("a", "b"))], timestamp=timestamp, environment_id=5
+    )
+    writer.flush()
+
+    backend.record_multi.assert_called_once_with(
+        [
+            (
+                TSDBModel.users_affected_by_group,
+                2,
+                {"a", "b"},
+                {"timestamp": to_datetime(1672531200)},
+            )
+        ],
+        environment_id=5,
+    )
+
+
+@override_options({"tsdb.coalescing-writer.max-events": 2})
+def test_flushes_after_max_events(make_writer):
+    backend = mock.Mock()
+    backend.get_rollups.return_value = {10: 360}
+    writer = make_writer(backend)
+    timestamp = datetime(2023, 1, 1, 0, 0, 3, tzinfo=timezone.utc)
+
+    writer.incr_multi([(TSDBModel.project, 1)], timestamp=timestamp)
+    assert not backend.incr_multi.called
+
+    writer.incr_multi([(TSDBModel.project, 1)], timestamp=timestamp)
+    backend.incr_multi.assert_called_once_with(
+        [(TSDBModel.project, 1, {"timestamp": to_datetime(1672531200), "count": 2})],
+        environment_id=None,
+    )
+
+
+def test_flushes_through_redissnuba(make_writer):
+    # Writes are directed to redis until the switchover to snuba.
+    backend = RedisSnubaTSDB(switchover_timestamp=time.time() + 3600)
+    writer = make_writer(backend)
+
+    now = datetime.now(timezone.utc)
+    writer.incr_multi([(TSDBModel.group, 2)], timestamp=now)
+    writer.record_multi([(TSDBModel.users_affected_by_group, 2, ("a", "b"))], timestamp=now)
+    writer.record_multi([(TSDBModel.users_affected_by_group, 2, ("b", "c"))], timestamp=now)
+    writer.flush()
+
+    start = now - timedelta(hours=1)
+    assert backend.get_sums(TSDBModel.group, [2], start, now) == {2: 1}
+    assert backend.get_distinct_counts_totals(
+        TSDBModel.users_affected_by_group, [2], start, now
+    ) == {2: 3}
+
+
+def test_flushes_through_redissnuba_to_dummy(make_writer):
+    backend = RedisSnubaTSDB()
+    writer = make_writer(backend)
+
+    with mock.patch.object(backend.backends["dummy"], "record_multi") as record_multi:
+        writer.record_multi(
+            [(TSDBModel.users_affected_by_group, 2, ("a",))],
+            timestamp=datetime(2023, 1, 1, 0, 0, 3, tzinfo=timezone.utc),
+        )
+        writer.flush()
+
+    record_multi.assert_called_once_with(
+        [(TSDBModel.users_affected_by_group, 2, {"a"}, {"timestamp": to_datetime(1672531200)})],
+        environment_id=None,
+    )
+
+
+@override_options({"tsdb.coalescing-writer.max-delay": 0})
+def test_close_stops_flusher(make_writer):
+    backend = mock.Mock()
+    backend.get_rollups.return_value = {10: 360}
+    writer = make_writer(backend)
+
+    writer.incr_multi([(TSDBModel.project, 1)])
+    flusher = writer._flusher
+    assert flusher is not None and flusher.is_alive()
+
+    writer.close(timeout=5)
+
+    assert not flusher.is_alive()
+    assert writer._flusher is None
+    assert backend.incr_multi.call_count == 1
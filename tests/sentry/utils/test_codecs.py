@@ -1,6 +1,6 @@
 import pytest
 
-from sentry.utils.codecs import BytesCodec, JSONCodec, ZlibCodec, ZstdCodec
+from sentry.utils.codecs import Base64Codec, BytesCodec, JSONCodec, ZlibCodec, ZstdCodec
 
 
 @pytest.mark.parametrize(
@@ -10,6 +10,7 @@ from sentry.utils.codecs import BytesCodec, JSONCodec, ZlibCodec, ZstdCodec
         (BytesCodec("utf8"), "\N{SNOWMAN}", b"\xe2\x98\x83"),
         (ZlibCodec(), b"hello", b"x\x9c\xcbH\xcd\xc9\xc9\x07\x00\x06,\x02\x15"),
         (ZstdCodec(), b"hello", b"(\xb5/\xfd \x05)\x00\x00hello"),
+        (Base64Codec(), b"\x00hello", "AGhlbGxv"),
     ],
 )
 def test_codec(codec, encoded, decoded):
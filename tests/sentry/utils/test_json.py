@@ -1,9 +1,11 @@
 import datetime
+import io
 import uuid
 from enum import Enum
 from unittest import TestCase
 from unittest.mock import patch
 
+import pytest
 from django.utils.translation import gettext_lazy as _
 
 from sentry.utils import json
@@ -59,3 +61,37 @@ class JSONTest(TestCase):
     def test_loads_without_sdk_trace(self, start_span_mock):
         json.loads('{"test": "message"}', skip_trace=True)
         start_span_mock.assert_not_called()
+
+    def test_iterload_array(self):
+        data = [
+            {"model": "sentry.user", "pk": i, "fields": {"name": "\u00fc" * i}} for i in range(20)
+        ]
+        data += [12345, True, None, "],["]
+        encoded = json.dumps(data).encode("utf-8")
+        for chunk_size in (1, 3, 64, len(encoded)):
+            assert list(json.iterload_array(io.BytesIO(encoded), chunk_size)) == data
+
+        assert list(json.iterload_array(io.BytesIO(b" [ ] "))) == []
+
+    def test_iterload_array_numbers(self):
+        encoded = b"[1.5e10, 2, -3.25E-2, 0, 10e+5, 7.0]"
+        for chunk_size in (1, 2, 3):
+            assert list(json.iterload_array(io.BytesIO(encoded), chunk_size)) == [
+                1.5e10,
+                2,
+                -3.25e-2,
+                0,
+                10e5,
+                7.0,
+            ]
+
+    def test_iterload_array_invalid(self):
+        for invalid in (b"", b"{}", b"[1,", b"[1 2]", b'["foo', b"[1.]", b"[01]"):
+            with pytest.raises(json.JSONDecodeError):
+                list(json.iterload_array(io.BytesIO(invalid), 2))
+
+    def test_iterload_array_trailing_data(self):
+        assert list(json.iterload_array(io.BytesIO(b"[1, 2] \n"), 2)) == [1, 2]
+        for invalid in (b"[1] x", b"[]]", b"[1]\n[2]"):
+            with pytest.raises(json.JSONDecodeError):
+                list(json.iterload_array(io.BytesIO(invalid), 2))
@@ -10,10 +10,15 @@ from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.cache import cache
 from sentry.utils.snuba import (
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
+    _get_query_cache_lock,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -375,3 +380,76 @@ class QuantizeTimeTest(unittest.TestCase):
                 break
 
         assert i != j
+
+
+@override_options({"snuba.query-cache.single-flight": True, "snuba.query-cache.lock-timeout": 1})
+class SingleFlightQueryCacheTest(TestCase):
+    referrer = "api.dashboards.widget.line-chart.find-topn"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.query = ({"dataset": "events", "query": "MATCH (events) SELECT count()"}, None, None)
+        self.cache_key = get_cache_key(self.query[0]) + ":single-flight"
+
+    def query_cached(self):
+        return _apply_cache_and_build_results([self.query], referrer=self.referrer, use_cache=True)
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_caches_result(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        assert self.query_cached() == [{"data": [1]}]
+        assert self.query_cached() == [{"data": [1]}]
+        assert bulk_snuba_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_waits_for_inflight_query(self, bulk_snuba_query):
+        lock = _get_query_cache_lock(self.cache_key, 1)
+        lock.acquire()
+
+        # The other query finishes while we wait for the lock
+        def release():
+            cache.set(self.cache_key, '{"data": [2]}', 60)
+            cache.set(self.cache_key + ":fresh", 1, 60)
+            lock.release()
+
+        with mock.patch("sentry.utils.locking.lock.time.sleep", side_effect=lambda _: release()):
+            assert self.query_cached() == [{"data": [2]}]
+        assert not bulk_snuba_query.called
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_queries_after_wait_timeout(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        lock = _get_query_cache_lock(self.cache_key, 1)
+        lock.acquire()
+
+        with mock.patch("sentry.utils.locking.lock.time.sleep"):
+            assert self.query_cached() == [{"data": [1]}]
+        assert bulk_snuba_query.call_count == 1
+        lock.release()
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_serves_stale_results(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        cache.set(self.cache_key, '{"data": [0]}', 60)
+        lock = _get_query_cache_lock(self.cache_key, 1)
+
+        with lock.acquire():
+            # Another caller is revalidating
+            with override_options({"snuba.query-cache.stale-referrers": [self.referrer]}):
+                assert self.query_cached() == [{"data": [0]}]
+            assert not bulk_snuba_query.called
+
+        with override_options({"snuba.query-cache.stale-referrers": [self.referrer]}):
+            assert self.query_cached() == [{"data": [1]}]
+        assert bulk_snuba_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_stale_results_not_served_without_single_flight(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        # A result past its freshness, only kept around to be served stale
+        cache.set(self.cache_key, '{"data": [0]}', 60)
+
+        with override_options({"snuba.query-cache.single-flight": False}):
+            assert self.query_cached() == [{"data": [1]}]
+        assert bulk_snuba_query.call_count == 1
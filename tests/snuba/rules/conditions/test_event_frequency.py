@@ -10,6 +10,7 @@ from django.utils.timezone import now
 from sentry.issues.grouptype import PerformanceNPlusOneGroupType
 from sentry.models.rule import Rule
 from sentry.rules.conditions.event_frequency import (
+    EventFrequencyBatch,
     EventFrequencyCondition,
     EventFrequencyPercentCondition,
     EventUniqueUserFrequencyCondition,
@@ -19,6 +20,7 @@ from sentry.testutils.cases import PerformanceIssueTestCase, RuleTestCase, Snuba
 from sentry.testutils.helpers.datetime import before_now, freeze_time, iso_format
 from sentry.testutils.silo import region_silo_test
 from sentry.testutils.skips import requires_snuba
+from sentry.utils import snuba
 from sentry.utils.samples import load_data
 
 pytestmark = [requires_snuba]
@@ -191,6 +193,70 @@ class StandardIntervalTestBase(SnubaTestCase, RuleTestCase):
         rule = self.get_rule(data=data, rule=Rule(environment_id=None))
         self.assertDoesNotPass(rule, event)
 
+    def test_batch(self):
+        events = [
+            self.add_event(
+                data={"fingerprint": [f"group_{i}"], "user": {"id": uuid4().hex}},
+                project_id=self.project.id,
+                timestamp=before_now(minutes=1),
+            )
+            for i in range(2)
+        ]
+        self.increment(events[0], 3, timestamp=now() - timedelta(minutes=1))
+
+        data = {"interval": "1h", "value": 2}
+        rule = self.get_rule(data=data, rule=Rule(environment_id=None))
+        rule.batch = batch = EventFrequencyBatch()
+        for event in events:
+            rule.add_to_batch(event, batch)
+
+        with patch.object(
+            rule, "batch_query_hook", wraps=rule.batch_query_hook
+        ) as batch_query_hook, patch.object(rule, "query_hook") as query_hook:
+            self.assertPasses(rule, events[0])
+            self.assertDoesNotPass(rule, events[1])
+        # Both groups are resolved with the same query.
+        assert batch_query_hook.call_count == 1
+        assert query_hook.call_count == 0
+
+        # Batches of later events reuse the cached results of the same time frame.
+        rule.batch = EventFrequencyBatch(now=batch.now)
+        with patch.object(rule, "batch_query_hook") as batch_query_hook:
+            self.assertPasses(rule, events[0])
+        assert batch_query_hook.call_count == 0
+
+    def test_batch_mixed_intervals(self):
+        event = self.add_event(
+            data={"fingerprint": ["something_random"], "user": {"id": uuid4().hex}},
+            project_id=self.project.id,
+            timestamp=before_now(minutes=1),
+        )
+        batch = EventFrequencyBatch()
+        hour_rule, minute_rule = (
+            self.get_rule(data={"interval": interval, "value": 0}, rule=Rule(environment_id=None))
+            for interval in ("1h", "1m")
+        )
+        for rule in (hour_rule, minute_rule):
+            rule.batch = batch
+            rule.add_to_batch(event, batch)
+
+        consistent = {}
+
+        def batch_query_hook(group_ids, start, end, *args):
+            consistent[end - start] = snuba.OVERRIDE_OPTIONS.get("consistent")
+            return {}
+
+        with snuba.options_override({"consistent": True}), patch.object(
+            hour_rule, "batch_query_hook", side_effect=batch_query_hook
+        ), patch.object(minute_rule, "batch_query_hook", side_effect=batch_query_hook):
+            # The first lookup resolves the queries of both rules.
+            hour_rule.get_rate(event, "1h", None)
+            assert len(consistent) == 2
+            minute_rule.get_rate(event, "1m", None)
+
+        # Only the hour long query gives up read your writes consistency.
+        assert consistent == {timedelta(hours=1): False, timedelta(minutes=1): True}
+
     def test_comparison_empty_comparison_period(self):
         # Test data is 1 event in the current period and 0 events in the comparison period. This
         # should always result in 0 and never fire.
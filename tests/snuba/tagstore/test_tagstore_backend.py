@@ -1029,6 +1029,20 @@ class TagStorageTest(TestCase, SnubaTestCase, SearchIssueTestMixin, PerformanceI
             ),
         ]
 
+    def test_get_group_tag_value_iter_by_value(self):
+        values = [
+            tag_value.value
+            for tag_value in self.ts.get_group_tag_value_iter(
+                self.proj1group1,
+                [self.proj1env1.id],
+                "sentry:user",
+                order_by="value",
+                after_value="id:user1",
+                tenant_ids={"referrer": "r", "organization_id": 1234},
+            )
+        ]
+        assert values == ["id:user2"]
+
     def test_get_group_tag_value_iter_perf(self):
         from sentry.tagstore.types import GroupTagValue
 